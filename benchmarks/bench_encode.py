@@ -0,0 +1,72 @@
+import argparse
+import io
+import json
+import time
+
+import corpus  # sets up sys.path
+from mod_builder import expand_races
+from mod_model import GroupEncoder
+from penumbra_json import generate_penumbra_json
+
+# Time to encode every redirection group in a corpus as JSON: json.dump of the
+# equivalent dicts against mod_model's fragment-caching GroupEncoder, with a
+# fresh encoder (cold caches) and with one that has already written the
+# corpus once (as in watch mode or the build server). All three must produce
+# the same text.
+#
+#   python benchmarks/bench_encode.py --size large --reproducible
+
+def corpus_groups(operations):
+    groups = []
+    for op in operations:
+        source_races = expand_races(op['source_races'], op['source_include_male'], op['source_include_female'])
+        target_races = expand_races(op['target_races'], op['target_include_male'], op['target_include_female'])
+        for i in range(1, int(op['variant_count']) + 1):
+            groups.append(generate_penumbra_json(op['patterns'], f"{i:02}", op['group_name'], source_races, target_races)[0])
+    return groups
+
+def encode_json_dump(groups, sort_keys):
+    texts = []
+    for group in groups:
+        f = io.StringIO()
+        json.dump(group.to_dict(), f, indent=2, sort_keys=sort_keys)
+        texts.append(f.getvalue())
+    return texts
+
+def encode_fragments(encoder, groups):
+    texts = []
+    for group in groups:
+        f = io.StringIO()
+        f.writelines(encoder.iter_chunks(group))
+        texts.append(f.getvalue())
+    return texts
+
+def timed(encode, *args):
+    started = time.perf_counter()
+    texts = encode(*args)
+    return time.perf_counter() - started, texts
+
+def main():
+    parser = argparse.ArgumentParser(description="json.dump vs pre-encoded fragment group encoding")
+    parser.add_argument("--size", choices=sorted(corpus.CORPUS), default="medium")
+    parser.add_argument("--reproducible", action="store_true", help="sort keys, as reproducible builds do")
+    args = parser.parse_args()
+
+    _, operations = corpus.corpus_project(args.size)
+    groups = corpus_groups(operations)
+    swaps = sum(len(option.file_swaps) for group in groups for option in group.options)
+
+    encoder = GroupEncoder(2, args.reproducible)
+    results = {
+        "json.dump": timed(encode_json_dump, groups, args.reproducible),
+        "cold": timed(encode_fragments, encoder, groups),
+        "warm": timed(encode_fragments, encoder, groups),
+    }
+    reference = results["json.dump"][1]
+    print(f"{len(groups)} groups, {swaps} swaps, {sum(map(len, reference)) / 2**20:.1f} MiB of JSON")
+    for name, (elapsed, texts) in results.items():
+        status = "ok" if texts == reference else "MISMATCH"
+        print(f"{name:<10} {elapsed:6.2f}s  {results['json.dump'][0] / elapsed:5.1f}x  {status}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+
+import corpus  # sets up sys.path
+
+# Responsiveness of the Tk front end on synthetic large projects. The app is
+# driven through the same methods its buttons call (adding tabs and
+# file/pattern pairs, pasting and typing patterns, switching, scrolling and
+# closing tabs). After every action the harness records:
+#
+#   handler_ms  time spent in the action itself
+#   settle_ms   time until Tk has processed everything the action queued
+#               (geometry, redraws); handler + settle is how long the event
+#               loop was blocked, i.e. the latency a user sees
+#   widgets     widgets alive in the app
+#   rss_bytes   resident memory of the process
+#
+# After each phase the event loop runs idle for a while with a heartbeat every
+# HEARTBEAT_MS; the longest gap between beats shows the cost of the periodic
+# background work (validation, preview and watch polls) at that project size.
+#
+# Without a DISPLAY an Xvfb server is started for the run. Results are written
+# as JSON; --baseline compares against an earlier result and exits with status
+# 1 when an action got slower than the tolerance allows.
+#
+#   python benchmarks/bench_gui.py --size large -o gui_large.json
+#   python benchmarks/bench_gui.py --size large --baseline gui_large.json
+
+RESULT_VERSION = 1
+HEARTBEAT_MS = 5
+NOISE_FLOOR_MS = 5  # Regressions smaller than this are ignored
+
+# name -> (redirection tabs, override tabs, file/pattern pairs, pasted patterns)
+SCENARIOS = {
+    "small": (5, 5, 10, 1000),
+    "medium": (20, 20, 50, 10000),
+    "large": (50, 50, 200, 50000),
+}
+
+def start_virtual_display():
+    """Start Xvfb on a free display number when there is no DISPLAY; returns the process or None"""
+    if os.environ.get("DISPLAY"):
+        return None
+    xvfb = shutil.which("Xvfb")
+    if xvfb is None:
+        sys.exit("No DISPLAY and no Xvfb found; install Xvfb or run under xvfb-run.")
+    for number in range(99, 200):
+        if os.path.exists(f"/tmp/.X{number}-lock"):
+            continue
+        process = subprocess.Popen([xvfb, f":{number}", "-screen", "0", "1600x1200x24", "-nolisten", "tcp"],
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        deadline = time.monotonic() + 10
+        while process.poll() is None and time.monotonic() < deadline:
+            if os.path.exists(f"/tmp/.X11-unix/X{number}"):
+                os.environ["DISPLAY"] = f":{number}"
+                return process
+            time.sleep(0.05)
+        process.kill()
+        process.wait()
+    sys.exit("Could not start Xvfb.")
+
+def resident_bytes():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024  # Peak, in KiB on Linux
+
+def widget_count(widget):
+    return 1 + sum(widget_count(child) for child in widget.winfo_children())
+
+def tab_canvas(tab_data):
+    import tkinter as tk
+    return next(child for child in tab_data['frame'].winfo_children() if isinstance(child, tk.Canvas))
+
+class Recorder:
+    def __init__(self, app):
+        self.app = app
+        self.results = []
+
+    def measure(self, action, run):
+        started = time.perf_counter()
+        run()
+        handled = time.perf_counter()
+        self.app.update()
+        settled = time.perf_counter()
+        self.results.append({
+            'action': action,
+            'handler_ms': (handled - started) * 1000,
+            'settle_ms': (settled - handled) * 1000,
+            'latency_ms': (settled - started) * 1000,
+            'widgets': widget_count(self.app),
+            'rss_bytes': resident_bytes(),
+        })
+
+    def idle(self, phase, seconds):
+        """Run the event loop for a while and record the longest gap between heartbeats"""
+        beats = []
+        pending = [None]
+
+        def beat():
+            beats.append(time.perf_counter())
+            pending[0] = self.app.after(HEARTBEAT_MS, beat)
+
+        pending[0] = self.app.after(0, beat)
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            self.app.update()
+            time.sleep(0.001)
+        self.app.after_cancel(pending[0])  # Or the beats would run on through the following phases
+        gaps = [(b - a) * 1000 for a, b in zip(beats, beats[1:])]
+        self.results.append({
+            'action': f"idle after {phase}",
+            'max_gap_ms': max(gaps, default=0.0),
+            'latency_ms': max(gaps, default=0.0),
+            'widgets': widget_count(self.app),
+            'rss_bytes': resident_bytes(),
+        })
+
+def run_scenario(size, idle_seconds):
+    from gui import PenumbraPathMapperApp
+
+    redirection_tabs, override_tabs, pair_count, pattern_count = SCENARIOS[size]
+    startup = time.perf_counter()
+    app = PenumbraPathMapperApp()
+    app.update()
+    recorder = Recorder(app)
+    recorder.results.append({'action': "startup", 'latency_ms': (time.perf_counter() - startup) * 1000,
+                             'widgets': widget_count(app), 'rss_bytes': resident_bytes()})
+    try:
+        for _ in range(redirection_tabs):
+            recorder.measure("add redirection tab", app.add_file_redirection_tab)
+        for _ in range(override_tabs):
+            recorder.measure("add override tab", app.add_file_override_tab)
+        recorder.idle("adding tabs", idle_seconds)
+
+        override = next(tab for tab in reversed(app.operation_tabs) if tab['type'] == 'file_override')
+        option = override['options_data'][0]
+        for _ in range(pair_count):
+            recorder.measure("add file/pattern pair", lambda: app.add_file_pattern_pair(
+                option['file_patterns_frame'], option['file_patterns_data'], option['option_name_entry']))
+        recorder.idle("adding pairs", idle_seconds)
+
+        redirection = next(tab for tab in app.operation_tabs if tab['type'] == 'file_redirection')
+        editor = redirection['pattern_editor']
+        app.operations_notebook.select(redirection['frame'])
+        patterns = "\n".join(corpus.make_patterns(pattern_count))
+        recorder.measure("paste patterns", lambda: editor.text.insert("end", "\n" + patterns))
+        for c in "chara/human/{race_id}/x.pap":
+            recorder.measure("type in pattern list", lambda: editor.text.insert("end", c))
+        recorder.idle("pasting patterns", idle_seconds)
+
+        for tab in app.operation_tabs[::max(1, len(app.operation_tabs) // 10)]:
+            recorder.measure("switch tab", lambda: app.operations_notebook.select(tab['frame']))
+        app.operations_notebook.select(override['frame'])
+        app.update()
+        canvas = tab_canvas(override)
+        for step in range(21):
+            recorder.measure("scroll override tab", lambda: canvas.yview_moveto(step / 20))
+
+        for _ in range(len(app.operation_tabs) // 2):
+            recorder.measure("close first tab", lambda: app.close_tab(0))
+        recorder.idle("closing tabs", idle_seconds)
+    finally:
+        app.destroy()
+    return recorder.results
+
+def summarize(results):
+    by_action = {}
+    for result in results:
+        by_action.setdefault(result['action'], []).append(result['latency_ms'])
+    return {action: {'count': len(latencies), 'median_ms': statistics.median(latencies), 'max_ms': max(latencies)}
+            for action, latencies in by_action.items()}
+
+def compare(summary, baseline, tolerance):
+    """Print actions whose median latency grew beyond tolerance over a baseline summary; returns how many did"""
+    regressions = 0
+    for action, stats in summary.items():
+        before = baseline.get(action)
+        if before is None:
+            continue
+        limit = max(before['median_ms'] * tolerance, before['median_ms'] + NOISE_FLOOR_MS)
+        if stats['median_ms'] > limit:
+            regressions += 1
+            print(f"REGRESSION {action}: median {stats['median_ms']:.1f}ms, baseline {before['median_ms']:.1f}ms")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Event-loop latency, widget count and memory of the GUI per action")
+    parser.add_argument("--size", choices=sorted(SCENARIOS), default="medium")
+    parser.add_argument("-o", "--output", help="result JSON (default: gui_<size>.json)")
+    parser.add_argument("--idle", type=float, default=2.0, help="seconds of idle event loop after each phase")
+    parser.add_argument("--baseline", help="earlier result JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="allowed slowdown factor against the baseline")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)['summary']  # Read first: the baseline may be the file this run writes
+
+    display = start_virtual_display()
+    try:
+        results = run_scenario(args.size, args.idle)
+    finally:
+        if display is not None:
+            display.terminate()
+            display.wait()
+
+    import tkinter
+    summary = summarize(results)
+    report = {
+        'version': RESULT_VERSION,
+        'size': args.size,
+        'scenario': dict(zip(("redirection_tabs", "override_tabs", "pairs", "patterns"), SCENARIOS[args.size])),
+        'python': platform.python_version(),
+        'tk': tkinter.TkVersion,
+        'summary': summary,
+        'actions': results,
+    }
+    output = args.output or f"gui_{args.size}.json"
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    for action, stats in summary.items():
+        print(f"{action:<26} x{stats['count']:<4} median {stats['median_ms']:8.1f}ms  max {stats['max_ms']:8.1f}ms")
+    print(f"{results[-1]['widgets']} widgets, {results[-1]['rss_bytes'] / 2**20:.1f} MiB resident at the end; wrote {output}")
+
+    if baseline is not None and compare(summary, baseline, args.tolerance):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
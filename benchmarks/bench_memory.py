@@ -0,0 +1,70 @@
+import argparse
+import gc
+import time
+import tracemalloc
+
+import corpus  # sets up sys.path
+from mod_builder import expand_races
+from penumbra_json import generate_penumbra_json
+
+# Peak memory of generating every redirection group in a corpus with the
+# compact mod_model representation, against the nested-dict generator it
+# replaced (kept below verbatim as the baseline).
+#
+#   python benchmarks/bench_memory.py --size large
+
+def dict_generate_penumbra_json(patterns, variant, group_name, source_races, target_races):
+    def substitute_variant(path):
+        return path.replace("{variant}", variant)
+
+    options = [{"Name": "Off", "Description": "Keep original game files unchanged", "Priority": 0,
+                "Files": {}, "FileSwaps": {}, "Manipulations": []}]
+    for target_race, target_id in target_races.items():
+        file_swaps = {}
+        for pattern in patterns:
+            for source_race, source_id in source_races.items():
+                src = substitute_variant(pattern.replace("{race_id}", source_id))
+                tgt = substitute_variant(pattern.replace("{race_id}", target_id))
+                file_swaps[src] = tgt
+        options.append({"Name": target_race, "Description": "", "Priority": 0,
+                        "Files": {}, "FileSwaps": file_swaps, "Manipulations": []})
+    json_name = f"{group_name}{variant}"
+    return ({"Version": 0, "Name": json_name, "Description": "", "Image": "", "Page": 0, "Priority": 0,
+             "Type": "Single", "DefaultSettings": 1, "Options": options}, json_name)
+
+def generate_all(generate, operations):
+    groups = []
+    for op in operations:
+        source_races = expand_races(op['source_races'], op['source_include_male'], op['source_include_female'])
+        target_races = expand_races(op['target_races'], op['target_include_male'], op['target_include_female'])
+        for i in range(1, int(op['variant_count']) + 1):
+            groups.append(generate(op['patterns'], f"{i:02}", op['group_name'], source_races, target_races)[0])
+    return groups
+
+def measure(generate, operations):
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    groups = generate_all(generate, operations)
+    elapsed = time.perf_counter() - started
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del groups
+    return peak, elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Peak memory of compact vs dict group generation")
+    parser.add_argument("--size", choices=sorted(corpus.CORPUS), default="medium")
+    args = parser.parse_args()
+
+    _, operations = corpus.corpus_project(args.size)
+    results = {
+        "dict": measure(dict_generate_penumbra_json, operations),
+        "compact": measure(generate_penumbra_json, operations),
+    }
+    for name, (peak, elapsed) in results.items():
+        print(f"{name:<8} peak {peak / 2**20:8.1f} MiB  {elapsed:6.2f}s")
+    print(f"compact uses {results['compact'][0] / results['dict'][0]:.1%} of the dict peak")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+import argparse
+import hashlib
+import os
+import tempfile
+import time
+
+import corpus  # sets up sys.path
+from mod_builder import build_mod
+from scheduler import PARALLEL_MIN_MAPPINGS, estimated_mappings
+
+# Wall time of a full reproducible build with serial and parallel group
+# generation, checking that both produce the same package bytes. Conflict
+# detection is on, as in CLI and GUI builds, unless --no-index is given.
+#
+#   python benchmarks/bench_parallel.py --size large --jobs 0
+
+def timed_build(mod_info, operations, jobs, index=True):
+    on_conflict = (lambda conflicts: True) if index else None
+    with tempfile.TemporaryDirectory() as out_dir:
+        started = time.perf_counter()
+        pmp_path = build_mod(mod_info, operations, out_dir, reproducible=True, on_conflict=on_conflict, jobs=jobs,
+                             manifest=False)
+        elapsed = time.perf_counter() - started
+        with open(pmp_path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+    return elapsed, digest
+
+def main():
+    parser = argparse.ArgumentParser(description="Serial vs parallel build time")
+    parser.add_argument("--size", choices=sorted(corpus.CORPUS), default="medium")
+    parser.add_argument("--jobs", type=int, default=0, help="parallel workers, 0 for one per CPU")
+    parser.add_argument("--no-index", action="store_true", help="build without conflict detection")
+    args = parser.parse_args()
+
+    mod_info, operations = corpus.corpus_project(args.size)
+    if estimated_mappings(operations) < PARALLEL_MIN_MAPPINGS:
+        print(f"note: under {PARALLEL_MIN_MAPPINGS} mappings, so the parallel build runs serially too")
+    serial, serial_digest = timed_build(mod_info, operations, 1, not args.no_index)
+    parallel, parallel_digest = timed_build(mod_info, operations, args.jobs, not args.no_index)
+    print(f"serial    {serial:6.2f}s")
+    print(f"parallel  {parallel:6.2f}s  ({args.jobs or os.cpu_count()} workers, {serial / parallel:.1f}x)")
+    print("identical output" if serial_digest == parallel_digest else "OUTPUT DIFFERS")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import os
+import sys
+
+# Synthetic benchmark corpus shared by the scripts in this folder. Projects are
+# plain operation dicts in the same shape gui.snapshot_operation and
+# project_spec.load_project_spec produce, so they run through the real pipeline.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from project_spec import ALL_RACES
+
+def make_patterns(count, prefix="emote"):
+    """Animation-like path patterns with {race_id} and {variant}"""
+    return [f"chara/human/{{race_id}}/animation/a0001/bt_common/{prefix}/pose{i:04d}{{variant}}_loop.pap" for i in range(count)]
+
+def redirection_operation(group_name, pattern_count, variant_count, prefix="emote"):
+    """A redirection tab with every race selected on both sides"""
+    return {
+        'type': 'file_redirection',
+        'patterns': make_patterns(pattern_count, prefix),
+        'variant_count': variant_count,
+        'group_name': group_name,
+        'source_include_male': True,
+        'source_include_female': True,
+        'source_races': list(ALL_RACES),
+        'target_include_male': True,
+        'target_include_female': True,
+        'target_races': list(ALL_RACES),
+    }
+
+def mod_info(name="Benchmark Mod"):
+    return {'name': name, 'author': "bench", 'description': "benchmark corpus", 'version': "1.0.0", 'website': ""}
+
+# name -> (operation count, patterns per operation, variants per operation)
+CORPUS = {
+    "small": (4, 10, 2),
+    "medium": (8, 60, 4),
+    "large": (16, 150, 6),
+}
+
+def corpus_project(size="medium"):
+    """Return (mod_info, operations) for a named corpus size"""
+    op_count, pattern_count, variant_count = CORPUS[size]
+    operations = [redirection_operation(f"op{i:02d}", pattern_count, variant_count, prefix=f"set{i:02d}")
+                  for i in range(op_count)]
+    return mod_info(f"Benchmark {size}"), operations
@@ -0,0 +1,78 @@
+import os
+from pmp_archive import is_group_file
+
+# Machine-readable manifest written next to each .pmp as <name>.manifest.json.
+#
+# It lists every group file with its ID, counts, serialized size, compressed
+# size and generation time, and every asset with its SHA-256, size and
+# compressed size, so caches, diff tools and dashboards can work without
+# opening the archive. Sizes come from the finished package's central
+# directory; hashes are computed from the staged files on a thread pool
+# (hashlib releases the GIL). Generation times vary from run to run, so the
+# manifest is not part of reproducible output.
+
+MANIFEST_VERSION = 1
+HASH_CHUNK_SIZE = 1024 * 1024
+
+def manifest_path(pmp_path):
+    """Path of the manifest belonging to a package: My_Mod.pmp -> My_Mod.manifest.json"""
+    return os.path.splitext(pmp_path)[0] + ".manifest.json"
+
+def hash_file(path):
+    import hashlib
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(HASH_CHUNK_SIZE)
+            if not chunk:
+                break
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def build_manifest(pmp_path, stage_dir, generated_files, mod_info, jobs=None):
+    """Describe a freshly written package; stage_dir is the directory it was zipped from"""
+    import zipfile
+    from concurrent.futures import ThreadPoolExecutor
+
+    with zipfile.ZipFile(pmp_path) as zf:
+        sizes = {info.filename: (info.file_size, info.compress_size) for info in zf.infolist() if not info.is_dir()}
+
+    groups = []
+    for file_info in generated_files:
+        name = os.path.basename(file_info['file_path'])
+        groups.append({
+            'file': name,
+            'group_id': file_info['group_id'],
+            'group_name': file_info['group_name'],
+            'name': file_info['name'],
+            'variant': file_info['variant'],
+            'options': file_info['options'],
+            'files': file_info['files'],
+            'swaps': file_info['swaps'],
+            'bytes': file_info['bytes'],
+            'compressed_bytes': sizes.get(name, (0, 0))[1],
+            'seconds': round(file_info['seconds'], 6),
+        })
+
+    asset_names = sorted(name for name in sizes if name not in ("meta.json", "default_mod.json") and not is_group_file(name))
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        hashes = pool.map(hash_file, [os.path.join(stage_dir, *name.split("/")) for name in asset_names])
+        assets = [{'path': name, 'sha256': digest, 'size': sizes[name][0], 'compressed_size': sizes[name][1]}
+                  for name, digest in zip(asset_names, hashes)]
+
+    return {
+        'version': MANIFEST_VERSION,
+        'package': os.path.basename(pmp_path),
+        'package_bytes': os.path.getsize(pmp_path),
+        'mod': {'name': mod_info['name'], 'author': mod_info['author'], 'version': mod_info['version']},
+        'groups': groups,
+        'assets': assets,
+    }
+
+def write_manifest(manifest, path):
+    import json
+
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
@@ -0,0 +1,279 @@
+import asyncio
+import json
+import os
+import threading
+import time
+
+# Long-running build server for editor integrations and scripts.
+#
+# Clients connect over localhost TCP (or a Unix socket) and send one JSON
+# request per line; the server answers with a stream of JSON events per line,
+# each tagged with the request's "id":
+#
+#   {"id": 1, "token": "...", "command": "build", "spec": "/abs/project.json", "out_dir": "/abs/out"}
+#   {"id": 2, "token": "...", "command": "dry-run", "spec": "/abs/project.json"}
+#   {"id": 3, "token": "...", "command": "verify", "pmp": "/abs/out/My_Mod.pmp"}
+#   {"token": "...", "command": "ping"} / {"token": "...", "command": "shutdown"}
+#
+#   -> {"id": 1, "event": "queued", "waiting": 0}
+#   -> {"id": 1, "event": "started", "command": "build"}
+#   -> {"id": 1, "event": "log", "message": "Rebuilt 1 of 3 operations in 0.08s: ..."}
+#   -> {"id": 1, "event": "done", "status": "built", "target": "...", ...}  (or "event": "error")
+#
+# The process stays warm between requests: modules, race tables and generators
+# are imported once, and every (spec, out_dir, reproducible) project keeps a
+# watch.ModWatcher with its staged output and asset stat fingerprints. A repeat
+# build therefore only regenerates operations whose inputs changed, and does
+# nothing at all when none did. Requests run on worker threads, at most
+# max_builds at a time; the rest wait in order.
+#
+# Every request must carry the server's token: the one in $PENUMBRA_BUILD_TOKEN
+# when the server starts, or a random one it prints. A line that is not a JSON
+# object or has the wrong token gets one error event and the connection is
+# closed, so a web page cannot drive the server with a cross-protocol request
+# (an HTTP POST whose body happens to be a request line).
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_MAX_BUILDS = 2
+TOKEN_ENV = "PENUMBRA_BUILD_TOKEN"
+
+class RequestError(Exception):
+    pass
+
+def encode_event(event):
+    return (json.dumps(event) + "\n").encode("utf-8")
+
+class BuildServer:
+    """Serve build, dry-run and verify requests, keeping per-project build state warm"""
+
+    def __init__(self, max_builds=DEFAULT_MAX_BUILDS, log=print, token=None):
+        import secrets
+
+        self.max_builds = max_builds
+        self.token = token or os.environ.get(TOKEN_ENV) or secrets.token_urlsafe(24)
+        self.log = log
+        self.projects = {}       # (spec, out_dir, reproducible) -> ModWatcher
+        self.project_locks = {}  # out_dir -> threading.Lock
+        self.projects_lock = threading.Lock()
+        self.waiting = 0
+        self.connections = set()  # (handler task, writer) of open client connections
+        self.slots = None
+        self.stopping = None
+
+    # Worker thread handlers: (request, progress) -> result fields of the "done" event
+
+    def run_build(self, request, progress):
+        from project_spec import load_project_spec
+        from watch import ModWatcher
+
+        spec = os.path.abspath(require(request, 'spec'))
+        out_dir = os.path.abspath(request.get('out_dir') or os.path.dirname(spec))
+        key = (spec, out_dir, bool(request.get('reproducible')))
+        if not os.path.isfile(spec):
+            raise RequestError(f"project spec not found: {spec}")
+
+        # Projects writing into the same directory may produce the same package name
+        with self.projects_lock:
+            lock = self.project_locks.setdefault(out_dir, threading.Lock())
+        with lock:
+            watcher = self.projects.get(key)
+            if watcher is None:
+                watcher = ModWatcher(lambda: load_project_spec(spec), out_dir, spec_path=spec,
+                                     reproducible=key[2], debounce=0)
+                self.projects[key] = watcher
+            watcher.log = lambda message: progress(event='log', message=message)
+
+            try:
+                os.makedirs(out_dir, exist_ok=True)
+                # A package deleted behind our back has to be written again
+                if watcher.last_result and not os.path.exists(watcher.last_result['target']):
+                    watcher.dirty = True
+                if watcher.poll():
+                    result = watcher.last_result
+                    return {'status': 'built', 'rebuilt': result['rebuilt'], 'total': result['total'],
+                            'target': result['target']}
+                if watcher.project is not None and watcher.last_result is not None:
+                    return {'status': 'up-to-date', 'rebuilt': 0, 'total': watcher.last_result['total'],
+                            'target': watcher.last_result['target']}
+                raise RequestError("build failed")
+            except Exception:
+                # Start from scratch next time, so errors are reported again and no half-built stage is reused
+                del self.projects[key]
+                watcher.close()
+                raise
+
+    def run_dry_run(self, request, progress):
+        from project_spec import load_project_spec
+        from mod_builder import dry_run
+        from conflicts import format_conflicts
+
+        spec = require(request, 'spec')
+        try:
+            mod_info, operations = load_project_spec(spec)
+        except (OSError, ValueError) as e:
+            raise RequestError(f"could not load {spec}: {e}")
+        summary = dry_run(mod_info, operations)
+        for error in summary['errors']:
+            progress(event='log', message=f"Error: {error}")
+        for line in format_conflicts(summary['conflicts'], limit=int(request.get('limit', 20))):
+            progress(event='log', message=f"Conflict: {line}")
+        status = "invalid" if summary['errors'] else "ok"
+        return {'status': status, **summary, 'conflicts': len(summary['conflicts'])}
+
+    def run_verify(self, request, progress):
+        from verify import verify_package
+
+        problems = verify_package(require(request, 'pmp'))
+        for problem in problems:
+            progress(event='log', message=f"Error: {problem}")
+        return {'status': "failed" if problems else "ok", 'problems': len(problems)}
+
+    HANDLERS = {'build': run_build, 'dry-run': run_dry_run, 'verify': run_verify}
+
+    # Event loop side
+
+    def send(self, writer, event):
+        if not writer.is_closing():
+            writer.write(encode_event(event))
+
+    def parse_request(self, line):
+        """Return the request on a line, raising RequestError for anything that must end the connection"""
+        import hmac
+
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            raise RequestError(f"invalid request: {e}")
+        if not isinstance(request, dict):
+            raise RequestError("invalid request: a request must be a JSON object")
+        token = request.get('token')
+        if not isinstance(token, str) or not hmac.compare_digest(token.encode("utf-8"), self.token.encode("utf-8")):
+            raise RequestError("missing or wrong token")
+        return request
+
+    async def handle_request(self, request, writer):
+        request_id = request.get('id')
+        command = request.get('command')
+
+        if command == "ping":
+            self.send(writer, {'id': request_id, 'event': "done", 'status': "ok"})
+            return
+        if command == "shutdown":
+            self.send(writer, {'id': request_id, 'event': "done", 'status': "stopping"})
+            self.stopping.set()
+            return
+        handler = self.HANDLERS.get(command)
+        if handler is None:
+            self.send(writer, {'id': request_id, 'event': "error", 'message': f"unknown command {command!r}"})
+            return
+
+        loop = asyncio.get_running_loop()
+
+        def progress(**event):
+            loop.call_soon_threadsafe(self.send, writer, {'id': request_id, **event})
+
+        self.send(writer, {'id': request_id, 'event': "queued", 'waiting': self.waiting})
+        self.waiting += 1
+        try:
+            async with self.slots:
+                self.waiting -= 1
+                self.send(writer, {'id': request_id, 'event': "started", 'command': command})
+                started = time.perf_counter()
+                result = await loop.run_in_executor(None, handler, self, request, progress)
+        except RequestError as e:
+            self.send(writer, {'id': request_id, 'event': "error", 'message': str(e)})
+        except Exception as e:
+            self.send(writer, {'id': request_id, 'event': "error", 'message': f"{type(e).__name__}: {e}"})
+        else:
+            self.send(writer, {'id': request_id, 'event': "done", **result,
+                               'seconds': round(time.perf_counter() - started, 3)})
+        await writer.drain()
+
+    async def handle_connection(self, reader, writer):
+        connection = (asyncio.current_task(), writer)
+        self.connections.add(connection)
+        tasks = set()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    self.send(writer, {'id': None, 'event': "error", 'message': "request line too long"})
+                    break
+                if not line:
+                    break
+                if line.strip():
+                    try:
+                        request = self.parse_request(line)
+                    except RequestError as e:
+                        self.send(writer, {'id': None, 'event': "error", 'message': str(e)})
+                        break
+                    task = asyncio.create_task(self.handle_request(request, writer))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+            # Let queued requests finish so their results reach a half-closed client
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        except ConnectionError:
+            pass
+        finally:
+            self.connections.discard(connection)
+            writer.close()
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT, socket_path=None):
+        """Serve until a shutdown request arrives"""
+        self.slots = asyncio.Semaphore(self.max_builds)
+        self.stopping = asyncio.Event()
+        if socket_path:
+            server = await asyncio.start_unix_server(self.handle_connection, path=socket_path)
+            address = socket_path
+        else:
+            server = await asyncio.start_server(self.handle_connection, host, port)
+            address = f"{host}:{port}"
+        self.log(f"Build server listening on {address} ({self.max_builds} concurrent builds)")
+        if not os.environ.get(TOKEN_ENV):
+            self.log(f"Token: {self.token} (set {TOKEN_ENV} to it for clients)")
+        try:
+            async with server:
+                await self.stopping.wait()
+                # Closing the transports ends each connection's read loop after its running requests
+                connections = list(self.connections)
+                for _, writer in connections:
+                    writer.transport.close()
+                await asyncio.gather(*(task for task, _ in connections), return_exceptions=True)
+        finally:
+            for watcher in self.projects.values():
+                watcher.close()
+            self.projects.clear()
+            if socket_path and os.path.exists(socket_path):
+                os.remove(socket_path)
+        self.log("Build server stopped")
+
+def require(request, field):
+    value = request.get(field)
+    if not value:
+        raise RequestError(f"missing \"{field}\"")
+    return value
+
+def send_request(request, host=DEFAULT_HOST, port=DEFAULT_PORT, socket_path=None, token=None):
+    """Send one request to a running server and yield its events until the final one
+
+    token defaults to $PENUMBRA_BUILD_TOKEN.
+    """
+    import socket
+
+    request = dict(request, token=token or os.environ.get(TOKEN_ENV, ""))
+
+    if socket_path:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(socket_path)
+    else:
+        sock = socket.create_connection((host, port))
+    with sock, sock.makefile("rb") as f:
+        sock.sendall(encode_event(request))
+        for line in f:
+            event = json.loads(line)
+            yield event
+            if event['event'] in ("done", "error"):
+                return
@@ -0,0 +1,78 @@
+import os
+import subprocess
+import sys
+
+# Startup regression check. Runs a fresh interpreter with `-X importtime` for
+# each headless module and fails if tkinter (or anything else GUI-only) gets
+# pulled in, or if the module's cumulative import time exceeds its budget.
+#
+#   python check_import_time.py
+
+# Module -> cumulative import budget in microseconds. Generous enough for a slow
+# machine, far below the ~40ms tkinter alone costs.
+BUDGETS_US = {
+    "race_data": 5000,
+    "penumbra_json": 5000,
+    "mod_builder": 5000,
+    "project_spec": 5000,
+    "cli": 5000,
+    "watch": 5000,
+    "resolver": 5000,
+    "main": 5000,
+    "mod_model": 5000,
+    "conflicts": 5000,
+    "group_split": 5000,
+    "scheduler": 5000,
+    "verify": 5000,
+    "pmp_diff": 5000,
+    "library_scan": 5000,
+    "sharding": 5000,
+    "unpacked_export": 5000,
+    "build_manifest": 5000,
+    "pattern_list": 5000,
+    "live_validation": 5000,
+    "group_preview": 5000,
+}
+
+FORBIDDEN = ("tkinter", "_tkinter")
+
+def measure_import(module):
+    """Return {imported_module: cumulative_us} for a cold import of module"""
+    # Warm the bytecode cache first so we time imports, not compilation
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    subprocess.run([sys.executable, "-c", f"import {module}"], env=env, check=True)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=env, capture_output=True, text=True, check=True
+    )
+    timings = {}
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        timings[name.strip()] = int(cumulative)
+    return timings
+
+def main():
+    failures = []
+    for module, budget in BUDGETS_US.items():
+        timings = measure_import(module)
+        cumulative = timings.get(module, 0)
+        forbidden = sorted(name for name in timings if name.split(".")[0] in FORBIDDEN)
+        status = "ok"
+        if forbidden:
+            status = "FAIL"
+            failures.append(f"{module} imports GUI modules: {', '.join(forbidden)}")
+        if cumulative > budget:
+            status = "FAIL"
+            failures.append(f"{module} took {cumulative / 1000:.1f}ms (budget {budget / 1000:.1f}ms)")
+        print(f"{module:<16} {cumulative / 1000:7.2f}ms  {status}")
+
+    for failure in failures:
+        print(f"Error: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,344 @@
+import sys
+
+# Headless command line front end. Subcommands import what they need when they
+# run so `main.py --help` stays as cheap as importing mod_builder.
+
+
+def conflict_reporter(fail_on_conflict):
+    """on_conflict callback for build_mod that prints the conflicts and decides whether to go on"""
+    def on_conflict(conflicts):
+        from conflicts import format_conflicts
+
+        level = "Error" if fail_on_conflict else "Warning"
+        print(f"{level}: {len(conflicts)} game paths are redirected by more than one group:", file=sys.stderr)
+        for line in format_conflicts(conflicts):
+            print(f"  {line}", file=sys.stderr)
+        return not fail_on_conflict
+
+    return on_conflict
+
+def cmd_build(args):
+    from project_spec import load_project_spec
+    from mod_builder import validate_project, build_mod
+
+    mod_info, operations = load_project_spec(args.spec)
+    errors = validate_project(mod_info, operations)
+    if errors:
+        for error in errors:
+            print(f"Error: {error}", file=sys.stderr)
+        return 1
+
+    if args.output is not None:
+        return build_to_output(args, mod_info, operations)
+
+    if args.max_volume_size:
+        from sharding import build_sharded
+
+        pmp_paths = build_sharded(mod_info, operations, args.out_dir, args.max_volume_size,
+                                  reproducible=args.reproducible, on_conflict=conflict_reporter(args.fail_on_conflict),
+                                  jobs=args.jobs or None, manifest=not args.no_manifest,
+                                  log=lambda message: print(message, file=sys.stderr),
+                                  allow_oversized=args.allow_oversized_volumes)
+    else:
+        pmp_path = build_mod(mod_info, operations, args.out_dir, reproducible=args.reproducible,
+                             on_conflict=conflict_reporter(args.fail_on_conflict), jobs=args.jobs,
+                             manifest=not args.no_manifest)
+        pmp_paths = None if pmp_path is None else [pmp_path]
+    if pmp_paths is None:
+        return 1
+    if args.verify and not all([report_verification(pmp_path) for pmp_path in pmp_paths]):
+        return 1
+    for pmp_path in pmp_paths:
+        print(f"Generated Penumbra mod package: {pmp_path}")
+    return 0
+
+def build_to_output(args, mod_info, operations):
+    """build --output: write the package straight to a file or, for "-", to stdout"""
+    import os
+    from mod_builder import build_mod
+
+    if args.max_volume_size:
+        print("Error: --output can't be combined with --max-volume-size", file=sys.stderr)
+        return 1
+    if args.output == "-" and args.verify:
+        print("Error: --verify needs a file to re-read, not stdout", file=sys.stderr)
+        return 1
+
+    on_conflict = conflict_reporter(args.fail_on_conflict)
+    if args.output == "-":
+        written = build_mod(mod_info, operations, None, reproducible=args.reproducible, on_conflict=on_conflict,
+                            jobs=args.jobs, stream=sys.stdout.buffer)
+        return 1 if written is None else 0
+
+    with open(args.output, "wb") as stream:
+        written = build_mod(mod_info, operations, None, reproducible=args.reproducible, on_conflict=on_conflict,
+                            jobs=args.jobs, stream=stream)
+    if written is None:
+        os.remove(args.output)
+        return 1
+    if args.verify and not report_verification(args.output):
+        return 1
+    print(f"Generated Penumbra mod package: {args.output}")
+    return 0
+
+def parse_size(text):
+    """argparse type for byte sizes such as 500000, 100K, 95M or 1.5G"""
+    import argparse
+
+    units = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+    text = text.strip().upper().removesuffix("B")
+    try:
+        if text and text[-1] in units:
+            size = int(float(text[:-1]) * units[text[-1]])
+        else:
+            size = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid size: {text!r}")
+    if size <= 0:
+        raise argparse.ArgumentTypeError("size must be positive")
+    return size
+
+def cmd_export(args):
+    from project_spec import load_project_spec
+    from mod_builder import validate_project
+    from unpacked_export import export_unpacked
+
+    mod_info, operations = load_project_spec(args.spec)
+    errors = validate_project(mod_info, operations)
+    if errors:
+        for error in errors:
+            print(f"Error: {error}", file=sys.stderr)
+        return 1
+
+    stats = export_unpacked(mod_info, operations, args.mod_dir, reproducible=args.reproducible,
+                            on_conflict=conflict_reporter(args.fail_on_conflict), link_assets=not args.copy,
+                            hardlink_assets=args.hardlink and not args.copy)
+    if stats is None:
+        return 1
+    print(f"Exported to {args.mod_dir}: {stats['written']} written ({stats['linked']} linked), "
+          f"{stats['unchanged']} unchanged, {stats['deleted']} deleted")
+    return 0
+
+def report_verification(pmp_path):
+    """Verify a package, printing any problems; returns True when it is sound"""
+    from verify import verify_package
+
+    problems = verify_package(pmp_path)
+    for problem in problems:
+        print(f"Error: {problem}", file=sys.stderr)
+    return not problems
+
+def cmd_verify(args):
+    if not report_verification(args.pmp):
+        return 1
+    print(f"{args.pmp}: OK")
+    return 0
+
+def cmd_watch(args):
+    import os
+    from project_spec import load_project_spec
+    from watch import ModWatcher
+
+    if not os.path.exists(args.spec):
+        print(f"Error: project spec not found: {args.spec}", file=sys.stderr)
+        return 1
+
+    watcher = ModWatcher(lambda: load_project_spec(args.spec), args.out_dir, spec_path=args.spec,
+                         unpacked_dir=args.unpacked, reproducible=args.reproducible, debounce=args.debounce,
+                         manifest=not args.no_manifest)
+    watcher.run(args.interval)
+    return 0
+
+def cmd_resolve(args):
+    import json
+    from resolver import ModResolver, parse_selection
+
+    resolver = ModResolver.from_path(args.mod)
+    try:
+        redirections = resolver.resolve(parse_selection(args.select))
+    except (KeyError, ValueError) as e:
+        print(f"Error: {e.args[0]}", file=sys.stderr)
+        return 1
+    json.dump({path: list(value) for path, value in sorted(redirections.items())}, sys.stdout, indent=2)
+    print()
+    return 0
+
+def cmd_conflicts(args):
+    import json
+    import os
+    from conflicts import format_conflicts
+    from library_scan import scan_library, CACHE_FILE_NAME
+
+    cache_path = None if args.no_cache else (args.cache or os.path.join(args.folder, CACHE_FILE_NAME))
+    log = lambda message: print(message, file=sys.stderr)
+    index, stats = scan_library(args.folder, cache_path=cache_path, jobs=args.jobs, log=log)
+
+    if args.json:
+        report = {path: [{'mod': mod, 'option': option, 'kind': kind} for mod, (option, kind) in claimants]
+                  for path, claimants in sorted(index.conflicts.items())}
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        print(f"Scanned {stats['packages']} packages ({stats['indexed']} indexed, {stats['cached']} cached, "
+              f"{stats['failed']} failed), {len(index)} game paths, {len(index.conflicts)} conflicts")
+        for line in format_conflicts(index.conflicts, limit=args.limit):
+            print(f"  {line}")
+    return 1 if index.conflicts and args.fail_on_conflict else 0
+
+def cmd_diff(args):
+    import json
+    from pmp_diff import diff_packages, format_diff, has_differences
+
+    diff = diff_packages(args.old, args.new)
+    if args.json:
+        json.dump(diff, sys.stdout, indent=2)
+        print()
+    else:
+        for line in format_diff(diff, limit=args.limit):
+            print(line)
+    return 1 if has_differences(diff) else 0
+
+def cmd_serve(args):
+    import asyncio
+    from build_server import BuildServer
+
+    server = BuildServer(max_builds=args.max_builds, log=lambda message: print(message, file=sys.stderr))
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.socket))
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+def cmd_client(args):
+    import os
+    from build_server import send_request
+
+    request = {'id': 1, 'command': args.request}
+    if args.request in ("build", "dry-run"):
+        request['spec'] = os.path.abspath(args.path)
+    elif args.request == "verify":
+        request['pmp'] = os.path.abspath(args.path)
+    if args.out_dir:
+        request['out_dir'] = os.path.abspath(args.out_dir)
+    if args.reproducible:
+        request['reproducible'] = True
+
+    try:
+        for event in send_request(request, args.host, args.port, args.socket, args.token):
+            kind = event['event']
+            if kind == "log":
+                print(event['message'])
+            elif kind == "queued" and event['waiting']:
+                print(f"Queued behind {event['waiting']} requests", file=sys.stderr)
+            elif kind == "error":
+                print(f"Error: {event['message']}", file=sys.stderr)
+                return 1
+            elif kind == "done":
+                print(" ".join(f"{key}={value}" for key, value in event.items() if key not in ('id', 'event')))
+                return 0 if event['status'] in ("ok", "built", "up-to-date", "stopping") else 1
+    except OSError as e:
+        print(f"Error: cannot reach build server: {e}", file=sys.stderr)
+    return 1
+
+def build_parser():
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="main.py", description="Penumbra Path Mapper. Run without arguments to open the GUI.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build = subparsers.add_parser("build", help="build a .pmp from a project spec")
+    build.add_argument("spec", help="project spec JSON file")
+    build.add_argument("-o", "--out-dir", default=".", help="output directory (default: current directory)")
+    build.add_argument("--output", metavar="FILE",
+                       help="write the package to FILE instead, or to stdout with \"-\" (no manifest is written)")
+    build.add_argument("--reproducible", action="store_true",
+                       help="byte-identical output for identical inputs (sorted entries, fixed timestamps)")
+    build.add_argument("--fail-on-conflict", action="store_true",
+                       help="fail instead of warning when several groups redirect the same game path")
+    build.add_argument("-j", "--jobs", type=int, default=1,
+                       help="generate groups on this many processes, 0 for one per CPU (default: 1)")
+    build.add_argument("--verify", action="store_true",
+                       help="re-read the package afterwards and check CRCs, JSON structure and file references")
+    build.add_argument("--max-volume-size", type=parse_size, metavar="SIZE",
+                       help="split the mod into <name>_partNN.pmp volumes of at most SIZE bytes (e.g. 95M)")
+    build.add_argument("--allow-oversized-volumes", action="store_true",
+                       help="with --max-volume-size, put an operation that is larger than SIZE on its own in a "
+                            "volume over the limit instead of failing")
+    build.add_argument("--no-manifest", action="store_true",
+                       help="don't write <name>.manifest.json (group and asset statistics) next to the package")
+    build.set_defaults(func=cmd_build)
+
+    export = subparsers.add_parser("export", help="write the mod unpacked into a folder, touching only changed files")
+    export.add_argument("spec", help="project spec JSON file")
+    export.add_argument("mod_dir", help="unpacked mod folder, e.g. inside Penumbra's mod directory")
+    export.add_argument("--reproducible", action="store_true", help="see build --reproducible")
+    export.add_argument("--fail-on-conflict", action="store_true", help="see build --fail-on-conflict")
+    export.add_argument("--copy", action="store_true", help="always copy assets instead of reflinking them")
+    export.add_argument("--hardlink", action="store_true",
+                        help="hard link assets where reflinks are not supported (edits to the exported files "
+                             "then change the originals)")
+    export.set_defaults(func=cmd_export)
+
+    watch = subparsers.add_parser("watch", help="rebuild whenever the spec or its assets change")
+    watch.add_argument("spec", help="project spec JSON file")
+    watch.add_argument("-o", "--out-dir", default=".", help="output directory (default: current directory)")
+    watch.add_argument("--unpacked", metavar="DIR", help="keep the mod unpacked in DIR instead of writing a .pmp")
+    watch.add_argument("--interval", type=float, default=1.0, help="seconds between polls (default: 1)")
+    watch.add_argument("--debounce", type=float, default=0.5, help="seconds inputs must be quiet before rebuilding (default: 0.5)")
+    watch.add_argument("--reproducible", action="store_true", help="see build --reproducible")
+    watch.add_argument("--no-manifest", action="store_true", help="see build --no-manifest")
+    watch.set_defaults(func=cmd_watch)
+
+    resolve = subparsers.add_parser("resolve", help="print the game path redirections a mod applies for chosen options")
+    resolve.add_argument("mod", help=".pmp package or unpacked mod folder")
+    resolve.add_argument("-s", "--select", action="append", default=[], metavar="GROUP=OPTION",
+                         help="option to pick for a group (repeatable; other groups use their defaults)")
+    resolve.set_defaults(func=cmd_resolve)
+
+    conflicts = subparsers.add_parser("conflicts", help="report game paths redirected by more than one .pmp in a folder")
+    conflicts.add_argument("folder", help="folder containing .pmp packages")
+    conflicts.add_argument("-j", "--jobs", type=int, help="worker processes, 0 for one per CPU (default: one per CPU)")
+    conflicts.add_argument("--cache", metavar="FILE", help="index cache file (default: FOLDER/.pmp_index_cache.json)")
+    conflicts.add_argument("--no-cache", action="store_true", help="always re-index every package")
+    conflicts.add_argument("--limit", type=int, default=50, help="conflicting paths to list (default: 50)")
+    conflicts.add_argument("--json", action="store_true", help="print every conflict as JSON")
+    conflicts.add_argument("--fail-on-conflict", action="store_true", help="exit with status 1 when conflicts are found")
+    conflicts.set_defaults(func=cmd_conflicts)
+
+    diff = subparsers.add_parser("diff", help="compare two .pmp packages entry by entry")
+    diff.add_argument("old", help="old .pmp package")
+    diff.add_argument("new", help="new .pmp package")
+    diff.add_argument("--limit", type=int, default=10, help="mappings to list per option (default: 10)")
+    diff.add_argument("--json", action="store_true", help="print the full diff as JSON")
+    diff.set_defaults(func=cmd_diff)
+
+    verify = subparsers.add_parser("verify", help="check a .pmp package's CRCs, JSON structure and file references")
+    verify.add_argument("pmp", help=".pmp package")
+    verify.set_defaults(func=cmd_verify)
+
+    serve = subparsers.add_parser("serve", help="run a warm build server for editor integrations and scripts")
+    serve.add_argument("--host", default="127.0.0.1", help="address to listen on (default: 127.0.0.1)")
+    serve.add_argument("--port", type=int, default=8765, help="TCP port (default: 8765)")
+    serve.add_argument("--socket", metavar="PATH", help="listen on a Unix socket instead of TCP")
+    serve.add_argument("--max-builds", type=int, default=2, help="requests processed at once (default: 2)")
+    serve.set_defaults(func=cmd_serve)
+
+    client = subparsers.add_parser("client", help="send one request to a running build server")
+    client.add_argument("request", choices=["build", "dry-run", "verify", "ping", "shutdown"])
+    client.add_argument("path", nargs="?", help="project spec (build, dry-run) or .pmp package (verify)")
+    client.add_argument("-o", "--out-dir", help="output directory for build (default: the spec's directory)")
+    client.add_argument("--reproducible", action="store_true", help="see build --reproducible")
+    client.add_argument("--host", default="127.0.0.1", help="server address (default: 127.0.0.1)")
+    client.add_argument("--port", type=int, default=8765, help="server TCP port (default: 8765)")
+    client.add_argument("--socket", metavar="PATH", help="server Unix socket")
+    client.add_argument("--token", help="the token the server printed at startup (default: $PENUMBRA_BUILD_TOKEN)")
+    client.set_defaults(func=cmd_client)
+
+    return parser
+
+def run(argv):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
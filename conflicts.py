@@ -0,0 +1,72 @@
+# Conflict detection over generated game path mappings.
+#
+# TargetIndex is an inverted index from game path to whoever claims it. It is
+# filled in a single pass and only keeps the first claimant of each path, plus
+# one entry per distinct owner for paths that turn out to be contested, so it
+# stays linear in time and small in memory even for hundreds of thousands of
+# mappings. Game paths are compared case-insensitively, like Penumbra does.
+
+def group_claims(group):
+    """[(game paths, (option name, kind))] for each distinct Files/FileSwaps key tuple of a group
+
+    The race options of a redirection group share one key tuple, so it is
+    indexed once, tagged with the first option that uses it. Paths a group
+    repeats are never conflicts (they have the same owner), so this reports
+    exactly what indexing every option would.
+    """
+    claims = []
+    seen = set()
+    for option in group.options:
+        for kind, path_map in (('Files', option.files), ('FileSwaps', option.file_swaps)):
+            keys = path_map.keys
+            if keys and id(keys) not in seen:
+                seen.add(id(keys))
+                claims.append((keys, (option.name, kind)))
+    return claims
+
+class TargetIndex:
+    """Inverted index of game path -> (owner, detail) that records paths claimed by several owners"""
+
+    def __init__(self):
+        self.first = {}      # lowercased path -> (owner, detail)
+        self.conflicts = {}  # lowercased path -> [(owner, detail), ...] one entry per owner
+
+    def add(self, game_path, owner, detail):
+        self.add_paths((game_path,), owner, detail)
+
+    def add_paths(self, game_paths, owner, detail):
+        """Claim every path of game_paths for owner; paths the owner already holds are skipped"""
+        first, conflicts = self.first, self.conflicts
+        claim = (owner, detail)
+        for game_path in game_paths:
+            key = game_path.lower()
+            held = first.setdefault(key, claim)
+            if held[0] == owner:
+                continue
+            claimants = conflicts.get(key)
+            if claimants is None:
+                conflicts[key] = [held, claim]
+            elif all(claimant[0] != owner for claimant in claimants):
+                claimants.append(claim)
+
+    def add_claims(self, claims, owner):
+        """Index the output of group_claims under owner"""
+        for game_paths, detail in claims:
+            self.add_paths(game_paths, owner, detail)
+
+    def add_group(self, group, owner=None):
+        """Index every Files and FileSwaps key of a generated mod_model.Group; the owner defaults to its name"""
+        self.add_claims(group_claims(group), group.name if owner is None else owner)
+
+    def __len__(self):
+        return len(self.first)
+
+def format_conflicts(conflicts, limit=20):
+    """Describe group conflicts as human readable lines, at most limit paths"""
+    lines = []
+    for game_path in sorted(conflicts)[:limit]:
+        claimants = ", ".join(f"{owner} ({option}, {kind})" for owner, (option, kind) in conflicts[game_path])
+        lines.append(f"{game_path}: {claimants}")
+    if len(conflicts) > limit:
+        lines.append(f"... and {len(conflicts) - limit} more conflicting paths")
+    return lines
@@ -0,0 +1,116 @@
+import itertools
+from mod_builder import expand_races, generate_operation_groups
+from mod_model import iter_group_chunks
+
+# Preview of the group JSON a tab will generate, for the GUI's preview pane.
+#
+# Small groups are shown as the exact JSON a build writes. Large ones are
+# summarised: the number of distinct swap sources of an option is all it takes
+# to know its size, and it only needs the source paths, not the per-target
+# values, so even tabs producing tens of thousands of swaps preview quickly.
+# Race sets are cached on their inputs, the source paths of each pattern on
+# (pattern, variant, source races), and whole previews on the operation
+# snapshot, so editing one field or one pattern only recomputes what depends
+# on it and switching back to a tab is free.
+
+PREVIEW_MAX_MAPPINGS = 2000  # Larger groups are summarised instead of shown
+PREVIEW_SAMPLE_SWAPS = 10
+PREVIEW_CACHE_SIZE = 32
+PATTERN_CACHE_LIMIT = 1 << 18  # Per-pattern entries kept before the cache starts over
+
+class GroupPreviewer:
+    """Preview texts for operation snapshots; not thread-safe, the GUI uses it from one worker thread"""
+
+    def __init__(self, max_mappings=PREVIEW_MAX_MAPPINGS):
+        self.max_mappings = max_mappings
+        self.races = {}    # (races, male, female) -> {race_name: race_id}
+        self.pattern_paths = {}  # (pattern, variant, source race ids) -> (variant pattern, [source path])
+        self.previews = {}  # operation key -> text, most recently used last
+
+    def expand(self, races, male, female):
+        key = (tuple(races), male, female)
+        if key not in self.races:
+            self.races[key] = expand_races(races, male, female)
+        return self.races[key]
+
+    def source_paths(self, patterns, variant, source_ids):
+        """{source path: variant pattern it swaps to}, with the same last-pattern-wins rule as the generator"""
+        source_ids = tuple(source_ids)
+        cache = self.pattern_paths
+        if len(cache) >= PATTERN_CACHE_LIMIT:
+            cache = self.pattern_paths = {}
+        paths = {}
+        for pattern in patterns:
+            key = (pattern, variant, source_ids)
+            entry = cache.get(key)
+            if entry is None:
+                target = pattern.replace("{variant}", variant)
+                entry = cache[key] = (target, [target.replace("{race_id}", source_id) for source_id in source_ids])
+            target, sources = entry
+            for source_path in sources:
+                paths[source_path] = target
+        return paths
+
+    def preview(self, op):
+        """Return the preview text for an operation snapshot"""
+        import json
+
+        key = json.dumps(op, sort_keys=True)
+        text = self.previews.pop(key, None)
+        if text is None:
+            try:
+                text = self.render(op)
+            except (KeyError, ValueError, TypeError) as e:
+                text = f"No preview: {e}"
+            if len(self.previews) >= PREVIEW_CACHE_SIZE:
+                self.previews.pop(next(iter(self.previews)))
+        self.previews[key] = text
+        return text
+
+    def render(self, op):
+        if op['type'] == 'file_redirection':
+            if not op['patterns']:
+                return "No patterns yet."
+            variant_count = int(op['variant_count'])
+            source_races = self.expand(op['source_races'], op['source_include_male'], op['source_include_female'])
+            target_races = self.expand(op['target_races'], op['target_include_male'], op['target_include_female'])
+            race_mapping = op.get('race_mapping') or {}
+            option_paths = {}
+            by_sources = {}  # Options without a mapping all share one set of source paths
+            for target_race in target_races:
+                mapped = race_mapping.get(target_race)
+                source_ids = tuple(source_id for source_race, source_id in source_races.items()
+                                   if mapped is None or source_race in mapped)
+                if source_ids not in by_sources:
+                    by_sources[source_ids] = self.source_paths(op['patterns'], "01", source_ids)
+                option_paths[target_race] = by_sources[source_ids]
+            if sum(map(len, option_paths.values())) > self.max_mappings:
+                return self.summary(op, variant_count, target_races, option_paths)
+            # The first variant, exactly as a build writes it
+            op = dict(op, variant_count=1)
+
+        groups = [group for group, _ in generate_operation_groups(op)]
+        if not groups:
+            return "Nothing to generate."
+        header = f"// group 1 of {len(groups)}\n" if len(groups) > 1 else ""
+        return header + "".join(iter_group_chunks(groups[0], indent=2))
+
+    def summary(self, op, variant_count, target_races, option_paths):
+        counts = [len(paths) for paths in option_paths.values()]
+        total = sum(counts)
+        per_option = str(counts[0]) if min(counts) == max(counts) else f"{min(counts)}-{max(counts)}"
+        lines = [
+            f"Group {op['group_name']}01 (variant 1 of {variant_count}) is too large to show:",
+            f"  {len(target_races) + 1} options (Off + {len(target_races)} races)",
+            f"  {per_option} swaps per race option, {total} in total",
+            f"  {total * variant_count} swaps over all {variant_count} variants",
+        ]
+        if op.get('split_mode', "none") != "none":
+            lines.append(f"  split mode: {op['split_mode']} above {op.get('split_threshold') or 'the default threshold'} mappings")
+
+        # The first swaps of the first race option
+        target_name, target_id = next(iter(target_races.items()))
+        lines.append(f"First swaps of \"{target_name}\":")
+        for source_path, pattern in itertools.islice(option_paths[target_name].items(), PREVIEW_SAMPLE_SWAPS):
+            lines.append(f"  {source_path} -> {pattern.replace('{race_id}', target_id)}")
+        return "\n".join(lines)
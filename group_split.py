@@ -0,0 +1,104 @@
+from mod_model import Group, default_option
+from penumbra_json import generate_penumbra_json
+
+# Splitting of oversized redirection groups.
+#
+# A redirection variant with every race selected and a long pattern list gives
+# one group whose options each hold a huge FileSwaps map. Groups with more
+# mappings than a threshold are partitioned into sub-groups:
+#
+#   race      one sub-group per target race family ("Midlander", "Au Ra", ...)
+#   patterns  regenerate for consecutive slices of the pattern list
+#   size      pack whole options into sub-groups of at most a mapping budget
+#
+# Sub-group k of a split group goes on Page k, so each page of the mod shows
+# at most one part of it. Pages only depend on the group itself, which keeps
+# every operation independent for the parallel scheduler and watch mode.
+# Parts keep the operation's group_name, so add_group_ids_to_files gives them
+# the operation's group ID like any other variant file.
+#
+# In race and size mode every part swaps the same source paths, so only the
+# first part keeps the original default selection and the others default to
+# "Off"; in patterns mode the parts cover different paths and all keep it.
+
+SPLIT_MODES = ("none", "race", "patterns", "size")
+DEFAULT_SPLIT_THRESHOLD = 20000  # mappings in a group before it is split
+DEFAULT_PATTERNS_PER_GROUP = 50
+
+def group_mapping_count(group):
+    """Total Files and FileSwaps entries over all options of a group"""
+    return sum(len(option.files) + len(option.file_swaps) for option in group.options)
+
+def race_family(option_name):
+    """"Au Ra F" -> "Au Ra"; names without a gender suffix are their own family"""
+    if option_name.endswith((" M", " F")):
+        return option_name[:-2]
+    return option_name
+
+def split_by_race_family(group):
+    """Return [(label, [options])], one part per target race family in order of appearance"""
+    families = {}
+    for option in group.options[1:]:  # Skip "Off"
+        families.setdefault(race_family(option.name), []).append(option)
+    return list(families.items())
+
+def split_by_size(group, budget):
+    """Return [(label, [options])], packing options in order into parts of at most budget mappings
+
+    An option larger than the budget on its own gets a part to itself.
+    """
+    parts = []
+    current, size = [], 0
+    for option in group.options[1:]:
+        option_size = len(option.files) + len(option.file_swaps)
+        if current and size + option_size > budget:
+            parts.append(current)
+            current, size = [], 0
+        current.append(option)
+        size += option_size
+    if current:
+        parts.append(current)
+    return [(f"{part[0].name} - {part[-1].name}" if len(part) > 1 else part[0].name, part) for part in parts]
+
+def split_setting(op, field, default):
+    """An integer split setting of an operation; missing, empty, 0 and "0" all give default"""
+    return int(op.get(field) or 0) or default
+
+def generate_split_groups(op, variant, source_races, target_races):
+    """Generate one redirection variant, split according to the operation's split settings
+
+    Returns [(Group, json_name)]: a single entry when the group is not split.
+    """
+    group_name = op['group_name']
+    race_mapping = op.get('race_mapping')
+    group, json_name = generate_penumbra_json(op['patterns'], variant, group_name, source_races, target_races, race_mapping)
+    mode = op.get('split_mode', "none")
+    threshold = split_setting(op, 'split_threshold', DEFAULT_SPLIT_THRESHOLD)
+    if mode == "none" or group_mapping_count(group) <= threshold:
+        return [(group, json_name)]
+
+    if mode == "patterns":
+        patterns = op['patterns']
+        size = split_setting(op, 'split_size', DEFAULT_PATTERNS_PER_GROUP)
+        parts = []
+        for start in range(0, len(patterns), size):
+            part, _ = generate_penumbra_json(patterns[start:start + size], variant, group_name, source_races,
+                                             target_races, race_mapping)
+            parts.append((f"patterns {start + 1}-{min(start + size, len(patterns))}", part.options[1:]))
+        keep_default = True
+    elif mode == "race":
+        parts = split_by_race_family(group)
+        keep_default = False
+    else:
+        parts = split_by_size(group, split_setting(op, 'split_size', threshold))
+        keep_default = False
+
+    if len(parts) < 2:
+        return [(group, json_name)]
+
+    groups = []
+    for k, (label, options) in enumerate(parts):
+        default_settings = group.default_settings if k == 0 or keep_default else 0
+        groups.append((Group(f"{json_name} ({label})", [default_option()] + list(options), page=k,
+                             default_settings=default_settings), f"{json_name}_{k + 1:02}"))
+    return groups
@@ -0,0 +1,1025 @@
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+from mod_builder import generate_mod_path, build_mod, expand_races
+from race_data import RACES
+from group_split import SPLIT_MODES, DEFAULT_SPLIT_THRESHOLD
+from pattern_editor import PatternEditor
+
+# How often watch mode polls the tabs and their files
+WATCH_INTERVAL_MS = 1000
+
+# How often the problems panel revalidates the tabs
+VALIDATE_INTERVAL_MS = 500
+
+# How often the preview pane looks at the selected tab, and how long a tab has
+# to stay unchanged before its preview is recomputed
+PREVIEW_INTERVAL_MS = 150
+PREVIEW_DEBOUNCE_MS = 300
+
+# Worker processes for Generate; 0 means one per CPU. Projects estimated below
+# scheduler.PARALLEL_MIN_MAPPINGS build serially without starting a pool.
+BUILD_JOBS = 0
+
+
+def snapshot_race_mapping(tab_data):
+    """Read a redirection tab's race mapping grid as {option race: [applied to races]}
+
+    Only selected options whose row leaves out a selected 'Applied to' race are
+    listed; an empty mapping swaps every source race onto every option. Cells
+    whose variable does not exist yet (the grid was never built) count as ticked.
+    """
+    if not tab_data['race_mapping_enabled'].get():
+        return {}
+    source_races = expand_races([race for race, var in tab_data['source_race_vars'].items() if var.get()],
+                                tab_data['source_include_male'].get(), tab_data['source_include_female'].get())
+    target_races = expand_races([race for race, var in tab_data['target_race_vars'].items() if var.get()],
+                                tab_data['target_include_male'].get(), tab_data['target_include_female'].get())
+    mapping_vars = tab_data['race_mapping_vars']
+    mapping = {}
+    for target_race in target_races:
+        sources = [source_race for source_race in source_races
+                   if (target_race, source_race) not in mapping_vars or mapping_vars[(target_race, source_race)].get()]
+        if len(sources) < len(source_races):
+            mapping[target_race] = sources
+    return mapping
+
+def snapshot_operation(tab_data):
+    """Read an operation tab's widgets into a plain operation dict for mod_builder"""
+    if tab_data['type'] == 'file_redirection':
+        return {
+            'type': 'file_redirection',
+            'patterns': tab_data['pattern_editor'].patterns(),  # Replaced, never mutated, by the editor
+            'variant_count': tab_data['variant_count_entry'].get().strip(),
+            'group_name': tab_data['group_name_entry'].get().strip(),
+            'source_include_male': tab_data['source_include_male'].get(),
+            'source_include_female': tab_data['source_include_female'].get(),
+            'source_races': [race for race, var in tab_data['source_race_vars'].items() if var.get()],
+            'target_include_male': tab_data['target_include_male'].get(),
+            'target_include_female': tab_data['target_include_female'].get(),
+            'target_races': [race for race, var in tab_data['target_race_vars'].items() if var.get()],
+            'split_mode': tab_data['split_mode_var'].get(),
+            'split_threshold': tab_data['split_threshold_entry'].get().strip(),
+            'split_size': tab_data['split_size_entry'].get().strip(),
+            'race_mapping': snapshot_race_mapping(tab_data)
+        }
+
+    options = []
+    for option_data in tab_data['options_data']:
+        files = []
+        for pattern_data in option_data['file_patterns_data']:
+            try:
+                files.append({
+                    'local_file': pattern_data['local_file_var'].get().strip(),
+                    'target_pattern': pattern_data['target_pattern_entry'].get().strip()
+                })
+            except tk.TclError:
+                # Widget was destroyed, skip this entry
+                continue
+        options.append({
+            'option_name': option_data['option_name_entry'].get().strip(),
+            'files': files
+        })
+
+    return {
+        'type': 'file_override',
+        'group_name': tab_data['group_name_entry'].get().strip(),
+        'options': options,
+        'applied_include_male': tab_data['applied_include_male'].get(),
+        'applied_include_female': tab_data['applied_include_female'].get(),
+        'applied_races': [race for race, var in tab_data['applied_race_vars'].items() if var.get()]
+    }
+
+class PenumbraPathMapperApp(tk.Tk):
+    def __init__(self):
+        super().__init__()
+        self.title("Penumbra Path Mapper")
+        self.geometry("1200x850")
+        self.create_widgets()
+
+    def create_widgets(self):
+        frm = ttk.Frame(self, padding="10")
+        frm.pack(fill=tk.BOTH, expand=True)
+
+        row = 0
+
+        # Mod info
+        ttk.Label(frm, text="Mod Name:").grid(column=0, row=row, sticky='w')
+        self.mod_name_entry = ttk.Entry(frm, width=50)
+        self.mod_name_entry.grid(column=1, row=row, sticky='w')
+        row += 1
+
+        ttk.Label(frm, text="Author:").grid(column=0, row=row, sticky='w')
+        self.author_entry = ttk.Entry(frm, width=50)
+        self.author_entry.grid(column=1, row=row, sticky='w')
+        self.author_entry.insert(0, "Penumbra Path Mapper")
+        row += 1
+
+        ttk.Label(frm, text="Description:").grid(column=0, row=row, sticky='w')
+        self.desc_entry = ttk.Entry(frm, width=50)
+        self.desc_entry.grid(column=1, row=row, sticky='w')
+        self.desc_entry.insert(0, "Mod for Penumbra")
+        row += 1
+
+        ttk.Label(frm, text="Website:").grid(column=0, row=row, sticky='w')
+        self.website_entry = ttk.Entry(frm, width=50)
+        self.website_entry.grid(column=1, row=row, sticky='w')
+        self.website_entry.insert(0, "https://github.com/ShinoMythmaker/Penumbra-Path-Mapper")
+        row += 1
+
+        ttk.Label(frm, text="Version:").grid(column=0, row=row, sticky='w')
+        self.version_entry = ttk.Entry(frm, width=20)
+        self.version_entry.grid(column=1, row=row, sticky='w')
+        self.version_entry.insert(0, "1.0.0")
+        row += 1
+
+        # Operations section with tabs
+        ttk.Label(frm, text="Operations:").grid(column=0, row=row, sticky='nw')
+        operations_frame = ttk.Frame(frm)
+        operations_frame.grid(column=1, row=row, sticky='ew', pady=10)
+        
+        # Create notebook for tabs with larger height
+        self.operations_notebook = ttk.Notebook(operations_frame)
+        self.operations_notebook.pack(fill='both', expand=True)
+        
+        # Set minimum height for the operations area
+        operations_frame.configure(height=600)
+        operations_frame.pack_propagate(False)
+        
+        # Add operation button
+        add_button_frame = ttk.Frame(operations_frame)
+        add_button_frame.pack(fill='x', pady=(5, 0))
+        ttk.Button(add_button_frame, text="+ Add File Redirection Operation", 
+                  command=self.add_file_redirection_tab).pack(side='left')
+        ttk.Button(add_button_frame, text="+ Add File Override Operation", 
+                  command=self.add_file_override_tab).pack(side='left', padx=(10, 0))
+        
+        # Store operation tabs
+        self.operation_tabs = []
+        
+        row += 1
+
+        # Output directory
+        ttk.Label(frm, text="Output Directory:").grid(column=0, row=row, sticky='w')
+        self.output_dir = tk.StringVar()
+        self.output_dir.set(".")
+        ttk.Entry(frm, textvariable=self.output_dir, width=45).grid(column=1, row=row, sticky='w')
+        ttk.Button(frm, text="Browse", command=self.browse_output_dir).grid(column=2, row=row, sticky="w")
+        row += 1
+
+        # Reproducible output
+        self.reproducible = tk.BooleanVar(value=False)
+        ttk.Checkbutton(frm, text="Reproducible output (identical inputs give an identical .pmp)",
+                        variable=self.reproducible).grid(column=1, row=row, sticky='w')
+        row += 1
+
+        # Post-build verification
+        self.verify_after_build = tk.BooleanVar(value=False)
+        ttk.Checkbutton(frm, text="Verify package after building", variable=self.verify_after_build).grid(column=1, row=row, sticky='w')
+        row += 1
+
+        # Watch mode
+        self.watch_enabled = tk.BooleanVar(value=False)
+        self.watcher = None
+        ttk.Checkbutton(frm, text="Watch inputs and rebuild on change", variable=self.watch_enabled,
+                        command=self.toggle_watch).grid(column=1, row=row, sticky='w')
+        row += 1
+
+        # Generate button
+        generate_frame = ttk.Frame(frm)
+        generate_frame.grid(column=1, row=row, pady=20)
+        ttk.Button(generate_frame, text="Generate Full Mod", command=self.generate_full_mod).pack(side='left')
+        ttk.Button(generate_frame, text="Export Unpacked...", command=self.export_unpacked_mod).pack(side='left', padx=(10, 0))
+        row += 1
+
+        # Status line for background activity
+        self.status_var = tk.StringVar()
+        ttk.Label(frm, textvariable=self.status_var, foreground="gray").grid(column=1, row=row, sticky='w')
+        row += 1
+
+        # Problems panel, kept up to date in the background
+        ttk.Label(frm, text="Problems:").grid(column=0, row=row, sticky='nw')
+        problems_frame = ttk.Frame(frm)
+        problems_frame.grid(column=1, row=row, sticky='ew')
+        self.problems_list = tk.Listbox(problems_frame, height=5)
+        problems_scrollbar = ttk.Scrollbar(problems_frame, orient="vertical", command=self.problems_list.yview)
+        self.problems_list.configure(yscrollcommand=problems_scrollbar.set)
+        self.problems_list.pack(side="left", fill="both", expand=True)
+        problems_scrollbar.pack(side="right", fill="y")
+        self.start_background_validation()
+        row += 1
+
+        # Preview of the selected tab's group JSON, recomputed in the background while typing
+        ttk.Label(frm, text="Preview:").grid(column=0, row=row, sticky='nw')
+        preview_frame = ttk.Frame(frm)
+        preview_frame.grid(column=1, row=row, sticky='ew')
+        self.preview_text = tk.Text(preview_frame, height=12, wrap="none", state="disabled")
+        preview_scrollbar = ttk.Scrollbar(preview_frame, orient="vertical", command=self.preview_text.yview)
+        self.preview_text.configure(yscrollcommand=preview_scrollbar.set)
+        self.preview_text.pack(side="left", fill="both", expand=True)
+        preview_scrollbar.pack(side="right", fill="y")
+        self.start_preview()
+
+        frm.columnconfigure(1, weight=1)
+
+    def browse_output_dir(self):
+        dirname = filedialog.askdirectory()
+        if dirname:
+            self.output_dir.set(dirname)
+    
+    def add_file_redirection_tab(self):
+        """Add a new file redirection operation tab"""
+        tab_number = len(self.operation_tabs) + 1
+        tab_name = f"Redirection {tab_number}"
+        
+        # Create tab frame
+        tab_frame = ttk.Frame(self.operations_notebook)
+        self.operations_notebook.add(tab_frame, text=tab_name)
+        
+        # Create scrollable frame
+        canvas = tk.Canvas(tab_frame)
+        scrollbar = ttk.Scrollbar(tab_frame, orient="vertical", command=canvas.yview)
+        scrollable_frame = ttk.Frame(canvas)
+        
+        scrollable_frame.bind(
+            "<Configure>",
+            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
+        )
+        
+        # Bind canvas resize to update scrollable frame width
+        def configure_canvas_width(event):
+            canvas.itemconfig(canvas_window, width=event.width)
+        
+        canvas.bind('<Configure>', configure_canvas_width)
+        
+        canvas_window = canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
+        canvas.configure(yscrollcommand=scrollbar.set)
+        
+        canvas.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        
+        # Create the file redirection operation UI
+        tab_data = self.create_file_redirection_operation(scrollable_frame, tab_number)
+        tab_data['frame'] = tab_frame
+        tab_data['name'] = tab_name
+        tab_data['type'] = 'file_redirection'
+        
+        self.operation_tabs.append(tab_data)
+        
+        # Select the new tab
+        self.operations_notebook.select(tab_frame)
+    
+    def add_file_override_tab(self):
+        """Add a new file override operation tab"""
+        tab_number = len(self.operation_tabs) + 1
+        tab_name = f"Override {tab_number}"
+        
+        # Create tab frame
+        tab_frame = ttk.Frame(self.operations_notebook)
+        self.operations_notebook.add(tab_frame, text=tab_name)
+        
+        # Create scrollable frame
+        canvas = tk.Canvas(tab_frame)
+        scrollbar = ttk.Scrollbar(tab_frame, orient="vertical", command=canvas.yview)
+        scrollable_frame = ttk.Frame(canvas)
+        
+        scrollable_frame.bind(
+            "<Configure>",
+            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
+        )
+        
+        # Bind canvas resize to update scrollable frame width
+        def configure_canvas_width(event):
+            canvas.itemconfig(canvas_window, width=event.width)
+        
+        canvas.bind('<Configure>', configure_canvas_width)
+        
+        canvas_window = canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
+        canvas.configure(yscrollcommand=scrollbar.set)
+        
+        canvas.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        
+        # Create the file override operation UI
+        tab_data = self.create_file_override_operation(scrollable_frame, tab_number)
+        tab_data['frame'] = tab_frame
+        tab_data['name'] = tab_name
+        tab_data['type'] = 'file_override'
+        
+        self.operation_tabs.append(tab_data)
+        
+        # Select the new tab
+        self.operations_notebook.select(tab_frame)
+    
+    def create_file_redirection_operation(self, parent, tab_number):
+        """Create the UI for a file redirection operation"""
+        row = 0
+        
+        # Tab header with close button
+        header_frame = ttk.Frame(parent)
+        header_frame.grid(column=0, row=row, columnspan=2, sticky='ew', pady=(0, 10))
+        ttk.Label(header_frame, text=f"File Redirection Operation {tab_number}", 
+                 font=('TkDefaultFont', 10, 'bold')).pack(side='left')
+        ttk.Button(header_frame, text="×", width=3, 
+                  command=lambda: self.close_tab(tab_number-1)).pack(side='right')
+        row += 1
+        
+        # Path patterns
+        ttk.Label(parent, text="File Path Patterns (one per line):").grid(column=0, row=row, sticky='nw')
+        pattern_editor = PatternEditor(parent, "chara/human/{race_id}/animation/a0001/bt_common/emote/s_pose{variant}_loop.pap\nchara/human/{race_id}/animation/a0001/bt_common/emote/s_pose{variant}_start.pap", height=6, width=70)
+        pattern_editor.grid(column=1, row=row, sticky='ew', pady=(0, 10))
+        row += 1
+
+        # Variants
+        ttk.Label(parent, text="Number of Variants:").grid(column=0, row=row, sticky='w')
+        variant_count_entry = ttk.Entry(parent, width=10)
+        variant_count_entry.grid(column=1, row=row, sticky='w', pady=(0, 5))
+        variant_count_entry.insert(0, "4")
+        row += 1
+
+        # Group Name
+        ttk.Label(parent, text="Group Name:").grid(column=0, row=row, sticky='w')
+        group_name_entry = ttk.Entry(parent, width=20)
+        group_name_entry.grid(column=1, row=row, sticky='w', pady=(0, 10))
+        group_name_entry.insert(0, f"operation{tab_number}")
+        row += 1
+
+        # Splitting of oversized groups (see group_split.py)
+        ttk.Label(parent, text="Split Large Groups:").grid(column=0, row=row, sticky='w')
+        split_frame = ttk.Frame(parent)
+        split_frame.grid(column=1, row=row, sticky='w', pady=(0, 10))
+        split_mode_var = tk.StringVar(value="none")
+        ttk.Combobox(split_frame, textvariable=split_mode_var, values=SPLIT_MODES, state='readonly', width=10).pack(side='left')
+        ttk.Label(split_frame, text="above mappings:").pack(side='left', padx=(10, 5))
+        split_threshold_entry = ttk.Entry(split_frame, width=8)
+        split_threshold_entry.pack(side='left')
+        split_threshold_entry.insert(0, str(DEFAULT_SPLIT_THRESHOLD))
+        ttk.Label(split_frame, text="part size (patterns/mappings, blank = default):").pack(side='left', padx=(10, 5))
+        split_size_entry = ttk.Entry(split_frame, width=8)
+        split_size_entry.pack(side='left')
+        row += 1
+
+        # APPLIED TO RACES SECTION
+        ttk.Label(parent, text="Applied to (files in your mod):").grid(column=0, row=row, sticky='nw', columnspan=2)
+        row += 1
+
+        # Applied to Gender Selection
+        ttk.Label(parent, text="Applied to Genders:").grid(column=0, row=row, sticky='w')
+        source_gender_frame = ttk.Frame(parent)
+        source_gender_frame.grid(column=1, row=row, sticky='w')
+        source_include_male = tk.BooleanVar(value=True)
+        source_include_female = tk.BooleanVar(value=True)
+        ttk.Checkbutton(source_gender_frame, text="Male", variable=source_include_male).pack(side='left')
+        ttk.Checkbutton(source_gender_frame, text="Female", variable=source_include_female).pack(side='left', padx=(10, 0))
+        row += 1
+
+        # Applied to Race Selection
+        ttk.Label(parent, text="Applied to Races:").grid(column=0, row=row, sticky='nw')
+        source_race_frame = ttk.Frame(parent)
+        source_race_frame.grid(column=1, row=row, sticky='ew', pady=(0, 5))
+        
+        # Create checkboxes for each applied to race
+        source_race_vars = {}
+        race_names = ["Midlander", "Highlander", "Elezen", "Miqo'te", "Roegadyn", "Lalafell", "Au Ra", "Hrothgar", "Viera"]
+        
+        # Add Select All / Deselect All buttons for applied to races
+        source_button_frame = ttk.Frame(source_race_frame)
+        source_button_frame.pack(fill='x', pady=(0, 5))
+        ttk.Button(source_button_frame, text="Select All", 
+                  command=lambda: self.select_all_races_in_tab(source_race_vars)).pack(side='left')
+        ttk.Button(source_button_frame, text="Deselect All", 
+                  command=lambda: self.deselect_all_races_in_tab(source_race_vars)).pack(side='left', padx=(5, 0))
+        
+        # Create applied to race checkboxes in a grid
+        source_race_grid_frame = ttk.Frame(source_race_frame)
+        source_race_grid_frame.pack(fill='both', expand=True)
+        
+        for i, race in enumerate(race_names):
+            source_race_vars[race] = tk.BooleanVar(value=True)
+            cb = ttk.Checkbutton(source_race_grid_frame, text=race, variable=source_race_vars[race])
+            cb.grid(row=i//3, column=i%3, sticky='w', padx=(0, 10), pady=2)
+        
+        source_race_grid_frame.columnconfigure(0, weight=1)
+        source_race_grid_frame.columnconfigure(1, weight=1)
+        source_race_grid_frame.columnconfigure(2, weight=1)
+        row += 1
+
+        # Separator
+        ttk.Separator(parent, orient='horizontal').grid(column=0, row=row, columnspan=2, sticky='ew', pady=10)
+        row += 1
+
+        # OPTIONS SECTION
+        ttk.Label(parent, text="Options (choices for players):").grid(column=0, row=row, sticky='nw', columnspan=2)
+        row += 1
+
+        # Options Gender Selection
+        ttk.Label(parent, text="Options Genders:").grid(column=0, row=row, sticky='w')
+        target_gender_frame = ttk.Frame(parent)
+        target_gender_frame.grid(column=1, row=row, sticky='w')
+        target_include_male = tk.BooleanVar(value=True)
+        target_include_female = tk.BooleanVar(value=True)
+        ttk.Checkbutton(target_gender_frame, text="Male", variable=target_include_male).pack(side='left')
+        ttk.Checkbutton(target_gender_frame, text="Female", variable=target_include_female).pack(side='left', padx=(10, 0))
+        row += 1
+
+        # Options Race Selection
+        ttk.Label(parent, text="Options Races:").grid(column=0, row=row, sticky='nw')
+        target_race_frame = ttk.Frame(parent)
+        target_race_frame.grid(column=1, row=row, sticky='ew')
+        
+        # Create checkboxes for each options race
+        target_race_vars = {}
+        
+        # Add Select All / Deselect All buttons for options races
+        target_button_frame = ttk.Frame(target_race_frame)
+        target_button_frame.pack(fill='x', pady=(0, 5))
+        ttk.Button(target_button_frame, text="Select All", 
+                  command=lambda: self.select_all_races_in_tab(target_race_vars)).pack(side='left')
+        ttk.Button(target_button_frame, text="Deselect All", 
+                  command=lambda: self.deselect_all_races_in_tab(target_race_vars)).pack(side='left', padx=(5, 0))
+        
+        # Create options race checkboxes in a grid
+        target_race_grid_frame = ttk.Frame(target_race_frame)
+        target_race_grid_frame.pack(fill='both', expand=True)
+        
+        for i, race in enumerate(race_names):
+            target_race_vars[race] = tk.BooleanVar(value=True)
+            cb = ttk.Checkbutton(target_race_grid_frame, text=race, variable=target_race_vars[race])
+            cb.grid(row=i//3, column=i%3, sticky='w', padx=(0, 10), pady=2)
+        
+        target_race_grid_frame.columnconfigure(0, weight=1)
+        target_race_grid_frame.columnconfigure(1, weight=1)
+        target_race_grid_frame.columnconfigure(2, weight=1)
+        
+        row += 1
+
+        # Optional source -> target race mapping; the grid is only built when it is turned on
+        ttk.Label(parent, text="Race Mapping:").grid(column=0, row=row, sticky='nw', pady=(10, 0))
+        race_mapping_frame = ttk.Frame(parent)
+        race_mapping_frame.grid(column=1, row=row, sticky='w', pady=(10, 0))
+        race_mapping_enabled = tk.BooleanVar(value=False)
+        race_mapping_vars = {}  # (option race, applied to race) -> BooleanVar, filled when the grid is built
+        race_mapping_grid = ttk.Frame(race_mapping_frame)
+        ttk.Checkbutton(race_mapping_frame, text="Limit which 'Applied to' races each option uses",
+                        variable=race_mapping_enabled,
+                        command=lambda: self.toggle_race_mapping_grid(race_mapping_grid, race_mapping_enabled,
+                                                                      race_mapping_vars)).pack(anchor='w')
+
+        # Configure column weights
+        parent.columnconfigure(1, weight=1)
+        
+        return {
+            'race_mapping_enabled': race_mapping_enabled,
+            'race_mapping_vars': race_mapping_vars,
+            'pattern_editor': pattern_editor,
+            'variant_count_entry': variant_count_entry,
+            'group_name_entry': group_name_entry,
+            'split_mode_var': split_mode_var,
+            'split_threshold_entry': split_threshold_entry,
+            'split_size_entry': split_size_entry,
+            'source_include_male': source_include_male,
+            'source_include_female': source_include_female,
+            'source_race_vars': source_race_vars,
+            'target_include_male': target_include_male,
+            'target_include_female': target_include_female,
+            'target_race_vars': target_race_vars
+        }
+    
+    def create_file_override_operation(self, parent, tab_number):
+        """Create the UI for a file override operation"""
+        row = 0
+        
+        # Tab header with close button
+        header_frame = ttk.Frame(parent)
+        header_frame.grid(column=0, row=row, columnspan=2, sticky='ew', pady=(0, 10))
+        ttk.Label(header_frame, text=f"File Override Operation {tab_number}", 
+                 font=('TkDefaultFont', 10, 'bold')).pack(side='left')
+        ttk.Button(header_frame, text="×", width=3, 
+                  command=lambda: self.close_tab(tab_number-1)).pack(side='right')
+        row += 1
+
+        # Group Name
+        ttk.Label(parent, text="Group Name:").grid(column=0, row=row, sticky='w')
+        group_name_entry = ttk.Entry(parent, width=20)
+        group_name_entry.grid(column=1, row=row, sticky='w', pady=(0, 10))
+        group_name_entry.insert(0, f"override{tab_number}")
+        row += 1
+
+        # OPTIONS SECTION
+        ttk.Label(parent, text="Options:").grid(column=0, row=row, sticky='nw', columnspan=2, pady=(0, 5))
+        row += 1
+        
+        # Options container
+        options_frame = ttk.Frame(parent)
+        options_frame.grid(column=0, row=row, columnspan=2, sticky='ew', pady=(0, 10))
+        
+        # Store options data
+        options_data = []
+        
+        # Add first option by default
+        option_data = self.create_file_override_option(options_frame, 1, options_data)
+        options_data.append(option_data)
+        
+        # Add option button
+        add_option_frame = ttk.Frame(options_frame)
+        add_option_frame.pack(fill='x', pady=(5, 0))
+        ttk.Button(add_option_frame, text="+ Add Option", 
+                  command=lambda: self.add_file_override_option(options_frame, options_data)).pack(side='left')
+        
+        row += 1
+
+        # Separator
+        ttk.Separator(parent, orient='horizontal').grid(column=0, row=row, columnspan=2, sticky='ew', pady=10)
+        row += 1
+
+        # APPLIED TO RACES SECTION
+        ttk.Label(parent, text="Applied to (races that get this override):").grid(column=0, row=row, sticky='nw', columnspan=2)
+        row += 1
+
+        # Applied to Gender Selection
+        ttk.Label(parent, text="Applied to Genders:").grid(column=0, row=row, sticky='w')
+        applied_gender_frame = ttk.Frame(parent)
+        applied_gender_frame.grid(column=1, row=row, sticky='w')
+        applied_include_male = tk.BooleanVar(value=True)
+        applied_include_female = tk.BooleanVar(value=True)
+        ttk.Checkbutton(applied_gender_frame, text="Male", variable=applied_include_male).pack(side='left')
+        ttk.Checkbutton(applied_gender_frame, text="Female", variable=applied_include_female).pack(side='left', padx=(10, 0))
+        row += 1
+
+        # Applied to Race Selection
+        ttk.Label(parent, text="Applied to Races:").grid(column=0, row=row, sticky='nw')
+        applied_race_frame = ttk.Frame(parent)
+        applied_race_frame.grid(column=1, row=row, sticky='ew')
+        
+        # Create checkboxes for each applied to race
+        applied_race_vars = {}
+        race_names = ["Midlander", "Highlander", "Elezen", "Miqo'te", "Roegadyn", "Lalafell", "Au Ra", "Hrothgar", "Viera"]
+        
+        # Add Select All / Deselect All buttons
+        applied_button_frame = ttk.Frame(applied_race_frame)
+        applied_button_frame.pack(fill='x', pady=(0, 5))
+        ttk.Button(applied_button_frame, text="Select All", 
+                  command=lambda: self.select_all_races_in_tab(applied_race_vars)).pack(side='left')
+        ttk.Button(applied_button_frame, text="Deselect All", 
+                  command=lambda: self.deselect_all_races_in_tab(applied_race_vars)).pack(side='left', padx=(5, 0))
+        
+        # Create applied to race checkboxes in a grid
+        applied_race_grid_frame = ttk.Frame(applied_race_frame)
+        applied_race_grid_frame.pack(fill='both', expand=True)
+        
+        for i, race in enumerate(race_names):
+            applied_race_vars[race] = tk.BooleanVar(value=True)
+            cb = ttk.Checkbutton(applied_race_grid_frame, text=race, variable=applied_race_vars[race])
+            cb.grid(row=i//3, column=i%3, sticky='w', padx=(0, 10), pady=2)
+        
+        applied_race_grid_frame.columnconfigure(0, weight=1)
+        applied_race_grid_frame.columnconfigure(1, weight=1)
+        applied_race_grid_frame.columnconfigure(2, weight=1)
+        
+        # Configure column weights
+        parent.columnconfigure(1, weight=1)
+        
+        return {
+            'group_name_entry': group_name_entry,
+            'options_data': options_data,
+            'options_frame': options_frame,
+            'applied_include_male': applied_include_male,
+            'applied_include_female': applied_include_female,
+            'applied_race_vars': applied_race_vars
+        }
+    
+    def create_file_override_option(self, parent, option_number, options_data):
+        """Create a single file override option"""
+        option_frame = ttk.LabelFrame(parent, text=f"Option {option_number}", padding="10")
+        option_frame.pack(fill='x', pady=(0, 10))
+        
+        row = 0
+        
+        # Option name
+        ttk.Label(option_frame, text="Option Name:").grid(column=0, row=row, sticky='w')
+        option_name_entry = ttk.Entry(option_frame, width=30)
+        option_name_entry.grid(column=1, row=row, sticky='w', pady=(0, 10))
+        option_name_entry.insert(0, f"Option {option_number}")
+        row += 1
+        
+        # File patterns section
+        ttk.Label(option_frame, text="File/Pattern Pairs:").grid(column=0, row=row, sticky='nw', columnspan=3)
+        row += 1
+        
+        # File patterns container
+        file_patterns_frame = ttk.Frame(option_frame)
+        file_patterns_frame.grid(column=0, row=row, columnspan=3, sticky='ew', pady=(0, 10))
+        
+        # Store file pattern data
+        file_patterns_data = []
+        
+        # Add first file pattern by default
+        pattern_data = self.create_file_pattern_pair(file_patterns_frame, 1, file_patterns_data, option_name_entry)
+        file_patterns_data.append(pattern_data)
+        
+        # Add file pattern button
+        add_pattern_frame = ttk.Frame(file_patterns_frame)
+        add_pattern_frame.pack(fill='x', pady=(5, 0))
+        ttk.Button(add_pattern_frame, text="+ Add File/Pattern Pair", 
+                  command=lambda: self.add_file_pattern_pair(file_patterns_frame, file_patterns_data, option_name_entry)).pack(side='left')
+        
+        # Remove option button
+        remove_button_frame = ttk.Frame(option_frame)
+        remove_button_frame.grid(column=2, row=0, sticky='e')
+        ttk.Button(remove_button_frame, text="Remove Option", 
+                  command=lambda: self.remove_file_override_option(parent, option_frame, options_data)).pack()
+        
+        option_frame.columnconfigure(1, weight=1)
+        
+        return {
+            'frame': option_frame,
+            'option_name_entry': option_name_entry,
+            'file_patterns_data': file_patterns_data,
+            'file_patterns_frame': file_patterns_frame,
+            'option_number': option_number
+        }
+    
+    def create_file_pattern_pair(self, parent, pair_number, file_patterns_data, option_name_entry=None):
+        """Create a file/pattern pair"""
+        pair_frame = ttk.Frame(parent)
+        pair_frame.pack(fill='x', pady=(0, 5))
+        
+        # Local file
+        ttk.Label(pair_frame, text=f"File {pair_number}:").grid(column=0, row=0, sticky='w')
+        local_file_var = tk.StringVar()
+        local_file_entry = ttk.Entry(pair_frame, textvariable=local_file_var, width=40)
+        local_file_entry.grid(column=1, row=0, sticky='ew', padx=(5, 0))
+        ttk.Button(pair_frame, text="Browse", 
+                  command=lambda: self.browse_local_file(local_file_var)).grid(column=2, row=0, padx=(5, 0))
+        
+        # Target pattern
+        ttk.Label(pair_frame, text="Target Pattern:").grid(column=0, row=1, sticky='w')
+        target_pattern_entry = ttk.Entry(pair_frame, width=50)
+        target_pattern_entry.grid(column=1, row=1, columnspan=2, sticky='ew', padx=(5, 0), pady=(2, 0))
+        # Make each file/pattern pair unique by including the pair number
+        default_pattern = f"chara/human/{{race_id}}/animation/a0001/bt_common/emote/s_pose{pair_number:02d}_loop.pap"
+        target_pattern_entry.insert(0, default_pattern)
+        
+        # Auto-generated mod path (read-only display)
+        ttk.Label(pair_frame, text="Auto Mod Path:").grid(column=0, row=2, sticky='w')
+        mod_path_var = tk.StringVar()
+        mod_path_label = ttk.Label(pair_frame, textvariable=mod_path_var, width=50, 
+                                  relief="sunken", background="white", foreground="gray")
+        mod_path_label.grid(column=1, row=2, columnspan=2, sticky='ew', padx=(5, 0), pady=(2, 0))
+        
+        # Function to update mod path when option name or target pattern changes
+        def update_mod_path():
+            try:
+                if option_name_entry:
+                    option_name = option_name_entry.get().strip() or "option"
+                    target_pattern = target_pattern_entry.get().strip()
+                    
+                    if target_pattern:
+                        mod_path = generate_mod_path(option_name, target_pattern)
+                        mod_path_var.set(mod_path)
+                    else:
+                        mod_path_var.set("")
+            except Exception as e:
+                # Silently handle any widget access errors
+                pass
+        
+        # Bind events to update mod path automatically
+        if option_name_entry:
+            option_name_entry.bind('<KeyRelease>', lambda e: update_mod_path())
+        target_pattern_entry.bind('<KeyRelease>', lambda e: update_mod_path())
+        
+        # Initialize mod path
+        update_mod_path()
+        
+        # Remove button
+        ttk.Button(pair_frame, text="Remove", 
+                  command=lambda: self.remove_file_pattern_pair(parent, pair_frame, file_patterns_data)).grid(column=3, row=0, rowspan=3, padx=(5, 0))
+        
+        pair_frame.columnconfigure(1, weight=1)
+        
+        return {
+            'frame': pair_frame,
+            'local_file_var': local_file_var,
+            'mod_path_var': mod_path_var,
+            'target_pattern_entry': target_pattern_entry,
+            'update_mod_path': update_mod_path
+        }
+    
+    def add_file_override_option(self, parent, options_data):
+        """Add a new file override option"""
+        option_number = len(options_data) + 1
+        option_data = self.create_file_override_option(parent, option_number, options_data)
+        options_data.append(option_data)
+        
+        # Move the add button to the bottom
+        for child in parent.winfo_children():
+            if isinstance(child, ttk.Frame) and any(isinstance(grandchild, ttk.Button) and grandchild.cget('text') == '+ Add Option' for grandchild in child.winfo_children()):
+                child.pack_forget()
+                child.pack(fill='x', pady=(5, 0))
+                break
+    
+    def remove_file_override_option(self, parent, option_frame, options_data):
+        """Remove a file override option"""
+        # Find and remove from options_data
+        for i, option_data in enumerate(options_data):
+            if option_data['frame'] == option_frame:
+                options_data.pop(i)
+                break
+        
+        # Destroy the frame
+        option_frame.destroy()
+        
+        # Renumber remaining options
+        for i, option_data in enumerate(options_data):
+            option_data['option_number'] = i + 1
+            option_data['frame'].configure(text=f"Option {i + 1}")
+            option_data['option_name_entry'].delete(0, tk.END)
+            option_data['option_name_entry'].insert(0, f"Option {i + 1}")
+    
+    def add_file_pattern_pair(self, parent, file_patterns_data, option_name_entry=None):
+        """Add a new file/pattern pair"""
+        pair_number = len(file_patterns_data) + 1
+        pattern_data = self.create_file_pattern_pair(parent, pair_number, file_patterns_data, option_name_entry)
+        file_patterns_data.append(pattern_data)
+        
+        # Move the add button to the bottom
+        for child in parent.winfo_children():
+            if isinstance(child, ttk.Frame) and any(isinstance(grandchild, ttk.Button) and grandchild.cget('text') == '+ Add File/Pattern Pair' for grandchild in child.winfo_children()):
+                child.pack_forget()
+                child.pack(fill='x', pady=(5, 0))
+                break
+    
+    def remove_file_pattern_pair(self, parent, pair_frame, file_patterns_data):
+        """Remove a file/pattern pair"""
+        # Find and remove from file_patterns_data
+        for i, pattern_data in enumerate(file_patterns_data):
+            if pattern_data['frame'] == pair_frame:
+                file_patterns_data.pop(i)
+                break
+        
+        # Destroy the frame
+        pair_frame.destroy()
+        
+        # Renumber remaining pairs
+        for i, pattern_data in enumerate(file_patterns_data):
+            pair_frame = pattern_data['frame']
+            # Update the label for the first row
+            for child in pair_frame.winfo_children():
+                if isinstance(child, ttk.Label) and child.cget('text').startswith('File'):
+                    child.configure(text=f"File {i + 1}:")
+                    break
+    
+    def browse_local_file(self, file_var):
+        """Browse for a local file to include in the mod"""
+        filename = filedialog.askopenfilename(
+            title="Select file to include in mod",
+            filetypes=[
+                ("All files", "*.*"),
+                ("Animation files", "*.pap"),
+                ("Texture files", "*.tex"),
+                ("Model files", "*.mdl"),
+                ("Material files", "*.mtrl")
+            ]
+        )
+        if filename:
+            file_var.set(filename)
+    
+    def close_tab(self, tab_index):
+        """Close a specific operation tab"""
+        if 0 <= tab_index < len(self.operation_tabs):
+            tab_data = self.operation_tabs[tab_index]
+            self.operations_notebook.forget(tab_data['frame'])
+            self.operation_tabs.pop(tab_index)
+            
+            # Update tab numbers for each operation type
+            redirection_count = 1
+            override_count = 1
+            
+            for i, tab in enumerate(self.operation_tabs):
+                if tab['type'] == 'file_redirection':
+                    new_name = f"Redirection {redirection_count}"
+                    self.operations_notebook.tab(tab['frame'], text=new_name)
+                    tab['name'] = new_name
+                    redirection_count += 1
+                elif tab['type'] == 'file_override':
+                    new_name = f"Override {override_count}"
+                    self.operations_notebook.tab(tab['frame'], text=new_name)
+                    tab['name'] = new_name
+                    override_count += 1
+    
+    def toggle_race_mapping_grid(self, grid_frame, enabled, mapping_vars):
+        """Show or hide a redirection tab's race mapping grid, building it the first time"""
+        if not enabled.get():
+            grid_frame.pack_forget()
+            return
+        if not grid_frame.winfo_children():
+            mapping_vars.update({(target_race, source_race): tk.BooleanVar(value=True)
+                                 for target_race in RACES for source_race in RACES})
+            # Rows are options, columns are 'Applied to' races
+            button_frame = ttk.Frame(grid_frame)
+            button_frame.grid(row=0, column=0, columnspan=len(RACES) + 1, sticky='w', pady=(0, 5))
+            ttk.Button(button_frame, text="Select All",
+                       command=lambda: self.select_all_races_in_tab(mapping_vars)).pack(side='left')
+            ttk.Button(button_frame, text="Same Race Only",
+                       command=lambda: self.map_same_races_only(mapping_vars)).pack(side='left', padx=(5, 0))
+            ttk.Label(grid_frame, text="Option \\ Applied to").grid(row=1, column=0, sticky='w')
+            for j, source_race in enumerate(RACES):
+                ttk.Label(grid_frame, text="\n".join(source_race.rsplit(" ", 1))).grid(row=1, column=j + 1, padx=1)
+            for i, target_race in enumerate(RACES):
+                ttk.Label(grid_frame, text=target_race).grid(row=i + 2, column=0, sticky='w')
+                for j, source_race in enumerate(RACES):
+                    ttk.Checkbutton(grid_frame, variable=mapping_vars[(target_race, source_race)]).grid(row=i + 2, column=j + 1)
+        grid_frame.pack(anchor='w', pady=(5, 0))
+
+    def map_same_races_only(self, mapping_vars):
+        for (target_race, source_race), var in mapping_vars.items():
+            var.set(target_race == source_race)
+
+    def select_all_races_in_tab(self, race_vars):
+        """Select all races in a specific tab"""
+        for var in race_vars.values():
+            var.set(True)
+    
+    def deselect_all_races_in_tab(self, race_vars):
+        """Deselect all races in a specific tab"""
+        for var in race_vars.values():
+            var.set(False)
+    
+
+    def snapshot_project(self):
+        """Read mod metadata and all operations out of Tk"""
+        mod_info = {
+            'name': self.mod_name_entry.get().strip(),
+            'author': self.author_entry.get().strip(),
+            'description': self.desc_entry.get().strip(),
+            'website': self.website_entry.get().strip(),
+            'version': self.version_entry.get().strip() or "1.0.0"
+        }
+        operations = [snapshot_operation(tab_data) for tab_data in self.operation_tabs]
+        return mod_info, operations
+
+    def tab_keys(self):
+        """Stable identities of the operation tabs for the validation cache"""
+        return [str(tab_data['frame']) for tab_data in self.operation_tabs]
+
+    def start_background_validation(self):
+        from concurrent.futures import ThreadPoolExecutor
+        from live_validation import ValidationCache
+
+        self.validation = ValidationCache()
+        self.validation_executor = ThreadPoolExecutor(max_workers=1)
+        self.validation_future = None
+        self.shown_problems = None
+        self.after(VALIDATE_INTERVAL_MS, self.poll_validation)
+
+    def poll_validation(self):
+        """Snapshot the tabs, revalidate changed ones off the Tk thread and refresh the problems panel"""
+        if self.validation_future is not None and self.validation_future.done():
+            self.show_problems(self.validation_future.result())
+            self.validation_future = None
+        if self.validation_future is None:
+            mod_info, operations = self.snapshot_project()
+            self.validation_future = self.validation_executor.submit(
+                self.validation.validate, mod_info, operations, self.tab_keys())
+        self.after(VALIDATE_INTERVAL_MS, self.poll_validation)
+
+    def show_problems(self, errors):
+        if errors == self.shown_problems:
+            return
+        self.shown_problems = errors
+        self.problems_list.delete(0, tk.END)
+        for error in errors:
+            self.problems_list.insert(tk.END, error)
+        if not errors:
+            self.problems_list.insert(tk.END, "No problems found.")
+
+    def selected_tab(self):
+        selected = self.operations_notebook.select()
+        for tab_data in self.operation_tabs:
+            if str(tab_data['frame']) == selected:
+                return tab_data
+        return None
+
+    def start_preview(self):
+        from concurrent.futures import ThreadPoolExecutor
+        from group_preview import GroupPreviewer
+
+        self.previewer = GroupPreviewer()
+        self.preview_executor = ThreadPoolExecutor(max_workers=1)
+        self.preview_future = None
+        self.preview_pending = None  # (operation, when it last changed)
+        self.preview_shown = None
+        self.after(PREVIEW_INTERVAL_MS, self.poll_preview)
+
+    def poll_preview(self):
+        """Recompute the selected tab's preview off the Tk thread once it has stopped changing"""
+        import time
+
+        if self.preview_future is not None and self.preview_future.done():
+            op, text = self.preview_future.result()
+            self.preview_future = None
+            self.preview_shown = op
+            self.show_preview(text)
+
+        tab_data = self.selected_tab()
+        if tab_data is None:
+            if self.preview_shown is not None:
+                self.preview_shown = None
+                self.show_preview("")
+        else:
+            op = snapshot_operation(tab_data)
+            now = time.monotonic()
+            if self.preview_pending is None or self.preview_pending[0] != op:
+                self.preview_pending = (op, now)  # Still typing; wait until the tab settles
+            elif (op != self.preview_shown and self.preview_future is None
+                  and now - self.preview_pending[1] >= PREVIEW_DEBOUNCE_MS / 1000):
+                self.preview_future = self.preview_executor.submit(
+                    lambda: (op, self.previewer.preview(op)))
+        self.after(PREVIEW_INTERVAL_MS, self.poll_preview)
+
+    def show_preview(self, text):
+        self.preview_text.configure(state="normal")
+        self.preview_text.delete("1.0", tk.END)
+        self.preview_text.insert("1.0", text)
+        self.preview_text.configure(state="disabled")
+
+    def generate_full_mod(self):
+        # Gather mod metadata and operations, then validate them (unchanged tabs come from the cache)
+        mod_info, operations = self.snapshot_project()
+        out_dir = self.output_dir.get()
+
+        errors = self.validation.validate(mod_info, operations, self.tab_keys())
+        self.show_problems(errors)
+        if errors:
+            details = "\n".join(errors[:10])
+            more = f"\n... and {len(errors) - 10} more" if len(errors) > 10 else ""
+            messagebox.showerror("Error", f"Please fix {len(errors)} problems (see the Problems panel):\n\n{details}{more}")
+            return
+
+        pmp_path = build_mod(mod_info, operations, out_dir, reproducible=self.reproducible.get(),
+                             on_conflict=self.confirm_conflicts, jobs=BUILD_JOBS)
+        if pmp_path is None:
+            return
+
+        if self.verify_after_build.get():
+            from verify import verify_package
+
+            problems = verify_package(pmp_path)
+            if problems:
+                details = "\n".join(problems[:10])
+                messagebox.showerror("Error", f"The generated package failed verification:\n\n{details}")
+                return
+
+        messagebox.showinfo("Success", f"Generated Penumbra mod package: {pmp_path}")
+
+    def export_unpacked_mod(self):
+        """Sync the mod into an unpacked folder, e.g. inside Penumbra's mod directory, for quick testing"""
+        from unpacked_export import export_unpacked
+
+        mod_info, operations = self.snapshot_project()
+        errors = self.validation.validate(mod_info, operations, self.tab_keys())
+        self.show_problems(errors)
+        if errors:
+            messagebox.showerror("Error", f"Please fix {len(errors)} problems (see the Problems panel).")
+            return
+
+        mod_dir = filedialog.askdirectory(title="Unpacked mod folder")
+        if not mod_dir:
+            return
+        stats = export_unpacked(mod_info, operations, mod_dir, reproducible=self.reproducible.get(),
+                                on_conflict=self.confirm_conflicts)
+        if stats is None:
+            return
+        messagebox.showinfo("Success", f"Exported to {mod_dir}: {stats['written']} files written, "
+                                       f"{stats['unchanged']} unchanged, {stats['deleted']} deleted")
+
+    def confirm_conflicts(self, conflicts):
+        """Ask whether to package a mod whose groups redirect the same game paths"""
+        from conflicts import format_conflicts
+
+        details = "\n".join(format_conflicts(conflicts, limit=10))
+        return messagebox.askyesno(
+            "Conflicting operations",
+            f"{len(conflicts)} game paths are redirected by more than one group, so the result "
+            f"in game depends on group order and priority:\n\n{details}\n\nGenerate the mod anyway?"
+        )
+
+    def toggle_watch(self):
+        """Start or stop rebuilding the mod whenever the tabs or their files change"""
+        from watch import ModWatcher
+
+        if self.watch_enabled.get():
+            self.watcher = ModWatcher(self.snapshot_project, self.output_dir.get(),
+                                      reproducible=self.reproducible.get(), log=self.status_var.set)
+            self.status_var.set("Watching for changes...")
+            self.poll_watcher()
+        elif self.watcher is not None:
+            self.after_cancel(self.watch_after_id)
+            self.watcher.close()
+            self.watcher = None
+            self.status_var.set("")
+
+    def poll_watcher(self):
+        if self.watcher is None:
+            return
+        self.watcher.poll()
+        self.watch_after_id = self.after(WATCH_INTERVAL_MS, self.poll_watcher)
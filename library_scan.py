@@ -0,0 +1,142 @@
+import os
+from conflicts import TargetIndex
+
+# Library-wide conflict analysis: scan a folder of .pmp packages and report game
+# paths that more than one mod redirects.
+#
+# Only the zip central directory and the group_*.json / default_mod.json
+# entries are read; assets are never decompressed. Packages are indexed in
+# parallel worker processes, and each package's index is cached under a digest
+# of its central directory. The central directory holds the CRC-32 and sizes of
+# every entry, so the digest changes whenever any content changes, while
+# computing it only reads the tail of the file. Re-scans therefore only index
+# packages that actually changed.
+
+CACHE_FILE_NAME = ".pmp_index_cache.json"
+CACHE_VERSION = 1
+
+def central_directory_digest(path):
+    """SHA-256 of a zip's central directory and end record, read from the end of the file"""
+    import hashlib
+    import struct
+    import zipfile
+
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        file_size = f.tell()
+        tail_size = min(file_size, 65536 + 22)  # End record plus the longest possible comment
+        f.seek(file_size - tail_size)
+        tail = f.read(tail_size)
+        pos = tail.rfind(b"PK\x05\x06")
+        if pos < 0:
+            raise zipfile.BadZipFile(f"{path} is not a zip file")
+        cd_size, cd_offset = struct.unpack("<II", tail[pos + 12:pos + 20])
+        if 0xFFFFFFFF in (cd_size, cd_offset):
+            # Zip64: the locator just before the end record points at the zip64 end record
+            locator = tail[pos - 20:pos]
+            if locator[:4] != b"PK\x06\x07":
+                raise zipfile.BadZipFile(f"{path} has a corrupt zip64 end record")
+            f.seek(struct.unpack("<Q", locator[8:16])[0])
+            record = f.read(56)
+            cd_size, cd_offset = struct.unpack("<QQ", record[40:56])
+        f.seek(cd_offset)
+        central_directory = f.read(cd_size)
+
+    return hashlib.sha256(central_directory + tail[pos:]).hexdigest()
+
+def index_package(path):
+    """Return {lowercased game path: [group, option, kind]} for the first claim of each path in a package"""
+    import json
+    import zipfile
+    from pmp_archive import is_group_file
+
+    paths = {}
+
+    def add_option(group_name, option):
+        option_name = option.get('Name', "")
+        for kind in ('Files', 'FileSwaps'):
+            for game_path in option.get(kind, {}):
+                paths.setdefault(game_path.lower(), [group_name, option_name, kind])
+
+    with zipfile.ZipFile(path) as zf:
+        entries = zf.namelist()
+        for name in sorted(name for name in entries if is_group_file(name)):
+            group = json.loads(zf.read(name).decode("utf-8-sig"))
+            for option in group.get('Options', []):
+                add_option(group.get('Name', name), option)
+        if "default_mod.json" in entries:
+            add_option("Default", json.loads(zf.read("default_mod.json").decode("utf-8-sig")))
+
+    return paths
+
+def digest_and_index(path, cached_digest=None):
+    """Worker entry point: (digest, paths or None when the cached digest still matches)"""
+    digest = central_directory_digest(path)
+    if digest == cached_digest:
+        return digest, None
+    return digest, index_package(path)
+
+def load_cache(cache_path):
+    import json
+
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if cache.get('version') != CACHE_VERSION:
+        return {}
+    return cache.get('packages', {})
+
+def save_cache(cache_path, packages):
+    import json
+
+    tmp_path = cache_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({'version': CACHE_VERSION, 'packages': packages}, f)
+    os.replace(tmp_path, cache_path)
+
+def scan_library(folder, cache_path=None, jobs=None, log=None):
+    """Index every .pmp in folder and return (TargetIndex, stats)
+
+    The index owners are package file names and details are
+    ("group / option", kind). cache_path=None disables caching. jobs is the
+    number of worker processes; None or 0 means one per CPU.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    names = sorted(name for name in os.listdir(folder) if name.lower().endswith(".pmp"))
+    cache = load_cache(cache_path) if cache_path else {}
+    packages = {}
+    stats = {'packages': len(names), 'indexed': 0, 'cached': 0, 'failed': 0}
+
+    with ProcessPoolExecutor(max_workers=jobs if jobs and jobs > 0 else None) as pool:
+        futures = []
+        for name in names:
+            cached = cache.get(name, {})
+            futures.append((name, pool.submit(digest_and_index, os.path.join(folder, name), cached.get('digest'))))
+
+        for name, future in futures:
+            try:
+                digest, paths = future.result()
+            except Exception as e:
+                stats['failed'] += 1
+                if log:
+                    log(f"Warning: skipping {name}: {e}")
+                continue
+            if paths is None:
+                paths = cache[name]['paths']
+                stats['cached'] += 1
+            else:
+                stats['indexed'] += 1
+            packages[name] = {'digest': digest, 'paths': paths}
+
+    # Packages no longer in the folder drop out of the cache here
+    if cache_path and (stats['indexed'] or set(cache) != set(packages)):
+        save_cache(cache_path, packages)
+
+    index = TargetIndex()
+    for name in names:
+        for game_path, (group_name, option_name, kind) in packages.get(name, {}).get('paths', {}).items():
+            index.add(game_path, name, (f"{group_name} / {option_name}", kind))
+    return index, stats
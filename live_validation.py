@@ -0,0 +1,57 @@
+import os
+from mod_builder import validate_mod_info, validate_operation, operation_assets
+
+# Incremental validation for the GUI's problems panel.
+#
+# Each tab's result is cached under a key made of the operation fields
+# validate_operation reads, its position (error messages name the tab number)
+# and whether each referenced file exists, so revalidating a project only
+# re-runs validate_operation for tabs whose inputs actually changed. A
+# redirection's pattern list only counts as empty or not: validation never
+# looks at the patterns themselves, and serialising tens of thousands of them
+# twice a second would cost more than validating. The cache is shared between the
+# background poll and Generate, hence the lock.
+
+class ValidationCache:
+    """validate_project with per-tab results cached until that tab's inputs change"""
+
+    def __init__(self):
+        import threading
+
+        self.entries = {}  # tab key -> (input key, errors)
+        self.lock = threading.Lock()
+        self.last_revalidated = 0
+
+    def input_key(self, op, tab_number):
+        import json
+
+        existing = [os.path.exists(local_file) for local_file, _ in operation_assets(op)]
+        if op['type'] == 'file_redirection':
+            op = dict(op, patterns=bool(op['patterns']))
+        return json.dumps([tab_number, op, existing], sort_keys=True)
+
+    def validate(self, mod_info, operations, tab_keys):
+        """Return every error message, like validate_project
+
+        tab_keys holds a stable identity for each operation's tab, in the same
+        order; entries for tabs that are gone are dropped.
+        """
+        with self.lock:
+            errors = validate_mod_info(mod_info)
+            if not operations:
+                errors.append("Please add at least one operation.")
+
+            entries = {}
+            revalidated = 0
+            for i, (tab_key, op) in enumerate(zip(tab_keys, operations)):
+                key = self.input_key(op, i + 1)
+                cached = self.entries.get(tab_key)
+                if cached is None or cached[0] != key:
+                    cached = (key, validate_operation(op, i + 1))
+                    revalidated += 1
+                entries[tab_key] = cached
+                errors.extend(cached[1])
+
+            self.entries = entries
+            self.last_revalidated = revalidated
+            return errors
@@ -0,0 +1,455 @@
+import os
+import time
+from race_data import RACES
+from penumbra_json import generate_meta_json, generate_default_mod_json, generate_file_override_json
+from group_split import SPLIT_MODES, generate_split_groups
+
+# Build pipeline shared by the GUI and the command line. Nothing in here may
+# import tkinter: operations arrive as plain dicts (see gui.snapshot_operation
+# and project_spec.load_project_spec), so generation can run headless.
+
+
+def clean_mod_name_for_filename(name):
+    import re
+
+    # Remove unsafe filesystem characters and trim spaces
+    return re.sub(r'[^A-Za-z0-9_\- ]+', '', name).strip().replace(' ', '_')
+
+def generate_mod_path(option_name, target_pattern):
+    """Generate a unique mod path based on option name and target pattern"""
+    import re
+
+    # Clean the option name for use in file paths
+    clean_option = re.sub(r'[^A-Za-z0-9_\- ]+', '', option_name).strip().replace(' ', '_').lower()
+
+    # Replace {race_id} with "race" in the target pattern and use the full path
+    pattern_with_race = target_pattern.replace("{race_id}", "race")
+
+    # Create the mod path: option_name/full_pattern_path
+    mod_path = f"{clean_option}/{pattern_with_race}"
+
+    return mod_path
+
+def expand_races(selected_races, include_male, include_female):
+    """Turn selected race names and genders into {race_name: race_id}"""
+    races = {}
+    for race in selected_races:
+        if include_male and f"{race} M" in RACES:
+            races[f"{race} M"] = RACES[f"{race} M"]
+        if include_female and f"{race} F" in RACES:
+            races[f"{race} F"] = RACES[f"{race} F"]
+    return races
+
+def write_json(path, obj, indent, reproducible=False):
+    """Write obj (a dict or a mod_model.Group) as UTF-8 JSON; reproducible output also sorts keys and pins line endings"""
+    import json
+    from mod_model import Group, dump_group
+
+    with open(path, "w", encoding="utf-8", newline="\n" if reproducible else None) as f:
+        if isinstance(obj, Group):
+            dump_group(obj, f, indent=indent, sort_keys=reproducible)
+        else:
+            json.dump(obj, f, indent=indent, sort_keys=reproducible)
+
+def group_stats(group, path, seconds):
+    """Counts, size and generation time of a written group, recorded in its generated file info"""
+    return {
+        'group_id': None,  # Filled in by add_group_ids_to_files
+        'name': group.name,
+        'options': len(group.options),
+        'files': sum(len(option.files) for option in group.options),
+        'swaps': sum(len(option.file_swaps) for option in group.options),
+        'bytes': os.path.getsize(path),
+        'seconds': seconds
+    }
+
+def validate_mod_info(mod_info):
+    """Return a list of error messages for the mod metadata"""
+    required = [mod_info.get('name'), mod_info.get('author'), mod_info.get('description'), mod_info.get('version')]
+    if not all(required):
+        return ["Please fill out all mod information fields."]
+    return []
+
+def validate_operation(op, tab_number):
+    """Validate a single operation, returning a list of error messages"""
+    errors = []
+    if op['type'] == 'file_redirection':
+        if not all([op['patterns'], str(op['variant_count']).strip(), op['group_name']]):
+            errors.append(f"Please fill out all fields in operation {tab_number}.")
+
+        if not op['source_include_male'] and not op['source_include_female']:
+            errors.append(f"At least one 'Applied to' gender must be selected in operation {tab_number}.")
+
+        if not op['target_include_male'] and not op['target_include_female']:
+            errors.append(f"At least one 'Options' gender must be selected in operation {tab_number}.")
+
+        if not op['source_races']:
+            errors.append(f"At least one 'Applied to' race must be selected in operation {tab_number}.")
+
+        if not op['target_races']:
+            errors.append(f"At least one 'Options' race must be selected in operation {tab_number}.")
+
+        try:
+            variant_count = int(op['variant_count'])
+            if variant_count < 1:
+                raise ValueError
+        except ValueError:
+            errors.append(f"Number of Variants must be a positive integer in operation {tab_number}.")
+
+        if op.get('split_mode', "none") not in SPLIT_MODES:
+            errors.append(f"Unknown split mode {op['split_mode']!r} in operation {tab_number}.")
+
+        for field, label in (('split_threshold', "Split threshold"), ('split_size', "Split size")):
+            try:
+                if int(op.get(field) or 0) < 0:  # 0 uses the default, see group_split.split_setting
+                    raise ValueError
+            except ValueError:
+                errors.append(f"{label} must be a positive integer, or 0 for the default, in operation {tab_number}.")
+
+        if errors:
+            return errors
+
+        source_races = expand_races(op['source_races'], op['source_include_male'], op['source_include_female'])
+        if not source_races:
+            errors.append(f"No valid 'Applied to' race/gender combinations found in operation {tab_number}.")
+
+        target_races = expand_races(op['target_races'], op['target_include_male'], op['target_include_female'])
+        if not target_races:
+            errors.append(f"No valid 'Options' race/gender combinations found in operation {tab_number}.")
+
+        for target_race, mapped in (op.get('race_mapping') or {}).items():
+            unknown = [race for race in mapped if race not in source_races]
+            if target_race not in target_races:
+                errors.append(f"Race mapping option '{target_race}' is not a selected 'Options' race in operation {tab_number}.")
+            elif unknown:
+                errors.append(f"Race mapping for '{target_race}' uses unselected 'Applied to' races in operation {tab_number}: {', '.join(unknown)}.")
+            elif not mapped:
+                errors.append(f"Race mapping gives '{target_race}' no 'Applied to' races in operation {tab_number}.")
+
+    elif op['type'] == 'file_override':
+        if not op['group_name']:
+            errors.append(f"Please provide a group name for operation {tab_number}.")
+
+        if not op['options']:
+            errors.append(f"Please add at least one option in operation {tab_number}.")
+
+        # Validate each option
+        for j, option in enumerate(op['options']):
+            if not option['option_name']:
+                errors.append(f"Please provide a name for option {j+1} in operation {tab_number}.")
+
+            if not option['files']:
+                errors.append(f"Please add at least one file/pattern pair for option {j+1} in operation {tab_number}.")
+
+            # Validate each file/pattern pair
+            for k, pair in enumerate(option['files']):
+                if not all([pair['local_file'], pair['target_pattern']]):
+                    errors.append(f"Please fill out all fields for file/pattern pair {k+1} in option {j+1} of operation {tab_number}.")
+                elif not os.path.exists(pair['local_file']):
+                    errors.append(f"Local file does not exist: {pair['local_file']}")
+
+        if not op['applied_include_male'] and not op['applied_include_female']:
+            errors.append(f"At least one 'Applied to' gender must be selected in operation {tab_number}.")
+
+        if not op['applied_races']:
+            errors.append(f"At least one 'Applied to' race must be selected in operation {tab_number}.")
+
+    return errors
+
+def validate_project(mod_info, operations):
+    """Validate mod metadata and every operation, returning all error messages"""
+    errors = validate_mod_info(mod_info)
+    if not operations:
+        errors.append("Please add at least one operation.")
+    for i, op in enumerate(operations):
+        errors.extend(validate_operation(op, i + 1))
+    return errors
+
+def process_file_redirection_operation(op, temp_dir, reproducible=False, index=None, variants=None):
+    """Process a file redirection operation and write JSON files
+
+    variants limits the work to some variant numbers (1-based); by default all are written.
+    """
+    variant_count = int(op['variant_count'])
+    if variants is None:
+        variants = range(1, variant_count + 1)
+    group_name = op['group_name']
+    source_races = expand_races(op['source_races'], op['source_include_male'], op['source_include_female'])
+    target_races = expand_races(op['target_races'], op['target_include_male'], op['target_include_female'])
+
+    # Write variant JSONs for this operation and track generated files
+    generated_files = []
+    for i in variants:
+        variant = f"{i:02}"
+        # Oversized groups may come back split into several parts, see group_split.py
+        started = time.perf_counter()
+        parts = generate_split_groups(op, variant, source_races, target_races)
+        generation_share = (time.perf_counter() - started) / len(parts)
+        for json_obj, file_name in parts:
+            started = time.perf_counter()
+            if index is not None:
+                # Parts of a split group share paths on purpose; they are one owner
+                index.add_group(json_obj, f"{group_name}{variant}")
+            out_path = os.path.join(temp_dir, f"group_{file_name}.json")
+            write_json(out_path, json_obj, 2, reproducible)
+            seconds = generation_share + time.perf_counter() - started
+
+            generated_files.append({
+                'file_path': out_path,
+                'group_name': group_name,
+                'variant': variant,
+                **group_stats(json_obj, out_path, seconds)
+            })
+
+    return generated_files
+
+def process_file_override_operation(op, temp_dir, reproducible=False, index=None, copy_assets=True):
+    """Process a file override operation and write JSON files
+
+    With copy_assets=False the assets are not copied into temp_dir (the caller
+    places them, see unpacked_export.py); every existing file is still mapped.
+    """
+    import shutil
+
+    group_name = op['group_name']
+    applied_races = expand_races(op['applied_races'], op['applied_include_male'], op['applied_include_female'])
+
+    # Collect all options for this single group
+    all_options_data = []
+
+    for option in op['options']:
+        option_name = option['option_name']
+
+        # Copy all files for this option and collect file mappings
+        files_mapping = []
+        for pair in option['files']:
+            local_file = pair['local_file']
+            target_pattern = pair['target_pattern']
+            if not local_file or not target_pattern:
+                continue
+
+            mod_path = generate_mod_path(option_name or "option", target_pattern)
+
+            # Copy the local file to the mod directory
+            mod_file_path = os.path.join(temp_dir, mod_path)
+            try:
+                if not copy_assets:
+                    if not os.path.isfile(local_file):
+                        continue
+                else:
+                    os.makedirs(os.path.dirname(mod_file_path), exist_ok=True)
+                    # Reproducible builds must not carry the source file's mtime
+                    if reproducible:
+                        shutil.copyfile(local_file, mod_file_path)
+                    else:
+                        shutil.copy2(local_file, mod_file_path)
+            except Exception:
+                continue
+
+            files_mapping.append({
+                'mod_path': mod_path,
+                'target_pattern': target_pattern
+            })
+
+        # Add this option to the collection
+        all_options_data.append({
+            'option_name': option_name,
+            'files_mapping': files_mapping
+        })
+
+    # Generate a single JSON file for all options in this group
+    started = time.perf_counter()
+    json_obj, file_name = generate_file_override_json(
+        all_options_data,
+        group_name,
+        applied_races
+    )
+    if index is not None:
+        index.add_group(json_obj)
+
+    out_path = os.path.join(temp_dir, f"group_{group_name}.json")
+    write_json(out_path, json_obj, 2, reproducible)
+    seconds = time.perf_counter() - started
+
+    # Return single file info
+    generated_files = [{
+        'file_path': out_path,
+        'group_name': group_name,
+        'variant': None,  # No variants for file override operations
+        **group_stats(json_obj, out_path, seconds)
+    }]
+
+    return generated_files
+
+def process_operation(op, temp_dir, reproducible=False, index=None, copy_assets=True):
+    """Write one operation's group JSON files and assets, returning the generated file infos
+
+    When a conflicts.TargetIndex is given every generated group is added to it.
+    """
+    if op['type'] == 'file_redirection':
+        return process_file_redirection_operation(op, temp_dir, reproducible, index)
+    if op['type'] == 'file_override':
+        return process_file_override_operation(op, temp_dir, reproducible, index, copy_assets)
+    return []
+
+def operation_assets(op):
+    """Return (local_file, mod_path) for every asset an operation copies into the mod"""
+    assets = []
+    if op['type'] == 'file_override':
+        for option in op['options']:
+            for pair in option['files']:
+                if pair['local_file'] and pair['target_pattern']:
+                    assets.append((pair['local_file'], generate_mod_path(option['option_name'] or "option", pair['target_pattern'])))
+    return assets
+
+def generate_operation_groups(op):
+    """Yield (mod_model.Group, owner) for every group an operation would write, without touching the disk
+
+    owner is the group name conflicts are reported under; parts of a split group share it.
+    """
+    if op['type'] == 'file_redirection':
+        source_races = expand_races(op['source_races'], op['source_include_male'], op['source_include_female'])
+        target_races = expand_races(op['target_races'], op['target_include_male'], op['target_include_female'])
+        for i in range(1, int(op['variant_count']) + 1):
+            for group, _ in generate_split_groups(op, f"{i:02}", source_races, target_races):
+                yield group, f"{op['group_name']}{i:02}"
+    elif op['type'] == 'file_override':
+        applied_races = expand_races(op['applied_races'], op['applied_include_male'], op['applied_include_female'])
+        all_options_data = []
+        for option in op['options']:
+            files_mapping = [{'mod_path': generate_mod_path(option['option_name'] or "option", pair['target_pattern']),
+                              'target_pattern': pair['target_pattern']}
+                             for pair in option['files'] if pair['local_file'] and pair['target_pattern']]
+            all_options_data.append({'option_name': option['option_name'], 'files_mapping': files_mapping})
+        group, _ = generate_file_override_json(all_options_data, op['group_name'], applied_races)
+        yield group, group.name
+
+def dry_run(mod_info, operations):
+    """Validate and generate a project in memory, returning a summary of what a build would write
+
+    The summary has 'errors' (validation messages; nothing else is filled in
+    when there are any), 'groups', 'options', 'files', 'swaps',
+    'missing_assets' and 'conflicts' as {path: [(group, (option, kind)), ...]}.
+    """
+    from conflicts import TargetIndex
+
+    summary = {'errors': validate_project(mod_info, operations), 'groups': 0, 'options': 0,
+               'files': 0, 'swaps': 0, 'missing_assets': [], 'conflicts': {}}
+    if summary['errors']:
+        return summary
+
+    index = TargetIndex()
+    for op in operations:
+        for group, owner in generate_operation_groups(op):
+            index.add_group(group, owner)
+            summary['groups'] += 1
+            summary['options'] += len(group.options)
+            summary['files'] += sum(len(option.files) for option in group.options)
+            summary['swaps'] += sum(len(option.file_swaps) for option in group.options)
+        summary['missing_assets'].extend(local_file for local_file, _ in operation_assets(op)
+                                         if not os.path.isfile(local_file))
+    summary['conflicts'] = index.conflicts
+    return summary
+
+def assign_group_ids(group_names):
+    """Map each distinct group name to its zero-padded group ID, in order of first appearance"""
+    group_ids = {}
+    for group_name in group_names:
+        if group_name not in group_ids:
+            group_ids[group_name] = f"{len(group_ids) + 1:03d}"  # Zero-padded 3 digits
+    return group_ids
+
+def group_file_name(file_name, group_id_str):
+    """Insert the group ID into a generated file name, in lowercase"""
+    # Example: group_operation01.json -> group_001_operation01.json
+    return file_name.replace("group_", f"group_{group_id_str}_", 1).lower()
+
+def add_group_ids_to_files(temp_dir, generated_files):
+    """Add group IDs to generated JSON files, recording the new path and ID in each file info"""
+    group_ids = assign_group_ids(file_info['group_name'] for file_info in generated_files)
+
+    # Rename files with their group's ID
+    for file_info in generated_files:
+        old_path = file_info['file_path']
+        old_filename = os.path.basename(old_path)
+
+        if old_filename.startswith("group_"):
+            new_filename = group_file_name(old_filename, group_ids[file_info['group_name']])
+            new_path = os.path.join(temp_dir, new_filename)
+
+            # Rename the file
+            os.rename(old_path, new_path)
+            file_info['file_path'] = new_path
+            file_info['group_id'] = group_ids[file_info['group_name']]
+
+def stage_mod(mod_info, operations, temp_dir, reproducible=False, index=None, jobs=1, copy_assets=True):
+    """Write meta.json, default_mod.json and every operation into temp_dir, returning the generated file infos
+
+    Group files still lack their IDs; see add_group_ids_to_files.
+    """
+    # Write meta.json
+    meta = generate_meta_json(mod_info['name'], mod_info['author'], mod_info['description'],
+                              mod_info['version'], mod_info.get('website', ""))
+    write_json(os.path.join(temp_dir, "meta.json"), meta, 4, reproducible)
+
+    # Write default_mod.json
+    default_mod = generate_default_mod_json()
+    write_json(os.path.join(temp_dir, "default_mod.json"), default_mod, 4, reproducible)
+
+    # Process each operation and track generated files for renaming
+    if jobs == 1 or not copy_assets:
+        generated_files = []
+        for op in operations:
+            generated_files.extend(process_operation(op, temp_dir, reproducible, index, copy_assets))
+        return generated_files
+
+    from scheduler import process_operations_parallel
+    return process_operations_parallel(operations, temp_dir, reproducible, index, jobs)
+
+def build_mod(mod_info, operations, out_dir, reproducible=False, on_conflict=None, jobs=1, manifest=True, stream=None):
+    """Generate the full mod into out_dir and return the .pmp path
+
+    With reproducible=True identical inputs produce a byte-identical package.
+    When on_conflict is given, game paths redirected by more than one group are
+    collected while generating and, if there are any, passed to it as
+    {path: [(group, (option, kind)), ...]} before packaging; if it returns
+    False nothing is written and None is returned.
+
+    jobs > 1 (or 0 for one per CPU) generates groups on a process pool, see
+    scheduler.py; the package is identical to a serial build.
+
+    With manifest=True a build_manifest.py manifest is written next to the package.
+
+    When stream (a writable binary file object, which need not be seekable) is
+    given the package is written there instead of into out_dir, no manifest is
+    written and the stream is returned.
+    """
+    import tempfile
+    from pmp_archive import write_pmp
+    from conflicts import TargetIndex
+
+    index = TargetIndex() if on_conflict is not None else None
+
+    # Use a temporary directory for packaging
+    with tempfile.TemporaryDirectory() as temp_dir:
+        generated_files = stage_mod(mod_info, operations, temp_dir, reproducible, index, jobs)
+
+        if index is not None and index.conflicts and not on_conflict(index.conflicts):
+            return None
+
+        # Rename files with group IDs
+        add_group_ids_to_files(temp_dir, generated_files)
+
+        if stream is not None:
+            from pmp_archive import write_pmp_stream
+            write_pmp_stream(temp_dir, stream, reproducible)
+            return stream
+
+        mod_safe_name = clean_mod_name_for_filename(mod_info['name'])
+        pmp_path = write_pmp(temp_dir, out_dir, mod_safe_name, reproducible)
+
+        if manifest:
+            from build_manifest import build_manifest, manifest_path, write_manifest
+            write_manifest(build_manifest(pmp_path, temp_dir, generated_files, mod_info), manifest_path(pmp_path))
+
+    return pmp_path
@@ -0,0 +1,240 @@
+# Compact in-memory model for generated groups.
+#
+# Option path maps are stored as two parallel tuples instead of a dict. All
+# options of a redirection group share the same key tuple, and every path
+# string is built once per (pattern, race) and interned, so a group costs one
+# pointer per mapping per option rather than a dict entry plus two fresh
+# strings. dump_group writes the exact text json.dump would produce for the
+# equivalent dicts, without materialising them. json is imported lazily so the
+# generators stay cheap to import (see check_import_time.py).
+
+class PathMap:
+    """Read-only ordered mapping of game path -> value backed by parallel tuples"""
+    __slots__ = ('keys', 'values')
+
+    def __init__(self, keys=(), values=()):
+        self.keys = keys
+        self.values = values
+
+    @classmethod
+    def from_dict(cls, mapping):
+        return cls(tuple(mapping), tuple(mapping.values()))
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __iter__(self):
+        return iter(self.keys)
+
+    def items(self):
+        return zip(self.keys, self.values)
+
+    def to_dict(self):
+        return dict(zip(self.keys, self.values))
+
+EMPTY_MAP = PathMap()
+
+class Option:
+    __slots__ = ('name', 'description', 'priority', 'files', 'file_swaps', 'manipulations')
+
+    def __init__(self, name, description="", priority=0, files=EMPTY_MAP, file_swaps=EMPTY_MAP, manipulations=()):
+        self.name = name
+        self.description = description
+        self.priority = priority
+        self.files = files
+        self.file_swaps = file_swaps
+        self.manipulations = manipulations
+
+    def to_dict(self):
+        return {
+            "Name": self.name,
+            "Description": self.description,
+            "Priority": self.priority,
+            "Files": self.files.to_dict(),
+            "FileSwaps": self.file_swaps.to_dict(),
+            "Manipulations": list(self.manipulations)
+        }
+
+class Group:
+    __slots__ = ('version', 'name', 'description', 'image', 'page', 'priority', 'type', 'default_settings', 'options')
+
+    def __init__(self, name, options, description="", image="", page=0, priority=0, type="Single", default_settings=1, version=0):
+        self.version = version
+        self.name = name
+        self.description = description
+        self.image = image
+        self.page = page
+        self.priority = priority
+        self.type = type
+        self.default_settings = default_settings
+        self.options = options
+
+    def to_dict(self):
+        return {
+            "Version": self.version,
+            "Name": self.name,
+            "Description": self.description,
+            "Image": self.image,
+            "Page": self.page,
+            "Priority": self.priority,
+            "Type": self.type,
+            "DefaultSettings": self.default_settings,
+            "Options": [option.to_dict() for option in self.options]
+        }
+
+def default_option():
+    """The "Off" option every generated group starts with"""
+    return Option("Off", "Keep original game files unchanged")
+
+def encode_scalar(value):
+    import json
+    from json.encoder import encode_basestring_ascii
+
+    if isinstance(value, str):
+        return encode_basestring_ascii(value)
+    return json.dumps(value)
+
+# Most of a group's JSON text repeats: every option of a redirection group has
+# the same keys, many source paths swap to the same target path, the "Off"
+# option and the empty Files/Manipulations of race options are identical in
+# every group, and so are the top-level field names and constant values.
+# GroupEncoder keeps all of these pre-encoded and assembles a group by joining
+# them, so json escaping only runs once per distinct string.
+
+PATH_CACHE_LIMIT = 1 << 18  # Encoded path strings kept per encoder before the cache starts over
+KEY_RUN_CACHE_SIZE = 8  # Key tuples whose encoded prefixes are kept (each variant and split part has its own)
+
+class GroupEncoder:
+    """Writes groups as JSON from cached pre-encoded fragments, byte-identical to json.dump of to_dict()"""
+
+    def __init__(self, indent=2, sort_keys=False):
+        from json.encoder import encode_basestring_ascii
+
+        self.indent = indent
+        self.sort_keys = sort_keys
+        self.encode_string = encode_basestring_ascii
+        self.pad1, self.pad2, self.pad3 = " " * indent, " " * (indent * 2), " " * (indent * 3)
+        self.inner = "\n" + " " * (indent * 4)
+        self.map_end = "\n" + self.pad3 + "}"
+        self.paths = {}  # path -> encoded path
+        self.key_runs = {}  # id(keys) -> (keys, encoded "key: " prefixes in output order, output order or None)
+        self.scalars = {}  # (type, value) -> encoded value
+        self.empty_options = {}  # (name, description, priority) -> encoded option without files or swaps
+
+    def scalar(self, value):
+        key = (type(value), value)
+        encoded = self.scalars.get(key)
+        if encoded is None:
+            encoded = self.scalars[key] = encode_scalar(value)
+        return encoded
+
+    def encode_path(self, path):
+        if len(self.paths) >= PATH_CACHE_LIMIT:
+            self.paths = {}  # Rebound rather than cleared, so a concurrent encode_paths never sees it change
+        encoded = self.paths[path] = self.encode_string(path)
+        return encoded
+
+    def encode_paths(self, paths):
+        get, miss = self.paths.get, self.encode_path
+        # An encoded string is never empty, so a cache miss is the only falsy result
+        return [get(path) or miss(path) for path in paths]
+
+    def key_run(self, keys):
+        """The encoded '<key>: ' prefixes of a key tuple, shared by every option that uses it"""
+        run = self.key_runs.get(id(keys))
+        if run is not None and run[0] is keys:
+            return run[1], run[2]
+        order = sorted(range(len(keys)), key=keys.__getitem__) if self.sort_keys else None
+        encoded = self.encode_paths(keys)
+        if order is not None:
+            encoded = [encoded[i] for i in order]
+        inner = self.inner
+        prefixes = [f",{inner}{key}: " for key in encoded]
+        prefixes[0] = prefixes[0][1:]
+        if len(self.key_runs) >= KEY_RUN_CACHE_SIZE:
+            self.key_runs = {}
+        self.key_runs[id(keys)] = (keys, prefixes, order)  # Holding keys keeps its id from being reused
+        return prefixes, order
+
+    def path_map(self, path_map):
+        if not len(path_map):
+            return "{}"
+        prefixes, order = self.key_run(path_map.keys)
+        values = self.encode_paths(path_map.values)
+        if order is not None:
+            values = [values[i] for i in order]
+        return "{" + "".join(map(str.__add__, prefixes, values)) + self.map_end
+
+    def option(self, option):
+        cacheable = not len(option.files) and not len(option.file_swaps) and not option.manipulations
+        if cacheable:
+            key = (option.name, option.description, option.priority)
+            encoded = self.empty_options.get(key)
+            if encoded is not None:
+                return encoded
+
+        import json
+
+        fields = [
+            ("Name", self.scalar(option.name)),
+            ("Description", self.scalar(option.description)),
+            ("Priority", self.scalar(option.priority)),
+            ("Files", self.path_map(option.files)),
+            ("FileSwaps", self.path_map(option.file_swaps)),
+            ("Manipulations", "[]" if not option.manipulations else
+             json.dumps(list(option.manipulations), indent=self.indent, sort_keys=self.sort_keys).replace("\n", "\n" + self.pad3)),
+        ]
+        if self.sort_keys:
+            fields.sort()
+        body = ",\n".join(f"{self.pad3}\"{key}\": {encoded}" for key, encoded in fields)
+        encoded = self.pad2 + "{\n" + body + "\n" + self.pad2 + "}"
+        if cacheable:
+            self.empty_options[key] = encoded
+        return encoded
+
+    def iter_chunks(self, group):
+        """Yield the JSON text of a group in chunks, one option at a time"""
+        fields = [
+            ("Version", self.scalar(group.version)),
+            ("Name", self.scalar(group.name)),
+            ("Description", self.scalar(group.description)),
+            ("Image", self.scalar(group.image)),
+            ("Page", self.scalar(group.page)),
+            ("Priority", self.scalar(group.priority)),
+            ("Type", self.scalar(group.type)),
+            ("DefaultSettings", self.scalar(group.default_settings)),
+            ("Options", None),
+        ]
+        if self.sort_keys:
+            fields.sort()
+
+        yield "{"
+        for i, (key, encoded) in enumerate(fields):
+            yield ("\n" if i == 0 else ",\n") + f"{self.pad1}\"{key}\": "
+            if encoded is not None:
+                yield encoded
+                continue
+            if not group.options:
+                yield "[]"
+                continue
+            yield "["
+            for j, option in enumerate(group.options):
+                yield ("\n" if j == 0 else ",\n") + self.option(option)
+            yield "\n" + self.pad1 + "]"
+        yield "\n}"
+
+ENCODERS = {}  # (indent, sort_keys) -> GroupEncoder, one set per process
+
+def group_encoder(indent=2, sort_keys=False):
+    encoder = ENCODERS.get((indent, sort_keys))
+    if encoder is None:
+        encoder = ENCODERS[(indent, sort_keys)] = GroupEncoder(indent, sort_keys)
+    return encoder
+
+def iter_group_chunks(group, indent=2, sort_keys=False):
+    """Yield the JSON text of a group in chunks, one option at a time"""
+    return group_encoder(indent, sort_keys).iter_chunks(group)
+
+def dump_group(group, f, indent=2, sort_keys=False):
+    """Write a group as JSON, byte-identical to json.dump(group.to_dict(), f, indent=indent, sort_keys=sort_keys)"""
+    f.writelines(iter_group_chunks(group, indent, sort_keys))
@@ -0,0 +1,185 @@
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+from pattern_list import PatternList
+
+# Pattern list editor for redirection tabs.
+#
+# A Text widget whose Tcl command is wrapped (the same trick as idlelib's
+# WidgetRedirector), so every insert, delete and replace reports which lines it
+# touched and only those lines are re-read into the PatternList. Problem lines
+# are highlighted for the visible part of the widget only, after the edit has
+# been handled. Lists loaded from a file that are too long for a comfortable
+# Text widget stay in the model: the widget shows their first lines read-only
+# until "Edit All" puts the whole list in it, and Save writes straight from
+# the model.
+
+# Lists loaded from a file with more lines than this are not put in the Text widget
+TEXT_WIDGET_MAX_LINES = 5000
+
+# Lines shown (read-only) of a list that is kept out of the Text widget
+SHOWN_LINES = 200
+
+class PatternEditor(ttk.Frame):
+    def __init__(self, parent, initial="", height=6, width=70):
+        super().__init__(parent)
+        self.model = PatternList([""])
+        self.loaded_path = None  # Set while a long list loaded from a file is kept out of the widget
+        self.mirroring = True  # Whether widget edits are copied into the model
+        self.flags_pending = False
+
+        self.text = tk.Text(self, height=height, width=width, wrap="none", undo=True)
+        scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.text.yview)
+        self.text.configure(yscrollcommand=lambda first, last: (scrollbar.set(first, last), self.schedule_flags()))
+        self.text.tag_configure("duplicate", background="#fff2b3")
+        self.text.tag_configure("malformed", background="#ffd6d6")
+        self.text.grid(column=0, row=0, sticky='nsew')
+        scrollbar.grid(column=1, row=0, sticky='ns')
+
+        bar = ttk.Frame(self)
+        bar.grid(column=0, row=1, columnspan=2, sticky='ew', pady=(2, 0))
+        ttk.Button(bar, text="Load...", command=self.load_from_file).pack(side='left')
+        ttk.Button(bar, text="Save...", command=self.save_to_file).pack(side='left', padx=(5, 0))
+        self.edit_all_button = ttk.Button(bar, text="Edit All", command=self.edit_all)
+        self.status_var = tk.StringVar()
+        self.status_label = ttk.Label(bar, textvariable=self.status_var, foreground="gray")
+        self.status_label.pack(side='left', padx=(10, 0))
+        self.columnconfigure(0, weight=1)
+
+        self.install_redirect()
+        self.text.bind("<KeyRelease>", lambda e: self.update_status())
+        self.text.bind("<ButtonRelease-1>", lambda e: self.update_status())
+        self.text.insert("1.0", initial)
+        self.text.edit_reset()
+
+    def install_redirect(self):
+        """Route the Text widget's Tcl command through dispatch"""
+        self.widget_command = str(self.text)
+        self.original_command = self.widget_command + "_original"
+        self.tk.call("rename", self.widget_command, self.original_command)
+        self.tk.createcommand(self.widget_command, self.dispatch)
+        self.text.bind("<Destroy>", lambda e: self.tk.deletecommand(self.widget_command), add=True)
+
+    def call(self, *args):
+        return self.tk.call((self.original_command,) + args)
+
+    def line_count(self):
+        return int(str(self.call("index", "end-1c")).split(".")[0])
+
+    def line_of(self, index):
+        return int(str(self.call("index", index)).split(".")[0])
+
+    def dispatch(self, command, *args):
+        if not self.mirroring or self.loaded_path is not None or command not in ("insert", "delete", "replace"):
+            result = self.call(command, *args)
+            if self.mirroring and command == "edit" and args and args[0] in ("undo", "redo"):
+                self.resync()  # Undo and redo change the text without going through this command
+            return result
+
+        # Lines the edit touches, before and after it
+        before = self.line_count()
+        if command == "insert":
+            first = last = min(self.line_of(args[0]), before)
+        else:
+            index_args = args if command == "delete" else args[:2]
+            if len(index_args) == 1:
+                index_args = (args[0], f"{args[0]}+1c")  # Deleting one character can join two lines
+            lines = [min(self.line_of(index), before) for index in index_args]
+            first, last = min(lines), max(lines)
+        result = self.call(command, *args)
+        last_after = last + self.line_count() - before
+        new_lines = str(self.call("get", f"{first}.0", f"{last_after}.end")).split("\n")
+        self.model.replace_lines(first - 1, last, new_lines)
+        self.schedule_flags()
+        return result
+
+    def resync(self):
+        self.model.set_lines(str(self.call("get", "1.0", "end-1c")).split("\n"))
+        self.schedule_flags()
+
+    def schedule_flags(self):
+        if not self.flags_pending:
+            self.flags_pending = True
+            self.after_idle(self.update_flags)
+
+    def update_flags(self):
+        """Highlight problem lines in the visible part of the widget"""
+        self.flags_pending = False
+        first = self.line_of("@0,0")
+        last = self.line_of(f"@0,{self.text.winfo_height()}")
+        for tag in ("duplicate", "malformed"):
+            self.call("tag", "remove", tag, f"{first}.0", f"{last}.end")
+        for line in range(first, min(last, len(self.model)) + 1):
+            problem = self.model.line_problem(line - 1)
+            if problem is not None:
+                tag = "duplicate" if problem == "duplicate" else "malformed"
+                self.call("tag", "add", tag, f"{line}.0", f"{line}.end")
+        self.update_status()
+
+    def update_status(self):
+        model = self.model
+        parts = [f"{model.pattern_lines} patterns"]
+        if model.duplicate_lines:
+            parts.append(f"{model.duplicate_lines} duplicates")
+        if model.malformed_lines:
+            parts.append(f"{model.malformed_lines} malformed")
+        if self.loaded_path is not None:
+            parts.append(f"first {SHOWN_LINES} lines of {self.loaded_path} shown")
+        else:
+            line = self.line_of("insert")
+            problem = model.line_problem(line - 1) if line <= len(model) else None
+            if problem is not None:
+                parts.append(f"line {line}: {problem}")
+        self.status_var.set(", ".join(parts))
+
+    def show_text(self, lines, editable):
+        """Put the model's lines in the widget without copying them back into it"""
+        self.mirroring = False
+        try:
+            self.text.configure(state="normal")
+            self.text.delete("1.0", "end")
+            self.text.insert("1.0", "\n".join(lines))
+            self.text.edit_reset()
+            if not editable:
+                self.text.configure(state="disabled")
+        finally:
+            self.mirroring = True
+        self.schedule_flags()
+
+    def load_from_file(self):
+        path = filedialog.askopenfilename(filetypes=[("Text files", "*.txt"), ("All files", "*.*")])
+        if not path:
+            return
+        try:
+            self.model.load(path)
+        except (OSError, UnicodeDecodeError) as e:
+            messagebox.showerror("Error", f"Could not load patterns: {e}")
+            return
+        if not len(self.model):
+            self.model.set_lines([""])
+        if len(self.model) > TEXT_WIDGET_MAX_LINES:
+            self.loaded_path = path
+            self.show_text(self.model.lines(0, SHOWN_LINES), editable=False)
+            self.edit_all_button.pack(side='left', padx=(5, 0), before=self.status_label)
+        else:
+            self.loaded_path = None
+            self.edit_all_button.pack_forget()
+            self.show_text(self.model.lines(), editable=True)
+
+    def save_to_file(self):
+        path = filedialog.asksaveasfilename(defaultextension=".txt",
+                                            filetypes=[("Text files", "*.txt"), ("All files", "*.*")])
+        if not path:
+            return
+        try:
+            self.model.save(path)
+        except OSError as e:
+            messagebox.showerror("Error", f"Could not save patterns: {e}")
+
+    def edit_all(self):
+        """Put a long list loaded from a file into the widget for editing"""
+        self.loaded_path = None
+        self.edit_all_button.pack_forget()
+        self.show_text(self.model.lines(), editable=True)
+
+    def patterns(self):
+        return self.model.patterns()
@@ -0,0 +1,141 @@
+# Indexed line model behind the redirection tab's pattern editor.
+#
+# The model keeps one parsed entry per line of the pattern list: the stripped
+# pattern (None for blank lines) and what is wrong with it, if anything. Edits
+# replace a range of lines and only the new lines are parsed; a count per
+# pattern, plus running totals of duplicate and malformed lines, are updated
+# for the lines that went out and came in, so the cost of an edit does not
+# depend on the size of the list. The plain pattern list handed to
+# mod_builder is rebuilt only when it is asked for after a change.
+#
+# Duplicates and malformed patterns are reported, not rejected: the generator
+# already lets a repeated source path take the last pattern's target, and a
+# pattern without {race_id} is legal, it just swaps a file onto itself.
+
+PLACEHOLDERS = ("{race_id}", "{variant}")
+PLACEHOLDER_PATTERN = r"\{[^{}]*\}"
+_PLACEHOLDER_RE = None  # Compiled on first use; re is slow to import
+
+def pattern_problem(pattern):
+    """Return why a stripped, non-empty pattern is malformed, or None"""
+    global _PLACEHOLDER_RE
+    if "\\" in pattern:
+        return "uses backslashes; game paths use /"
+    if pattern.startswith("/"):
+        return "starts with /"
+    if any(c.isspace() for c in pattern):
+        return "contains whitespace"
+    if _PLACEHOLDER_RE is None:
+        import re
+        _PLACEHOLDER_RE = re.compile(PLACEHOLDER_PATTERN)
+    unknown = [p for p in _PLACEHOLDER_RE.findall(pattern) if p not in PLACEHOLDERS]
+    if unknown:
+        return f"unknown placeholder {unknown[0]}"
+    if "{race_id}" not in pattern:
+        return "has no {race_id}"
+    return None
+
+def parse_line(line):
+    """(pattern or None for a blank line, problem or None)"""
+    pattern = line.strip()
+    if not pattern:
+        return None, None
+    return pattern, pattern_problem(pattern)
+
+class PatternList:
+    """Lines of a pattern list with per-line parse results and duplicate counts"""
+
+    def __init__(self, lines=()):
+        self.entries = []  # (pattern, problem) per line
+        self.counts = {}  # pattern -> lines holding it
+        self.pattern_lines = 0  # non-blank lines
+        self.duplicate_lines = 0  # lines repeating a pattern seen on another line
+        self.malformed_lines = 0
+        self.version = 0
+        self.cached_patterns = None
+        self.set_lines(lines)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def count(self, entries, sign):
+        counts = self.counts
+        for pattern, problem in entries:
+            if pattern is None:
+                continue
+            self.pattern_lines += sign
+            if problem is not None:
+                self.malformed_lines += sign
+            n = counts.get(pattern, 0)
+            if sign > 0:
+                counts[pattern] = n + 1
+                if n:
+                    self.duplicate_lines += 1
+            elif n > 1:
+                counts[pattern] = n - 1
+                self.duplicate_lines -= 1
+            else:
+                del counts[pattern]
+
+    def replace_lines(self, start, end, lines):
+        """Replace lines start..end-1 (0-based) with lines, parsing only those"""
+        new_entries = [parse_line(line) for line in lines]
+        self.count(self.entries[start:end], -1)
+        self.entries[start:end] = new_entries
+        self.count(new_entries, 1)
+        self.version += 1
+        self.cached_patterns = None
+
+    def set_lines(self, lines):
+        self.entries = [parse_line(line) for line in lines]
+        self.counts = {}
+        self.pattern_lines = 0
+        self.duplicate_lines = 0
+        self.malformed_lines = 0
+        self.count(self.entries, 1)
+        self.version += 1
+        self.cached_patterns = None
+
+    def line_problem(self, i):
+        """What is wrong with line i (0-based): "duplicate", a malformed message or None"""
+        pattern, problem = self.entries[i]
+        if problem is not None:
+            return problem
+        if pattern is not None and self.counts[pattern] > 1:
+            return "duplicate"
+        return None
+
+    def problems(self, limit=None):
+        """[(line number, message)] with 1-based line numbers, at most limit of them"""
+        found = []
+        for i in range(len(self.entries)):
+            problem = self.line_problem(i)
+            if problem is not None:
+                found.append((i + 1, problem))
+                if limit is not None and len(found) >= limit:
+                    break
+        return found
+
+    def patterns(self):
+        """The non-blank patterns in order, as snapshot_operation hands them to mod_builder
+
+        Edits build a new list rather than changing the returned one, so it is
+        safe to share with worker threads.
+        """
+        if self.cached_patterns is None:
+            self.cached_patterns = [pattern for pattern, _ in self.entries if pattern is not None]
+        return self.cached_patterns
+
+    def lines(self, start=0, end=None):
+        """The stripped text of lines start..end-1, "" for blank lines"""
+        return [pattern or "" for pattern, _ in self.entries[start:end]]
+
+    def load(self, path):
+        with open(path, "r", encoding="utf-8-sig") as f:
+            self.set_lines(f.read().splitlines())
+
+    def save(self, path):
+        """Write the patterns, one per line; blank lines are dropped"""
+        with open(path, "w", encoding="utf-8", newline="\n") as f:
+            for pattern in self.patterns():
+                f.write(pattern + "\n")
@@ -1,87 +1,76 @@
-def generate_penumbra_json(patterns, variant, group_name, source_races, target_races):
+import sys
+from mod_model import Group, Option, PathMap, default_option
+
+
+def generate_penumbra_json(patterns, variant, group_name, source_races, target_races, race_mapping=None):
     """
     patterns: list of file path patterns with {race_id} and {variant}
     variant: string, zero-padded like '01', '02', etc.
     group_name: user-specified group name for the file and JSON "Name"
     source_races: dict of {race_name: race_id} - races that the mod files are applied to
     target_races: dict of {race_name: race_id} - races that players can choose as options
-    Returns: (json_dict, filename_without_extension)
+    race_mapping: optional dict of {target_race_name: [source_race_name, ...]} - limits which
+                  source races an option swaps; options missing from it swap every source race
+    Returns: (Group, filename_without_extension)
     """
     def substitute_variant(path):
         return path.replace("{variant}", variant)
 
-    options = []
-    
+    variant_patterns = [substitute_variant(pattern) for pattern in patterns]
+
+    # Options with the same source races swap the same source paths, so build them once per
+    # source set and share the key tuple. Like the dict this replaces, a repeated source path
+    # keeps its first position and the value of the last pattern that produced it.
+    swap_sources = {}
+
+    def source_keys(source_ids):
+        if source_ids not in swap_sources:
+            last_pattern = {}
+            for pattern_index, pattern in enumerate(variant_patterns):
+                for source_id in source_ids:
+                    last_pattern[sys.intern(pattern.replace("{race_id}", source_id))] = pattern_index
+            swap_sources[source_ids] = (tuple(last_pattern), tuple(last_pattern.values()))
+        return swap_sources[source_ids]
+
+    race_mapping = race_mapping or {}
+    all_source_ids = tuple(source_races.values())
+
     # Add default "No Changes" option first
-    default_option = {
-        "Name": "Off",
-        "Description": "Keep original game files unchanged",
-        "Priority": 0,
-        "Files": {},
-        "FileSwaps": {},
-        "Manipulations": []
-    }
-    options.append(default_option)
-    
+    options = [default_option()]
+
     # Add race-specific options
     for target_race, target_id in target_races.items():
-        file_swaps = {}
-        for pattern in patterns:
-            for source_race, source_id in source_races.items():
-                src = substitute_variant(pattern.replace("{race_id}", source_id))
-                tgt = substitute_variant(pattern.replace("{race_id}", target_id))
-                file_swaps[src] = tgt
-        option = {
-            "Name": target_race,
-            "Description": "",
-            "Priority": 0,
-            "Files": {},
-            "FileSwaps": file_swaps,
-            "Manipulations": []
-        }
-        options.append(option)
+        if target_race in race_mapping:
+            mapped = set(race_mapping[target_race])
+            source_ids = tuple(source_id for source_race, source_id in source_races.items() if source_race in mapped)
+        else:
+            source_ids = all_source_ids
+        swap_keys, swap_patterns = source_keys(source_ids)
+        targets = [sys.intern(pattern.replace("{race_id}", target_id)) for pattern in variant_patterns]
+        file_swaps = PathMap(swap_keys, tuple(targets[pattern_index] for pattern_index in swap_patterns))
+        options.append(Option(target_race, file_swaps=file_swaps))
 
     json_name = f"{group_name}{variant}"
-    return ({
-        "Version": 0,
-        "Name": json_name,
-        "Description": "",
-        "Image": "",
-        "Page": 0,
-        "Priority": 0,
-        "Type": "Single",
-        "DefaultSettings": 1,
-        "Options": options
-    }, json_name)
+    return Group(json_name, options), json_name
 
 def generate_file_override_json(all_options_data, group_name, applied_races):
     """
     all_options_data: list of dicts with 'option_name' and 'files_mapping' keys
     group_name: user-specified group name for the file and JSON "Name"
     applied_races: dict of {race_name: race_id} - races that this override applies to
-    Returns: (json_dict, filename_without_extension)
+    Returns: (Group, filename_without_extension)
     """
     def substitute_variant(path):
         return path.replace("{variant}", "")
 
-    options = []
-    
     # Create default "No Changes" option first
-    default_option = {
-        "Name": "Off",
-        "Description": "Keep original game files unchanged",
-        "Priority": 0,
-        "Files": {},
-        "FileSwaps": {},
-        "Manipulations": []
-    }
-    options.append(default_option)
-    
+    options = [default_option()]
+
     # Create user-defined options
     for option_data in all_options_data:
         option_name = option_data['option_name']
         files_mapping = option_data['files_mapping']
-        
+
         # Create the option with file overrides
         files = {}
         for race_name, race_id in applied_races.items():
@@ -89,30 +78,12 @@ def generate_file_override_json(all_options_data, group_name, applied_races):
                 target_pattern = file_mapping['target_pattern']
                 mod_path = file_mapping['mod_path']
                 target_path = substitute_variant(target_pattern.replace("{race_id}", race_id))
-                files[target_path] = mod_path
-        
-        user_option = {
-            "Name": option_name,
-            "Description": "",
-            "Priority": 0,
-            "Files": files,
-            "FileSwaps": {},
-            "Manipulations": []
-        }
-        options.append(user_option)
+                files[sys.intern(target_path)] = sys.intern(mod_path)
+
+        options.append(Option(option_name, files=PathMap.from_dict(files)))
 
     json_name = group_name
-    return ({
-        "Version": 0,
-        "Name": json_name,
-        "Description": "",
-        "Image": "",
-        "Page": 0,
-        "Priority": 0,
-        "Type": "Single",
-        "DefaultSettings": 1,
-        "Options": options
-    }, json_name)
+    return Group(json_name, options), json_name
 
 def generate_meta_json(name, author, description, version, website):
     return {
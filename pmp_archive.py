@@ -0,0 +1,122 @@
+import os
+
+# Helpers for writing .pmp packages (plain zip archives).
+#
+# Reproducible archives list entries in sorted order, store every file with the
+# same timestamp and permissions and leave out directory entries, so identical
+# inputs always give a byte-identical package. The timestamp honours
+# SOURCE_DATE_EPOCH when set and defaults to the zip epoch (1980-01-01).
+
+ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
+FILE_MODE = 0o644
+
+def reproducible_date_time():
+    """Return the fixed zip timestamp used for reproducible archives"""
+    import time
+
+    epoch = os.environ.get("SOURCE_DATE_EPOCH")
+    if not epoch:
+        return ZIP_EPOCH
+    # Zip timestamps can't go below 1980 and have 2 second resolution
+    t = time.gmtime(int(epoch))
+    if t.tm_year < 1980:
+        return ZIP_EPOCH
+    return (t.tm_year, t.tm_mon, t.tm_mday, t.tm_hour, t.tm_min, t.tm_sec - t.tm_sec % 2)
+
+def list_archive_files(src_dir):
+    """Return sorted (archive_name, file_path) pairs for every file under src_dir"""
+    entries = []
+    for root, dirs, files in os.walk(src_dir):
+        for name in files:
+            path = os.path.join(root, name)
+            arcname = os.path.relpath(path, src_dir).replace(os.sep, "/")
+            entries.append((arcname, path))
+    entries.sort()
+    return entries
+
+def write_zip(src_dir, target, reproducible=False):
+    """Zip src_dir into target, a file path or a writable binary stream
+
+    Files are streamed in chunks, so memory stays bounded whatever the package
+    size. On streams that can't seek (pipes, sockets, stdout) zipfile writes
+    each entry's CRC and sizes in a data descriptor after its data instead of
+    going back to fill in the local header.
+    """
+    import shutil
+    import zipfile
+
+    date_time = reproducible_date_time()
+    with zipfile.ZipFile(target, "w", zipfile.ZIP_DEFLATED) as zf:
+        for arcname, path in list_archive_files(src_dir):
+            if reproducible:
+                info = zipfile.ZipInfo(arcname, date_time)
+                info.external_attr = (0o100000 | FILE_MODE) << 16
+                info.create_system = 3  # Unix, so the permissions above are honoured everywhere
+            else:
+                info = zipfile.ZipInfo.from_file(path, arcname)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            # Known up front so zipfile can choose zip64 before writing, which a stream can't undo
+            info.file_size = os.path.getsize(path)
+            with open(path, "rb") as src, zf.open(info, "w") as dst:
+                shutil.copyfileobj(src, dst, 1024 * 1024)
+
+def write_reproducible_zip(src_dir, zip_path):
+    """Zip src_dir into zip_path with sorted entries and fixed metadata"""
+    write_zip(src_dir, zip_path, reproducible=True)
+
+def write_pmp_stream(src_dir, stream, reproducible=False):
+    """Package src_dir into an already open binary stream, e.g. sys.stdout.buffer"""
+    write_zip(src_dir, stream, reproducible)
+    stream.flush()
+
+def write_pmp(src_dir, out_dir, mod_safe_name, reproducible=False):
+    """Package src_dir as out_dir/<mod_safe_name>.pmp and return its path"""
+    import shutil
+
+    # Zip the files, then rename to .pmp
+    zip_path = os.path.join(out_dir, f"{mod_safe_name}.zip")
+    pmp_path = os.path.join(out_dir, f"{mod_safe_name}.pmp")
+    if reproducible:
+        write_reproducible_zip(src_dir, zip_path)
+    else:
+        shutil.make_archive(zip_path.replace('.zip', ''), 'zip', src_dir)
+    if os.path.exists(pmp_path):
+        os.remove(pmp_path)
+    os.rename(zip_path, pmp_path)
+    return pmp_path
+
+def is_group_file(name):
+    """True for group_*.json entries at the package root"""
+    return "/" not in name and name.startswith("group_") and name.endswith(".json")
+
+def load_mod_data(path):
+    """Read meta.json, default_mod.json and the group files of a .pmp or unpacked mod folder
+
+    Returns {'meta': dict, 'default_mod': dict, 'groups': [(file_name, group_dict)], 'files': set}
+    with groups sorted by file name (the order Penumbra loads them in) and
+    'files' holding every entry path in the mod.
+    """
+    import json
+    import zipfile
+
+    if os.path.isdir(path):
+        names = [arcname for arcname, _ in list_archive_files(path)]
+
+        def read(name):
+            with open(os.path.join(path, name), "r", encoding="utf-8-sig") as f:
+                return json.load(f)
+        return collect_mod_data(names, read)
+
+    with zipfile.ZipFile(path) as zf:
+        names = [info.filename for info in zf.infolist() if not info.is_dir()]
+        return collect_mod_data(names, lambda name: json.loads(zf.read(name).decode("utf-8-sig")))
+
+def collect_mod_data(names, read):
+    names = sorted(names)
+    files = set(names)
+    return {
+        'meta': read("meta.json") if "meta.json" in files else {},
+        'default_mod': read("default_mod.json") if "default_mod.json" in files else {},
+        'groups': [(name, read(name)) for name in names if is_group_file(name)],
+        'files': files,
+    }
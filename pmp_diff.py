@@ -0,0 +1,248 @@
+from pmp_archive import is_group_file
+
+# Entry-level diff between two .pmp packages.
+#
+# Both central directories are compared first (name, CRC-32, size), which needs
+# no decompression at all. Entries that vanished from one name and appeared
+# under another with the same CRC and size are reported as renames, which is
+# what a group ID shift looks like. Only meta.json, default_mod.json and group
+# files whose CRC or size differ are decompressed and diffed semantically:
+# group fields, options by name, and Files/FileSwaps at the key level. Those
+# that turn out to hold the same data (only formatting or key order changed),
+# or are not JSON objects, are reported as byte-level changes like any other
+# entry. Group files are paired by name with the
+# group_NNN_ prefix removed, so a renumbered and edited group still diffs as
+# one group.
+
+# Entries diffed as documents; every other entry, .json or not, is compared by CRC and size only
+DOCUMENTS = ("meta.json", "default_mod.json")
+
+GROUP_ID_PREFIX = r"^group_\d+_"
+_GROUP_ID_PREFIX_RE = None  # Compiled on first use; re is slow to import
+
+def read_entries(zf):
+    """Return {name: (crc, size)} for every file entry of an open ZipFile"""
+    return {info.filename: (info.CRC, info.file_size) for info in zf.infolist() if not info.is_dir()}
+
+def diff_mapping(old, new):
+    """Key-level diff of two dicts: {'added': {...}, 'removed': {...}, 'changed': {key: [old, new]}}"""
+    diff = {}
+    added = {key: value for key, value in new.items() if key not in old}
+    removed = {key: value for key, value in old.items() if key not in new}
+    changed = {key: [old[key], value] for key, value in new.items() if key in old and old[key] != value}
+    if added:
+        diff['added'] = added
+    if removed:
+        diff['removed'] = removed
+    if changed:
+        diff['changed'] = changed
+    return diff
+
+def diff_fields(old, new, skip=()):
+    """Changed scalar fields between two JSON objects, as {field: [old, new]}"""
+    fields = {}
+    for key in list(old) + [key for key in new if key not in old]:
+        if key in skip:
+            continue
+        if old.get(key) != new.get(key):
+            fields[key] = [old.get(key), new.get(key)]
+    return fields
+
+def diff_option(old, new):
+    diff = {}
+    fields = diff_fields(old, new, skip=('Files', 'FileSwaps', 'Name'))
+    if fields:
+        diff['fields'] = fields
+    for kind in ('Files', 'FileSwaps'):
+        mapping = diff_mapping(old.get(kind, {}), new.get(kind, {}))
+        if mapping:
+            diff[kind] = mapping
+    return diff
+
+def diff_document(old, new):
+    """Diff meta.json or default_mod.json: changed fields plus key-level Files/FileSwaps"""
+    diff = {}
+    fields = diff_fields(old, new, skip=('Files', 'FileSwaps'))
+    if fields:
+        diff['fields'] = fields
+    for kind in ('Files', 'FileSwaps'):
+        mapping = diff_mapping(old.get(kind, {}), new.get(kind, {}))
+        if mapping:
+            diff[kind] = mapping
+    return diff
+
+def diff_group(old, new):
+    """Semantic diff of two group JSON objects, options matched by Name"""
+    diff = {}
+    fields = diff_fields(old, new, skip=('Options',))
+    if fields:
+        diff['fields'] = fields
+
+    old_options = {}
+    for option in old.get('Options', []):
+        old_options.setdefault(option.get('Name', ""), option)
+    new_options = {}
+    for option in new.get('Options', []):
+        new_options.setdefault(option.get('Name', ""), option)
+
+    added = [name for name in new_options if name not in old_options]
+    removed = [name for name in old_options if name not in new_options]
+    if added:
+        diff['options_added'] = {name: option_size(new_options[name]) for name in added}
+    if removed:
+        diff['options_removed'] = {name: option_size(old_options[name]) for name in removed}
+    changed = {}
+    for name, option in new_options.items():
+        if name in old_options:
+            option_diff = diff_option(old_options[name], option)
+            if option_diff:
+                changed[name] = option_diff
+    if changed:
+        diff['options_changed'] = changed
+    return diff
+
+def option_size(option):
+    return {'Files': len(option.get('Files', {})), 'FileSwaps': len(option.get('FileSwaps', {}))}
+
+def is_document(name):
+    return name in DOCUMENTS or is_group_file(name)
+
+def group_key(name):
+    global _GROUP_ID_PREFIX_RE
+    if _GROUP_ID_PREFIX_RE is None:
+        import re
+        _GROUP_ID_PREFIX_RE = re.compile(GROUP_ID_PREFIX)
+    return _GROUP_ID_PREFIX_RE.sub("group_", name)
+
+def diff_packages(old_path, new_path):
+    """Compare two .pmp packages, decompressing only JSON entries whose CRC or size changed"""
+    import json
+    import zipfile
+
+    def load(zf, name):
+        try:
+            return json.loads(zf.read(name).decode("utf-8-sig"))
+        except ValueError:  # Includes UnicodeDecodeError
+            return None
+
+    with zipfile.ZipFile(old_path) as old_zf, zipfile.ZipFile(new_path) as new_zf:
+        old_entries = read_entries(old_zf)
+        new_entries = read_entries(new_zf)
+
+        added = sorted(name for name in new_entries if name not in old_entries)
+        removed = sorted(name for name in old_entries if name not in new_entries)
+        changed = sorted(name for name in new_entries if name in old_entries and new_entries[name] != old_entries[name])
+        unchanged = len(new_entries) - len(added) - len(changed)
+
+        # Same bytes under a new name
+        removed_by_content = {}
+        for name in removed:
+            removed_by_content.setdefault(old_entries[name], []).append(name)
+        renamed = []
+        for name in added:
+            candidates = removed_by_content.get(new_entries[name])
+            if candidates:
+                renamed.append([candidates.pop(0), name])
+        paired_old = {old_name for old_name, _ in renamed}
+        paired_new = {name for _, name in renamed}
+
+        # Pair remaining group files across an ID shift so they diff as one group
+        removed_groups = {group_key(name): name for name in removed if is_group_file(name) and name not in paired_old}
+        json_pairs = []
+        changed_entries = {}  # label -> (old name, new name) of entries reported as byte-level changes
+        for name in changed:
+            if is_document(name):
+                json_pairs.append((name, name))
+            else:
+                changed_entries[name] = (name, name)
+        for name in added:
+            old_name = removed_groups.get(group_key(name)) if is_group_file(name) and name not in paired_new else None
+            if old_name:
+                json_pairs.append((old_name, name))
+                paired_old.add(old_name)
+                paired_new.add(name)
+        added = [name for name in added if name not in paired_new]
+        removed = [name for name in removed if name not in paired_old]
+
+        groups = {}
+        documents = {}
+        for old_name, new_name in sorted(json_pairs, key=lambda pair: pair[1]):
+            label = new_name if old_name == new_name else f"{old_name} -> {new_name}"
+            old_json = load(old_zf, old_name)
+            new_json = load(new_zf, new_name)
+            if not isinstance(old_json, dict) or not isinstance(new_json, dict):
+                document_diff = None
+            elif is_group_file(new_name):
+                document_diff = diff_group(old_json, new_json)
+            else:
+                document_diff = diff_document(old_json, new_json)
+            if document_diff:
+                (groups if is_group_file(new_name) else documents)[label] = document_diff
+            else:
+                # Unreadable, or the same data written differently (formatting, key order)
+                changed_entries[label] = (old_name, new_name)
+
+    return {
+        'added': {name: new_entries[name][1] for name in added},
+        'removed': {name: old_entries[name][1] for name in removed},
+        'changed': {label: [old_entries[old_name][1], new_entries[new_name][1]]
+                    for label, (old_name, new_name) in sorted(changed_entries.items())},
+        'renamed': renamed,
+        'unchanged': unchanged,
+        'groups': groups,
+        'documents': documents,
+    }
+
+def has_differences(diff):
+    return any(diff[key] for key in ('added', 'removed', 'changed', 'renamed', 'groups', 'documents'))
+
+def format_mapping_diff(kind, mapping_diff, limit, indent):
+    counts = " ".join(f"{sign}{len(mapping_diff.get(key, {}))}" for sign, key in (("+", 'added'), ("-", 'removed'), ("~", 'changed')))
+    lines = [f"{indent}{kind}: {counts}"]
+    shown = 0
+    for sign, key in (("+", 'added'), ("-", 'removed'), ("~", 'changed')):
+        for path, value in mapping_diff.get(key, {}).items():
+            if shown >= limit:
+                lines.append(f"{indent}  ...")
+                return lines
+            value = f"{value[0]} => {value[1]}" if key == 'changed' else value
+            lines.append(f"{indent}  {sign} {path} -> {value}")
+            shown += 1
+    return lines
+
+def format_option_diff(option_diff, limit, indent):
+    lines = []
+    for field, (old, new) in option_diff.get('fields', {}).items():
+        lines.append(f"{indent}{field}: {old!r} -> {new!r}")
+    for kind in ('Files', 'FileSwaps'):
+        if kind in option_diff:
+            lines.extend(format_mapping_diff(kind, option_diff[kind], limit, indent))
+    return lines
+
+def format_diff(diff, limit=10):
+    """Human readable report of diff_packages output"""
+    lines = [f"Entries: {len(diff['added'])} added, {len(diff['removed'])} removed, "
+             f"{len(diff['changed'])} changed, {len(diff['renamed'])} renamed, {diff['unchanged']} unchanged"]
+    for name, size in diff['added'].items():
+        lines.append(f"+ {name} ({size} bytes)")
+    for name, size in diff['removed'].items():
+        lines.append(f"- {name} ({size} bytes)")
+    for name, (old_size, new_size) in diff['changed'].items():
+        lines.append(f"~ {name} ({old_size} -> {new_size} bytes)")
+    for old_name, new_name in diff['renamed']:
+        lines.append(f"R {old_name} -> {new_name}")
+    for label, document_diff in diff['documents'].items():
+        lines.append(f"{label}:")
+        lines.extend(format_option_diff(document_diff, limit, "  "))
+    for label, group_diff in diff['groups'].items():
+        lines.append(f"group {label}:")
+        for field, (old, new) in group_diff.get('fields', {}).items():
+            lines.append(f"  {field}: {old!r} -> {new!r}")
+        for name, size in group_diff.get('options_added', {}).items():
+            lines.append(f"  + option {name} ({size['Files']} files, {size['FileSwaps']} swaps)")
+        for name, size in group_diff.get('options_removed', {}).items():
+            lines.append(f"  - option {name} ({size['Files']} files, {size['FileSwaps']} swaps)")
+        for name, option_diff in group_diff.get('options_changed', {}).items():
+            lines.append(f"  ~ option {name}:")
+            lines.extend(format_option_diff(option_diff, limit, "      "))
+    return lines
@@ -0,0 +1,95 @@
+import os
+from group_split import DEFAULT_SPLIT_THRESHOLD
+
+# Project specs describe a whole mod as JSON so it can be built without the GUI:
+#
+# {
+#   "name": "My Mod", "author": "...", "description": "...", "version": "1.0.0", "website": "",
+#   "operations": [
+#     {"type": "file_redirection", "group_name": "poses", "patterns": ["..."], "variant_count": 4,
+#      "source_races": ["Midlander"], "source_include_male": true, "source_include_female": true,
+#      "target_races": ["Elezen"], "target_include_male": true, "target_include_female": true},
+#     {"type": "file_override", "group_name": "idle",
+#      "options": [{"option_name": "Option 1", "files": [{"local_file": "idle.pap", "target_pattern": "..."}]}],
+#      "applied_races": ["Viera"], "applied_include_male": true, "applied_include_female": true}
+#   ]
+# }
+#
+# Redirection operations may also set "split_mode" ("none", "race", "patterns"
+# or "size"), "split_threshold" and "split_size" to split oversized groups; see
+# group_split.py. A split_threshold or split_size of 0 (or "0") uses the default.
+#
+# "race_mapping" limits which 'Applied to' races each option swaps, using the
+# gendered option names of race_data.RACES, e.g.
+#   "race_mapping": {"Elezen F": ["Miqo'te F"], "Elezen M": ["Miqo'te F", "Midlander M"]}
+# Options left out of it swap every selected 'Applied to' race.
+#
+# Race lists use the base race names shown in the GUI; the include flags pick genders.
+# Relative local_file paths are resolved against the spec file's directory.
+
+ALL_RACES = ["Midlander", "Highlander", "Elezen", "Miqo'te", "Roegadyn", "Lalafell", "Au Ra", "Hrothgar", "Viera"]
+
+def normalize_operation(op, base_dir):
+    """Fill in spec defaults so the operation matches what gui.snapshot_operation produces"""
+    if op.get('type') == 'file_redirection':
+        return {
+            'type': 'file_redirection',
+            'patterns': [p.strip() for p in op.get('patterns', []) if p.strip()],
+            'variant_count': op.get('variant_count', 1),
+            'group_name': op.get('group_name', "").strip(),
+            'source_include_male': op.get('source_include_male', True),
+            'source_include_female': op.get('source_include_female', True),
+            'source_races': list(op.get('source_races', ALL_RACES)),
+            'target_include_male': op.get('target_include_male', True),
+            'target_include_female': op.get('target_include_female', True),
+            'target_races': list(op.get('target_races', ALL_RACES)),
+            'split_mode': op.get('split_mode', "none"),
+            'split_threshold': op.get('split_threshold', DEFAULT_SPLIT_THRESHOLD),
+            'split_size': op.get('split_size', 0),
+            'race_mapping': {target: list(sources) for target, sources in op.get('race_mapping', {}).items()}
+        }
+
+    if op.get('type') == 'file_override':
+        options = []
+        for option in op.get('options', []):
+            files = []
+            for pair in option.get('files', []):
+                local_file = pair.get('local_file', "").strip()
+                if local_file and not os.path.isabs(local_file):
+                    local_file = os.path.normpath(os.path.join(base_dir, local_file))
+                files.append({
+                    'local_file': local_file,
+                    'target_pattern': pair.get('target_pattern', "").strip()
+                })
+            options.append({
+                'option_name': option.get('option_name', "").strip(),
+                'files': files
+            })
+        return {
+            'type': 'file_override',
+            'group_name': op.get('group_name', "").strip(),
+            'options': options,
+            'applied_include_male': op.get('applied_include_male', True),
+            'applied_include_female': op.get('applied_include_female', True),
+            'applied_races': list(op.get('applied_races', ALL_RACES))
+        }
+
+    raise ValueError(f"Unknown operation type: {op.get('type')!r}")
+
+def load_project_spec(path):
+    """Load a project spec file, returning (mod_info, operations)"""
+    import json
+
+    with open(path, "r", encoding="utf-8") as f:
+        spec = json.load(f)
+
+    base_dir = os.path.dirname(os.path.abspath(path))
+    mod_info = {
+        'name': spec.get('name', "").strip(),
+        'author': spec.get('author', "Penumbra Path Mapper").strip(),
+        'description': spec.get('description', "Mod for Penumbra").strip(),
+        'website': spec.get('website', "").strip(),
+        'version': spec.get('version', "").strip() or "1.0.0"
+    }
+    operations = [normalize_operation(op, base_dir) for op in spec.get('operations', [])]
+    return mod_info, operations
@@ -0,0 +1,183 @@
+from pmp_archive import load_mod_data
+
+# Local stand-in for Penumbra's path resolution, so the effect of a mod can be
+# checked without loading it in the game.
+#
+# For one mod Penumbra applies the selected options of every group in order of
+# descending group Priority (ties keep file order), then the default option.
+# Within an option "Files" are applied before "FileSwaps", and inside a Multi
+# group options go by descending option Priority. The first redirection of a
+# game path wins. Resolved values are ('file', path_in_mod) for file
+# redirections and ('swap', game_path) for file swaps.
+#
+#   resolver = ModResolver.from_path("My_Mod.pmp")
+#   assert resolver.resolve({"operation01": "Elezen F"})[path] == ('swap', other_path)
+
+def option_redirections(option):
+    """Return the option's own {game_path: (kind, value)} map, Files before FileSwaps"""
+    redirections = {}
+    for game_path, mod_file in option.get('Files', {}).items():
+        redirections.setdefault(game_path, ('file', mod_file.replace("\\", "/")))
+    for game_path, swap_target in option.get('FileSwaps', {}).items():
+        redirections.setdefault(game_path, ('swap', swap_target))
+    return redirections
+
+class ModResolver:
+    """Compute effective game path redirections for chosen option combinations"""
+
+    def __init__(self, mod_data):
+        self.mod_data = mod_data
+        self.groups = []
+        for file_name, group in mod_data['groups']:
+            options = group.get('Options', [])
+            self.groups.append({
+                'file_name': file_name,
+                'name': group.get('Name', file_name),
+                'type': group.get('Type', "Single"),
+                'priority': group.get('Priority', 0),
+                'default': group.get('DefaultSettings', 0),
+                'option_names': [option.get('Name', "") for option in options],
+                'option_priorities': [option.get('Priority', 0) for option in options],
+                # Precomputed per option so resolving a combination is only dict merges
+                'redirections': [option_redirections(option) for option in options],
+            })
+        # Stable sort keeps file order among groups with equal priority
+        self.order = sorted(range(len(self.groups)), key=lambda i: -self.groups[i]['priority'])
+        self.default_redirections = option_redirections(mod_data['default_mod'])
+        self.name_index = {group['name']: i for i, group in enumerate(self.groups)}
+
+    @classmethod
+    def from_path(cls, path):
+        """Load a .pmp package or unpacked mod folder"""
+        return cls(load_mod_data(path))
+
+    def group_index(self, group):
+        if isinstance(group, int):
+            return group
+        if group not in self.name_index:
+            raise KeyError(f"Unknown group: {group!r}")
+        return self.name_index[group]
+
+    def option_index(self, group_index, option):
+        if isinstance(option, int):
+            return option
+        names = self.groups[group_index]['option_names']
+        if option not in names:
+            raise KeyError(f"Unknown option {option!r} in group {self.groups[group_index]['name']!r}")
+        return names.index(option)
+
+    def selected_options(self, group_index, choice):
+        """Return the chosen option indices of a group in application order"""
+        group = self.groups[group_index]
+        if not group['option_names']:
+            return []
+        if group['type'] == "Multi":
+            if choice is None:
+                mask = group['default']
+                indices = [i for i in range(len(group['option_names'])) if mask & (1 << i)]
+            else:
+                choices = choice if isinstance(choice, (list, tuple, set)) else [choice]
+                indices = [self.option_index(group_index, c) for c in choices]
+            return sorted(indices, key=lambda i: -group['option_priorities'][i])
+        if choice is None:
+            choice = group['default']
+        return [self.option_index(group_index, choice)]
+
+    def normalize_selection(self, selection=None):
+        """Turn {group name or index: option name(s) or index} into a choice per group"""
+        choices = [None] * len(self.groups)
+        for group, option in (selection or {}).items():
+            choices[self.group_index(group)] = option
+        return [self.selected_options(i, choice) for i, choice in enumerate(choices)]
+
+    def resolve(self, selection=None):
+        """Return {game_path: (kind, value)} for a selection; unselected groups use their defaults"""
+        selected = self.normalize_selection(selection)
+        redirections = {}
+        for group_index in self.order:
+            group_redirections = self.groups[group_index]['redirections']
+            for option_index in selected[group_index]:
+                for game_path, value in group_redirections[option_index].items():
+                    redirections.setdefault(game_path, value)
+        for game_path, value in self.default_redirections.items():
+            redirections.setdefault(game_path, value)
+        return redirections
+
+    def lookup(self, game_path, selection=None):
+        """Resolve a single game path, or None when the mod leaves it alone"""
+        return self.resolve(selection).get(game_path)
+
+    def combination_count(self):
+        count = 1
+        for group in self.groups:
+            if group['type'] != "Multi":
+                count *= max(len(group['option_names']), 1)
+        return count
+
+    def iter_combinations(self):
+        """Yield (choices, redirections) for every option combination of the Single groups
+
+        choices is a tuple with one option index per group (in file order; Multi
+        groups stay on their defaults and show as None). Combinations are walked
+        depth first in priority order, adding and undoing only the paths each
+        option contributes, so the yielded dict is shared and must be copied if
+        kept.
+        """
+        defaults = self.normalize_selection()
+        choices = [None] * len(self.groups)
+        redirections = {}
+
+        def apply(option_maps):
+            added = []
+            for option_map in option_maps:
+                for game_path, value in option_map.items():
+                    if game_path not in redirections:
+                        redirections[game_path] = value
+                        added.append(game_path)
+            return added
+
+        def undo(added):
+            for game_path in added:
+                del redirections[game_path]
+
+        def walk(depth):
+            if depth == len(self.order):
+                added = apply([self.default_redirections])
+                yield tuple(choices), redirections
+                undo(added)
+                return
+            group_index = self.order[depth]
+            group = self.groups[group_index]
+            if group['type'] == "Multi" or not group['option_names']:
+                added = apply(group['redirections'][i] for i in defaults[group_index])
+                yield from walk(depth + 1)
+                undo(added)
+                return
+            for option_index, option_map in enumerate(group['redirections']):
+                choices[group_index] = option_index
+                added = apply([option_map])
+                yield from walk(depth + 1)
+                undo(added)
+            choices[group_index] = None
+
+        yield from walk(0)
+
+    def missing_files(self):
+        """Return (group name, option name, mod file) for Files entries absent from the mod"""
+        missing = []
+        for group in self.groups:
+            for option_name, option_redirs in zip(group['option_names'], group['redirections']):
+                for kind, value in option_redirs.values():
+                    if kind == 'file' and value not in self.mod_data['files']:
+                        missing.append((group['name'], option_name, value))
+        return missing
+
+def parse_selection(pairs):
+    """Parse ["group=option", ...] command line choices into a selection dict"""
+    selection = {}
+    for pair in pairs:
+        group, sep, option = pair.partition("=")
+        if not sep:
+            raise ValueError(f"Expected GROUP=OPTION, got {pair!r}")
+        selection[group] = option
+    return selection
@@ -0,0 +1,123 @@
+import os
+from mod_builder import (process_operation, process_file_redirection_operation, process_file_override_operation,
+                         expand_races)
+from conflicts import group_claims
+
+# Parallel group generation for build_mod(jobs=...).
+#
+# Operations are snapshotted plain dicts, so they are split into independent
+# tasks (one per redirection variant, one per override operation) and run on
+# a process pool. Each task generates, serialises and copies its assets into
+# its own scratch directory, so JSON encoding in one worker overlaps with
+# asset I/O in another. Results are merged into the staging directory strictly
+# in task order while later tasks are still running; files written by a later
+# operation replace earlier ones exactly as in a serial build, and group IDs
+# are assigned afterwards from the ordered file list, so the output does not
+# depend on scheduling. For conflict detection workers only send back the
+# distinct key tuples each group claims, not the groups themselves.
+#
+# Projects whose estimated mapping count is below PARALLEL_MIN_MAPPINGS are
+# built serially: starting the pool costs more than it saves there.
+
+PARALLEL_MIN_MAPPINGS = 200000
+
+class GroupCollector:
+    """Stands in for a conflicts.TargetIndex inside a worker and sends the group claims back"""
+
+    def __init__(self):
+        self.claims = []
+
+    def add_group(self, group, owner=None):
+        self.claims.append((group_claims(group), group.name if owner is None else owner))
+
+def estimated_mappings(operations):
+    """Upper bound of the Files and FileSwaps entries a project generates"""
+    total = 0
+    for op in operations:
+        if op['type'] == 'file_redirection':
+            try:
+                variant_count = int(op['variant_count'])
+            except ValueError:
+                continue
+            source_races = expand_races(op['source_races'], op['source_include_male'], op['source_include_female'])
+            target_races = expand_races(op['target_races'], op['target_include_male'], op['target_include_female'])
+            total += len(op['patterns']) * len(source_races) * len(target_races) * variant_count
+        elif op['type'] == 'file_override':
+            applied_races = expand_races(op['applied_races'], op['applied_include_male'], op['applied_include_female'])
+            total += sum(len(option['files']) for option in op['options']) * len(applied_races)
+    return total
+
+def split_tasks(operations):
+    """Return (op, variants) tasks in build order; variants is None for whole operations"""
+    tasks = []
+    for op in operations:
+        if op['type'] == 'file_redirection':
+            for i in range(1, int(op['variant_count']) + 1):
+                tasks.append((op, [i]))
+        elif op['type'] == 'file_override':
+            tasks.append((op, None))
+    return tasks
+
+def run_task(op, variants, scratch_dir, reproducible, collect_groups):
+    """Worker entry point: generate one task into scratch_dir"""
+    os.makedirs(scratch_dir, exist_ok=True)
+    collector = GroupCollector() if collect_groups else None
+    if op['type'] == 'file_redirection':
+        files = process_file_redirection_operation(op, scratch_dir, reproducible, collector, variants)
+    else:
+        files = process_file_override_operation(op, scratch_dir, reproducible, collector)
+    return files, collector.claims if collector else []
+
+def merge_scratch(scratch_dir, temp_dir):
+    """Move everything a task wrote into the staging directory, replacing existing files"""
+    import shutil
+
+    for root, dirs, files in os.walk(scratch_dir):
+        rel_root = os.path.relpath(root, scratch_dir)
+        dst_root = temp_dir if rel_root == "." else os.path.join(temp_dir, rel_root)
+        os.makedirs(dst_root, exist_ok=True)
+        for name in files:
+            dst = os.path.join(dst_root, name)
+            if os.path.exists(dst):
+                os.remove(dst)
+            shutil.move(os.path.join(root, name), dst)
+
+def process_operations_parallel(operations, temp_dir, reproducible=False, index=None, jobs=None):
+    """Generate every operation into temp_dir on up to jobs processes (None or 0: one per CPU)
+
+    Small projects (see PARALLEL_MIN_MAPPINGS) are generated serially. Returns the generated file infos in the same order a serial build would.
+    """
+    import shutil
+    import tempfile
+    from concurrent.futures import ProcessPoolExecutor
+
+    tasks = split_tasks(operations)
+    workers = min(jobs or os.cpu_count() or 1, len(tasks))
+    if workers <= 1 or estimated_mappings(operations) < PARALLEL_MIN_MAPPINGS:
+        generated_files = []
+        for op in operations:
+            generated_files.extend(process_operation(op, temp_dir, reproducible, index))
+        return generated_files
+
+    # Scratch space next to the staging directory so merging is a rename
+    scratch_root = tempfile.mkdtemp(prefix="scratch_", dir=os.path.dirname(os.path.abspath(temp_dir)))
+    generated_files = []
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = []
+            for n, (op, variants) in enumerate(tasks):
+                scratch_dir = os.path.join(scratch_root, str(n))
+                futures.append((scratch_dir, pool.submit(run_task, op, variants, scratch_dir, reproducible, index is not None)))
+
+            for scratch_dir, future in futures:
+                files, claimed = future.result()
+                for claims, owner in claimed:
+                    index.add_claims(claims, owner)
+                merge_scratch(scratch_dir, temp_dir)
+                for file_info in files:
+                    file_info['file_path'] = os.path.join(temp_dir, os.path.basename(file_info['file_path']))
+                    generated_files.append(file_info)
+    finally:
+        shutil.rmtree(scratch_root, ignore_errors=True)
+
+    return generated_files
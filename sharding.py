@@ -0,0 +1,262 @@
+import os
+from mod_builder import (process_operation, operation_assets, assign_group_ids, group_file_name,
+                         clean_mod_name_for_filename, write_json)
+from penumbra_json import generate_meta_json, generate_default_mod_json
+
+# Size-capped output: spread one mod over several .pmp volumes.
+#
+# Every operation is generated into its own directory first (on a process
+# pool with -j, under the same rules as scheduler.py), so its weight is known
+# before packing: group files count with their exact deflated size, measured
+# once per file in a streaming pass (zipfile uses the same raw deflate
+# settings, and JSON shrinks a lot), assets
+# with zlib's compressBound, so they are never compressed twice, plus the zip
+# headers of every entry and directory. The weights are therefore upper
+# bounds and a volume never ends up larger than the budget. Operations are
+# packed best-fit decreasing (the fullest volume that still has room, found by
+# bisecting the volumes sorted by free space), which is O(n log v). Inside a
+# volume operations keep their original order, group IDs are assigned afresh
+# from 001, and each volume gets its own meta.json named
+# "<mod> (part k of n)". An asset used by operations in two volumes is stored
+# in both, so every volume works on its own. Volumes are zipped concurrently
+# on a process pool.
+#
+# An operation that does not fit in a volume on its own is an error unless
+# oversized volumes are allowed explicitly. Parts left over from an earlier
+# build with more volumes are removed, so out_dir never holds a mixed set.
+
+# Local header + central directory record, without the name (stored twice)
+ZIP_ENTRY_OVERHEAD = 30 + 46
+
+# End of central directory record
+ZIP_END_RECORD = 22
+
+DEFLATE_CHUNK_SIZE = 1024 * 1024
+
+def entry_weight(name, size):
+    return size + ZIP_ENTRY_OVERHEAD + 2 * len(name.encode("utf-8"))
+
+def deflate_bound(size):
+    """Largest raw deflate output for size input bytes (zlib's compressBound)"""
+    return size + (size >> 12) + (size >> 14) + (size >> 25) + 13
+
+def deflated_size(path):
+    """Exact size of a file compressed the way zipfile.ZIP_DEFLATED does it"""
+    import zlib
+
+    compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+    size = 0
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(DEFLATE_CHUNK_SIZE)
+            if not chunk:
+                break
+            size += len(compressor.compress(chunk))
+    return size + len(compressor.flush())
+
+def volume_reserve(mod_info):
+    """Bytes every volume needs for its meta.json and default_mod.json, with the longest part name"""
+    import json
+
+    meta = generate_meta_json(f"{mod_info['name']} (part 999 of 999)", mod_info['author'], mod_info['description'],
+                              mod_info['version'], mod_info.get('website', ""))
+    # ensure_ascii output is the largest the JSON can get; CRLF line endings on Windows add one byte per line
+    meta_text = json.dumps(meta, indent=4)
+    default_text = json.dumps(generate_default_mod_json(), indent=4)
+    return (entry_weight("meta.json", deflate_bound(len(meta_text) + meta_text.count("\n")))
+            + entry_weight("default_mod.json", deflate_bound(len(default_text) + default_text.count("\n")))
+            + ZIP_END_RECORD)
+
+def pack_volumes(weights, budget):
+    """Assign items to volumes of at most budget (best-fit decreasing)
+
+    weights is a list of item weights. Returns a list of volumes, each a list
+    of item indices in ascending order. Items heavier than the budget get a
+    volume to themselves.
+    """
+    import bisect
+
+    volumes = []
+    free = []  # sorted (free bytes, volume index)
+    for i in sorted(range(len(weights)), key=lambda i: (-weights[i], i)):
+        weight = weights[i]
+        pos = bisect.bisect_left(free, (weight, -1))
+        if pos < len(free):
+            space, v = free.pop(pos)
+            volumes[v].append(i)
+            bisect.insort(free, (space - weight, v))
+        else:
+            volumes.append([i])
+            if weight < budget:
+                bisect.insort(free, (budget - weight, len(volumes) - 1))
+
+    # Volumes in the order of their first operation, operations in project order
+    for volume in volumes:
+        volume.sort()
+    volumes.sort()
+    return volumes
+
+def stage_operation(op, op_dir, reproducible, index):
+    """Generate one operation into op_dir; returns (file infos, {mod_path: size}, weight)
+
+    Each file info gets the group file's deflated size as 'deflated_bytes'.
+    """
+    os.makedirs(op_dir, exist_ok=True)
+    generated_files = process_operation(op, op_dir, reproducible, index)
+    assets = {}
+    for _, mod_path in operation_assets(op):
+        path = os.path.join(op_dir, mod_path)
+        if os.path.isfile(path):
+            assets[mod_path] = os.path.getsize(path)
+    for file_info in generated_files:
+        file_info['deflated_bytes'] = deflated_size(file_info['file_path'])
+    weight = sum(entry_weight(os.path.basename(f['file_path']), f['deflated_bytes']) for f in generated_files)
+    weight += sum(entry_weight(mod_path, deflate_bound(size)) for mod_path, size in assets.items())
+    # Non-reproducible archives also get an entry per directory
+    directories = set()
+    for mod_path in assets:
+        directory = os.path.dirname(mod_path)
+        while directory and directory not in directories:
+            directories.add(directory)
+            directory = os.path.dirname(directory)
+    weight += sum(entry_weight(directory + "/", 0) for directory in directories)
+    return generated_files, assets, weight
+
+def stage_task(op, op_dir, reproducible, collect_claims):
+    """Worker entry point: stage_operation plus the claims of its groups for conflict detection"""
+    from scheduler import GroupCollector
+
+    collector = GroupCollector() if collect_claims else None
+    return stage_operation(op, op_dir, reproducible, collector), collector.claims if collector else []
+
+def stage_operations(operations, temp_dir, reproducible, index, jobs):
+    """stage_operation for every operation, on up to jobs processes; returns [(file infos, assets, weight)]"""
+    from concurrent.futures import ProcessPoolExecutor
+    from scheduler import PARALLEL_MIN_MAPPINGS, estimated_mappings
+
+    op_dirs = [os.path.join(temp_dir, "ops", str(n)) for n in range(len(operations))]
+    workers = min(jobs or os.cpu_count() or 1, len(operations))
+    if workers <= 1 or estimated_mappings(operations) < PARALLEL_MIN_MAPPINGS:
+        return [stage_operation(op, op_dir, reproducible, index) for op, op_dir in zip(operations, op_dirs)]
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(stage_task, op, op_dir, reproducible, index is not None)
+                   for op, op_dir in zip(operations, op_dirs)]
+        # Claims are added in project order, so conflicts are reported as in a serial build
+        for future in futures:
+            result, claimed = future.result()
+            for claims, owner in claimed:
+                index.add_claims(claims, owner)
+            results.append(result)
+    return results
+
+def stale_parts(out_dir, safe_name, part_count):
+    """Paths of <safe_name>_partNN.pmp files in out_dir numbered above part_count"""
+    prefix = f"{safe_name}_part"
+    stale = []
+    for name in os.listdir(out_dir):
+        number = name[len(prefix):-len(".pmp")]
+        if name.startswith(prefix) and name.endswith(".pmp") and number.isdigit() and int(number) > part_count:
+            stale.append(os.path.join(out_dir, name))
+    return sorted(stale)
+
+def link_or_copy(src, dst):
+    import shutil
+
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    if os.path.exists(dst):
+        os.remove(dst)  # A later operation replaces an earlier one's file, as in a serial build
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+def assemble_volume(mod_info, volume_dir, staged, part, part_count, reproducible):
+    """Fill volume_dir with meta.json, default_mod.json and its operations; returns its file infos"""
+    os.makedirs(volume_dir)
+    meta = generate_meta_json(f"{mod_info['name']} (part {part} of {part_count})", mod_info['author'],
+                              mod_info['description'], mod_info['version'], mod_info.get('website', ""))
+    write_json(os.path.join(volume_dir, "meta.json"), meta, 4, reproducible)
+    write_json(os.path.join(volume_dir, "default_mod.json"), generate_default_mod_json(), 4, reproducible)
+
+    group_ids = assign_group_ids(file_info['group_name'] for generated_files, _, _ in staged for file_info in generated_files)
+    volume_files = []
+    for generated_files, assets, op_dir in staged:
+        for file_info in generated_files:
+            group_id = group_ids[file_info['group_name']]
+            name = group_file_name(os.path.basename(file_info['file_path']), group_id)
+            link_or_copy(file_info['file_path'], os.path.join(volume_dir, name))
+            volume_files.append({**file_info, 'file_path': os.path.join(volume_dir, name), 'group_id': group_id})
+        for mod_path in assets:
+            link_or_copy(os.path.join(op_dir, mod_path), os.path.join(volume_dir, mod_path))
+    return volume_files
+
+def build_sharded(mod_info, operations, out_dir, max_bytes, reproducible=False, on_conflict=None,
+                  jobs=None, manifest=True, log=None, allow_oversized=False):
+    """Build the mod as <name>_partNN.pmp volumes of at most max_bytes each and return their paths
+
+    Operations are generated on up to jobs processes (None: one per CPU) and
+    volumes zipped concurrently, one process per volume up to the CPU count.
+    on_conflict and manifest work like in build_mod; returns None when
+    on_conflict declines. An operation larger than max_bytes on its own is
+    reported to log and nothing is written (None is returned), unless
+    allow_oversized, which gives it a volume to itself over the limit with a
+    warning; splitting its groups (see group_split.py) is usually better.
+    Higher-numbered parts left in out_dir by an earlier build are removed.
+    """
+    import tempfile
+    from concurrent.futures import ProcessPoolExecutor
+    from pmp_archive import write_pmp
+    from conflicts import TargetIndex
+
+    log = log or (lambda message: None)
+    index = TargetIndex() if on_conflict is not None else None
+    with tempfile.TemporaryDirectory() as temp_dir:
+        budget = max_bytes - volume_reserve(mod_info)
+        staged = []
+        weights = []
+        oversized = False
+        results = stage_operations(operations, temp_dir, reproducible, index, jobs)
+        for n, (op, (generated_files, assets, weight)) in enumerate(zip(operations, results)):
+            staged.append((generated_files, assets, os.path.join(temp_dir, "ops", str(n))))
+            weights.append(weight)
+            if weight > budget:
+                oversized = True
+                kind = "Warning" if allow_oversized else "Error"
+                log(f"{kind}: operation {n + 1} ({op['group_name']}) needs {weight} bytes, more than the volume size")
+        if oversized and not allow_oversized:
+            return None
+
+        if index is not None and index.conflicts and not on_conflict(index.conflicts):
+            return None
+
+        volumes = pack_volumes(weights, budget)
+        safe_name = clean_mod_name_for_filename(mod_info['name'])
+        volume_dirs = []
+        volume_files = []
+        for k, volume in enumerate(volumes):
+            volume_dir = os.path.join(temp_dir, "volumes", str(k + 1))
+            volume_files.append(assemble_volume(mod_info, volume_dir, [staged[i] for i in volume], k + 1,
+                                                len(volumes), reproducible))
+            volume_dirs.append(volume_dir)
+
+        # Zipping is independent of -j (which only controls group generation): one worker per volume
+        with ProcessPoolExecutor(max_workers=min(len(volume_dirs), os.cpu_count() or 1)) as pool:
+            futures = [pool.submit(write_pmp, volume_dir, out_dir, f"{safe_name}_part{k + 1:02}", reproducible)
+                       for k, volume_dir in enumerate(volume_dirs)]
+            pmp_paths = [future.result() for future in futures]
+
+        from build_manifest import manifest_path
+        for path in stale_parts(out_dir, safe_name, len(pmp_paths)):
+            os.remove(path)
+            if os.path.exists(manifest_path(path)):
+                os.remove(manifest_path(path))
+            log(f"Removed {path} left over from an earlier build with more volumes")
+
+        if manifest:
+            from build_manifest import build_manifest, write_manifest
+            for pmp_path, volume_dir, files in zip(pmp_paths, volume_dirs, volume_files):
+                write_manifest(build_manifest(pmp_path, volume_dir, files, mod_info, jobs), manifest_path(pmp_path))
+
+    return pmp_paths
@@ -0,0 +1,63 @@
+import json
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+# A small project exercising both operation types: a two-variant redirection
+# from Miqo'te F onto every race, and an override option with one asset.
+
+POSE_PATTERN = "chara/human/{race_id}/animation/a0001/bt_common/emote/s_pose{variant}_loop.pap"
+IDLE_PATTERN = "chara/human/{race_id}/animation/a0001/bt_common/resident/idle.pap"
+
+def spec_data(name="Test Mod"):
+    return {
+        'name': name, 'author': "me", 'description': "d", 'version': "1.0.0",
+        'operations': [
+            {'type': "file_redirection", 'group_name': "poses", 'patterns': [POSE_PATTERN], 'variant_count': 2,
+             'source_races': ["Miqo'te"], 'source_include_male': False},
+            {'type': "file_override", 'group_name': "idle",
+             'options': [{'option_name': "Option 1", 'files': [{'local_file': "idle.pap", 'target_pattern': IDLE_PATTERN}]}]},
+        ],
+    }
+
+@pytest.fixture
+def make_spec(tmp_path):
+    """Write a project spec (and its idle.pap asset) into tmp_path/project and return its path"""
+    def make(data=None, name="spec.json"):
+        project_dir = tmp_path / "project"
+        project_dir.mkdir(exist_ok=True)
+        asset = project_dir / "idle.pap"
+        if not asset.exists():
+            asset.write_bytes(b"idle animation " * 64)
+        path = project_dir / name
+        path.write_text(json.dumps(data or spec_data()), encoding="utf-8")
+        return str(path)
+    return make
+
+@pytest.fixture
+def spec_path(make_spec):
+    return make_spec()
+
+@pytest.fixture
+def project(spec_path):
+    from project_spec import load_project_spec
+    return load_project_spec(spec_path)
+
+@pytest.fixture
+def build(tmp_path):
+    """Build a (mod_info, operations) project into a fresh directory and return the .pmp path"""
+    from mod_builder import build_mod
+
+    counter = iter(range(1000))
+
+    def run(project, **kwargs):
+        out_dir = tmp_path / f"out{next(counter)}"
+        out_dir.mkdir()
+        kwargs.setdefault('reproducible', True)
+        return build_mod(*project, str(out_dir), **kwargs)
+    return run
@@ -0,0 +1,57 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+from conftest import ROOT
+
+BENCHMARKS = os.path.join(ROOT, "benchmarks")
+if BENCHMARKS not in sys.path:
+    sys.path.insert(0, BENCHMARKS)
+
+import bench_gui
+
+SCRIPT = os.path.join(BENCHMARKS, "bench_gui.py")
+
+def test_summarize():
+    results = [{'action': "a", 'latency_ms': 1.0}, {'action': "a", 'latency_ms': 3.0}, {'action': "b", 'latency_ms': 2.0}]
+    assert bench_gui.summarize(results) == {'a': {'count': 2, 'median_ms': 2.0, 'max_ms': 3.0},
+                                            'b': {'count': 1, 'median_ms': 2.0, 'max_ms': 2.0}}
+
+def test_compare(capsys):
+    baseline = {'slow': {'median_ms': 20.0}, 'fast': {'median_ms': 1.0}}
+    summary = {'slow': {'median_ms': 40.0}, 'fast': {'median_ms': 5.0}, 'new': {'median_ms': 100.0}}
+    # 'fast' grew fivefold but stays under the noise floor; 'new' has nothing to compare with
+    assert bench_gui.compare(summary, baseline, 1.5) == 1
+    assert capsys.readouterr().out == "REGRESSION slow: median 40.0ms, baseline 20.0ms\n"
+
+def test_no_display_and_no_xvfb(tmp_path):
+    env = {key: value for key, value in os.environ.items() if key != "DISPLAY"}
+    env['PATH'] = str(tmp_path)
+    result = subprocess.run([sys.executable, SCRIPT, "--size", "small", "-o", str(tmp_path / "out.json")],
+                            env=env, capture_output=True, text=True)
+    assert result.returncode == 1
+    assert "No DISPLAY and no Xvfb found" in result.stderr
+    assert not (tmp_path / "out.json").exists()
+
+@pytest.mark.skipif(not os.environ.get("DISPLAY") and shutil.which("Xvfb") is None, reason="needs a display or Xvfb")
+def test_small_scenario_smoke_run(tmp_path):
+    output = tmp_path / "gui_small.json"
+    subprocess.run([sys.executable, SCRIPT, "--size", "small", "--idle", "0.2", "-o", str(output)],
+                   check=True, capture_output=True, timeout=600)
+    report = json.loads(output.read_text(encoding="utf-8"))
+    assert report['scenario'] == {'redirection_tabs': 5, 'override_tabs': 5, 'pairs': 10, 'patterns': 1000}
+    counts = {action: stats['count'] for action, stats in report['summary'].items()}
+    assert counts['add redirection tab'] == counts['add override tab'] == 5
+    assert counts['add file/pattern pair'] == 10
+    assert counts['close first tab'] == 5
+    assert counts['idle after closing tabs'] == 1
+    actions = report['actions']
+    closing = [result for result in actions if result['action'] == "close first tab"]
+    assert closing[-1]['widgets'] < closing[0]['widgets']
+    # A run against itself as the baseline passes
+    subprocess.run([sys.executable, SCRIPT, "--size", "small", "--idle", "0.2", "-o", str(tmp_path / "again.json"),
+                    "--baseline", str(output), "--tolerance", "100"], check=True, capture_output=True, timeout=600)
@@ -0,0 +1,59 @@
+import hashlib
+import json
+import os
+import zipfile
+
+from build_manifest import MANIFEST_VERSION, manifest_path
+from project_spec import load_project_spec
+from watch import ModWatcher
+
+ASSET = "option_1/chara/human/race/animation/a0001/bt_common/resident/idle.pap"
+
+def load(pmp_path):
+    with open(manifest_path(pmp_path), encoding="utf-8") as f:
+        return json.load(f)
+
+def test_manifest_path():
+    assert manifest_path(os.path.join("out", "My_Mod.pmp")) == os.path.join("out", "My_Mod.manifest.json")
+
+def test_manifest_describes_the_package(project, build):
+    pmp_path = build(project)
+    manifest = load(pmp_path)
+    assert manifest['version'] == MANIFEST_VERSION
+    assert manifest['package'] == os.path.basename(pmp_path)
+    assert manifest['package_bytes'] == os.path.getsize(pmp_path)
+    assert manifest['mod'] == {'name': "Test Mod", 'author': "me", 'version': "1.0.0"}
+    assert [group['file'] for group in manifest['groups']] == \
+        ["group_001_poses01.json", "group_001_poses02.json", "group_002_idle.json"]
+    with zipfile.ZipFile(pmp_path) as zf:
+        for group in manifest['groups']:
+            info = zf.getinfo(group['file'])
+            assert (group['bytes'], group['compressed_bytes']) == (info.file_size, info.compress_size)
+        (asset,) = manifest['assets']
+        assert asset['path'] == ASSET
+        assert asset['sha256'] == hashlib.sha256(zf.read(ASSET)).hexdigest()
+        assert asset['size'] == zf.getinfo(ASSET).file_size
+    poses = manifest['groups'][0]
+    assert (poses['group_id'], poses['variant'], poses['options'], poses['files'], poses['swaps']) == \
+        ("001", "01", 19, 0, 18)
+
+def test_manifest_can_be_disabled(project, build):
+    assert not os.path.exists(manifest_path(build(project, manifest=False)))
+
+def test_watch_writes_the_same_groups(project, build, spec_path, tmp_path):
+    out_dir = tmp_path / "watch"
+    out_dir.mkdir()
+    watcher = ModWatcher(lambda: load_project_spec(spec_path), str(out_dir), spec_path=spec_path,
+                         reproducible=True, debounce=0, log=lambda message: None)
+    try:
+        assert watcher.poll()
+        watched = load(watcher.last_result['target'])
+    finally:
+        watcher.close()
+    built = load(build(project))
+
+    def strip(manifest):
+        return [{key: value for key, value in group.items() if key != 'seconds'} for group in manifest['groups']]
+
+    assert strip(watched) == strip(built)
+    assert watched['assets'] == built['assets']
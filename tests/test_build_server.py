@@ -0,0 +1,83 @@
+import asyncio
+import json
+import os
+import socket
+import threading
+import time
+
+import pytest
+
+from build_server import BuildServer, send_request
+
+TOKEN = "test-token"
+
+@pytest.fixture
+def server(tmp_path):
+    """A BuildServer on a Unix socket in a background thread; yields the socket path"""
+    socket_path = str(tmp_path / "server.sock")
+    server = BuildServer(max_builds=1, log=lambda message: None, token=TOKEN)
+    thread = threading.Thread(target=asyncio.run, args=(server.serve(socket_path=socket_path),), daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 10
+    while not os.path.exists(socket_path):
+        assert time.monotonic() < deadline, "server did not start"
+        time.sleep(0.01)
+    yield socket_path
+    list(send_request({'command': "shutdown"}, socket_path=socket_path, token=TOKEN))
+    thread.join(10)
+    assert not thread.is_alive()
+
+def request(socket_path, **fields):
+    return list(send_request(dict(fields, id=1), socket_path=socket_path, token=TOKEN))
+
+def raw_exchange(socket_path, data):
+    """Send raw bytes and return every event the server sends before closing the connection"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(5)
+        sock.connect(socket_path)
+        sock.sendall(data)
+        received = b""
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            received += chunk
+    return [json.loads(line) for line in received.splitlines()]
+
+def test_ping(server):
+    assert request(server, command="ping") == [{'id': 1, 'event': "done", 'status': "ok"}]
+
+def test_wrong_token_is_rejected(server):
+    events = list(send_request({'id': 1, 'command': "ping"}, socket_path=server, token="guess"))
+    assert events == [{'id': None, 'event': "error", 'message': "missing or wrong token"}]
+
+def test_connection_closes_on_first_invalid_line(server):
+    # A browser's cross-protocol POST: the body line would be a valid request
+    body = json.dumps({'command': "ping", 'id': 7, 'token': TOKEN})
+    events = raw_exchange(server, f"POST / HTTP/1.1\r\nHost: localhost\r\n\r\n{body}\n".encode("utf-8"))
+    assert len(events) == 1
+    assert events[0]['event'] == "error" and events[0]['id'] is None
+
+def test_requests_after_a_bad_token_are_not_served(server):
+    lines = [{'command': "ping", 'id': 1}, {'command': "ping", 'id': 2, 'token': TOKEN}]
+    events = raw_exchange(server, b"".join((json.dumps(line) + "\n").encode("utf-8") for line in lines))
+    assert [event['event'] for event in events] == ["error"]
+
+def test_build_then_up_to_date(server, spec_path, tmp_path):
+    out_dir = str(tmp_path / "out")
+    first = request(server, command="build", spec=spec_path, out_dir=out_dir, reproducible=True)
+    assert [event['event'] for event in first][:2] == ["queued", "started"]
+    assert first[-1]['status'] == "built"
+    assert os.path.isfile(first[-1]['target'])
+    second = request(server, command="build", spec=spec_path, out_dir=out_dir, reproducible=True)
+    assert second[-1]['status'] == "up-to-date"
+
+def test_dry_run_and_verify(server, spec_path, project, build):
+    dry_run = request(server, command="dry-run", spec=spec_path)
+    assert dry_run[-1]['status'] == "ok" and dry_run[-1]['groups'] == 3
+    verify = request(server, command="verify", pmp=build(project))
+    assert verify[-1]['status'] == "ok"
+
+def test_errors_are_events(server, tmp_path):
+    assert request(server, command="build", spec=str(tmp_path / "missing.json"))[-1]['event'] == "error"
+    assert request(server, command="nonsense")[-1] == {'id': 1, 'event': "error", 'message': "unknown command 'nonsense'"}
@@ -0,0 +1,59 @@
+import os
+
+from conftest import POSE_PATTERN, spec_data
+from conflicts import TargetIndex, format_conflicts, group_claims
+from mod_builder import build_mod, dry_run, generate_operation_groups
+from project_spec import load_project_spec
+
+def clashing_project(make_spec):
+    data = spec_data()
+    data['operations'].append({'type': "file_redirection", 'group_name': "more poses", 'patterns': [POSE_PATTERN],
+                               'variant_count': 1, 'source_races': ["Miqo'te"], 'source_include_male': False})
+    return load_project_spec(make_spec(data))
+
+def test_index_records_each_owner_once():
+    index = TargetIndex()
+    index.add_paths(["A/b", "c"], "g1", ("x", 'Files'))
+    index.add_paths(["a/B"], "g1", ("y", 'Files'))  # Same owner: not a conflict
+    assert index.conflicts == {}
+    index.add("A/B", "g2", ("z", 'FileSwaps'))
+    index.add("a/b", "g2", ("w", 'FileSwaps'))
+    assert index.conflicts == {'a/b': [("g1", ("x", 'Files')), ("g2", ("z", 'FileSwaps'))]}
+    assert len(index) == 2
+
+def test_group_claims_index_like_every_option(project):
+    redirection = project[1][0]
+    for group, owner in generate_operation_groups(redirection):
+        by_claims = TargetIndex()
+        by_claims.add_claims(group_claims(group), "other")
+        by_options = TargetIndex()
+        for option in group.options:
+            by_options.add_paths(option.files.keys, "other", (option.name, 'Files'))
+            by_options.add_paths(option.file_swaps.keys, "other", (option.name, 'FileSwaps'))
+        assert set(by_claims.first) == set(by_options.first)
+
+def test_project_without_clashes(project):
+    summary = dry_run(*project)
+    assert summary['errors'] == []
+    assert summary['conflicts'] == {}
+
+def test_redirections_of_the_same_paths_conflict(make_spec):
+    summary = dry_run(*clashing_project(make_spec))
+    assert len(summary['conflicts']) == 1  # The one Miqo'te F source path of variant 01
+    (claimants,) = summary['conflicts'].values()
+    assert [owner for owner, _ in claimants] == ["poses01", "more poses01"]
+    (line,) = format_conflicts(summary['conflicts'])
+    assert "poses01 (" in line and "more poses01 (" in line
+
+def test_declined_conflicts_write_nothing(make_spec, tmp_path):
+    reported = []
+
+    def decline(conflicts):
+        reported.append(conflicts)
+        return False
+
+    out_dir = tmp_path / "out"
+    out_dir.mkdir()
+    assert build_mod(*clashing_project(make_spec), str(out_dir), on_conflict=decline) is None
+    assert len(reported) == 1
+    assert os.listdir(out_dir) == []
@@ -0,0 +1,52 @@
+import io
+import json
+
+import pytest
+
+import mod_model
+from conftest import POSE_PATTERN
+from mod_builder import expand_races
+from mod_model import Group, GroupEncoder, Option, PathMap, default_option, dump_group
+from penumbra_json import generate_penumbra_json
+
+def redirection_group():
+    patterns = [POSE_PATTERN, POSE_PATTERN.replace("s_pose", "j_pose")]
+    group, _ = generate_penumbra_json(patterns, "01", "poses", expand_races(["Miqo'te"], True, True),
+                                      expand_races(["Viera", "Au Ra"], True, True))
+    return group
+
+def odd_group():
+    """Non-ASCII text, escapes, manipulations and an empty option list side by side"""
+    return Group("Grüße \"quoted\"\t", [
+        default_option(),
+        Option("Ünïcode ✓", description="line\nbreak", priority=-3,
+               files=PathMap(("z/b.tex", "a/ä.tex"), ("local\\b.tex", "local/ä.tex")),
+               manipulations=({'Type': "Imc", 'Manipulation': {'Entry': {'b': 1, 'a': [2, 3]}}},)),
+    ], description="ø", priority=7, page=2, default_settings=1)
+
+GROUPS = [redirection_group, odd_group, lambda: Group("empty", [])]
+
+@pytest.mark.parametrize("make_group", GROUPS)
+@pytest.mark.parametrize("indent", [2, 4])
+@pytest.mark.parametrize("sort_keys", [False, True])
+def test_output_matches_json_dump(make_group, indent, sort_keys):
+    group = make_group()
+    encoder = GroupEncoder(indent, sort_keys)
+    expected = json.dumps(group.to_dict(), indent=indent, sort_keys=sort_keys)
+    assert "".join(encoder.iter_chunks(group)) == expected
+    # Warm caches give the same text
+    assert "".join(encoder.iter_chunks(make_group())) == expected
+
+def test_dump_group_writes_the_same_text():
+    group = redirection_group()
+    f = io.StringIO()
+    dump_group(group, f, indent=4, sort_keys=True)
+    assert f.getvalue() == json.dumps(group.to_dict(), indent=4, sort_keys=True)
+
+def test_path_cache_starts_over(monkeypatch):
+    monkeypatch.setattr(mod_model, "PATH_CACHE_LIMIT", 3)
+    encoder = GroupEncoder()
+    group = redirection_group()
+    for _ in range(2):
+        assert "".join(encoder.iter_chunks(group)) == json.dumps(group.to_dict(), indent=2)
+    assert len(encoder.paths) <= 3
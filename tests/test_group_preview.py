@@ -0,0 +1,59 @@
+import json
+
+from conftest import POSE_PATTERN
+from group_preview import GroupPreviewer
+from mod_builder import expand_races
+from penumbra_json import generate_penumbra_json
+
+def many_patterns(count):
+    return [POSE_PATTERN.replace("s_pose", f"pose{n}_") for n in range(count)]
+
+def test_small_group_is_shown_as_built(project):
+    _, operations = project
+    op = operations[0]
+    group, _ = generate_penumbra_json(op['patterns'], "01", "poses", expand_races(["Miqo'te"], False, True),
+                                      expand_races(op['target_races'], True, True))
+    assert GroupPreviewer().preview(op) == json.dumps(group.to_dict(), indent=2)
+
+def test_override_preview(project):
+    _, operations = project
+    assert json.loads(GroupPreviewer().preview(operations[1]))['Name'] == "idle"
+
+def test_large_group_is_summarised(project):
+    _, operations = project
+    op = dict(operations[0], patterns=many_patterns(200))
+    text = GroupPreviewer(max_mappings=100).preview(op)
+    lines = text.splitlines()
+    assert lines[:4] == ["Group poses01 (variant 1 of 2) is too large to show:",
+                         "  19 options (Off + 18 races)",
+                         "  200 swaps per race option, 3600 in total",
+                         "  7200 swaps over all 2 variants"]
+    assert len(lines) == 5 + 10
+
+def test_race_mapping_changes_the_counts(project):
+    _, operations = project
+    op = dict(operations[0], patterns=many_patterns(200), source_include_male=True,
+              race_mapping={'Midlander M': ["Miqo'te M"]})
+    assert "  200-400 swaps per race option, 7000 in total" in GroupPreviewer(max_mappings=100).preview(op)
+
+def test_pattern_edit_computes_one_pattern(project):
+    _, operations = project
+    previewer = GroupPreviewer(max_mappings=100)
+    patterns = many_patterns(500)
+    previewer.preview(dict(operations[0], patterns=patterns))
+    assert len(previewer.pattern_paths) == 500
+    edited = patterns[:-1] + [patterns[-1].replace("pose", "edited")]
+    text = previewer.preview(dict(operations[0], patterns=edited))
+    assert len(previewer.pattern_paths) == 501
+    assert "500 swaps per race option" in text
+
+def test_previews_are_cached(project):
+    _, operations = project
+    previewer = GroupPreviewer()
+    first = previewer.preview(operations[0])
+    previewer.render = None  # A cached preview must not render again
+    assert previewer.preview(operations[0]) is first
+
+def test_broken_operation():
+    op = {'type': "file_redirection", 'patterns': ["x"], 'variant_count': "many"}
+    assert GroupPreviewer().preview(op).startswith("No preview: ")
@@ -0,0 +1,62 @@
+import pytest
+
+from conftest import POSE_PATTERN
+from group_split import generate_split_groups, group_mapping_count, race_family, split_setting
+from mod_builder import expand_races, validate_operation
+from penumbra_json import generate_penumbra_json
+
+def races(op):
+    return (expand_races(op['source_races'], op['source_include_male'], op['source_include_female']),
+            expand_races(op['target_races'], op['target_include_male'], op['target_include_female']))
+
+def split(op, **settings):
+    return generate_split_groups(dict(op, **settings), "01", *races(op))
+
+@pytest.fixture
+def redirection(project):
+    _, operations = project
+    return dict(operations[0], patterns=[POSE_PATTERN, POSE_PATTERN.replace("s_pose", "j_pose")])
+
+def test_small_groups_are_not_split(redirection):
+    (group, json_name), = split(redirection, split_mode="race")
+    assert json_name == "poses01"
+    assert group.name == "poses01"
+
+def test_race_split(redirection):
+    parts = split(redirection, split_mode="race", split_threshold=1)
+    whole, _ = generate_penumbra_json(redirection['patterns'], "01", "poses", *races(redirection))
+    families = {race_family(option.name) for option in whole.options[1:]}
+    assert len(parts) == len(families)
+    assert [json_name for _, json_name in parts] == [f"poses01_{k:02}" for k in range(1, len(parts) + 1)]
+    assert [group.page for group, _ in parts] == list(range(len(parts)))
+    assert sum(group_mapping_count(group) for group, _ in parts) == group_mapping_count(whole)
+    # Only the first part keeps the default selection, the rest default to "Off"
+    assert parts[0][0].default_settings == whole.default_settings
+    assert all(group.default_settings == 0 for group, _ in parts[1:])
+
+def test_patterns_split(redirection):
+    parts = split(redirection, split_mode="patterns", split_threshold=1, split_size=1)
+    assert [group.name for group, _ in parts] == ["poses01 (patterns 1-1)", "poses01 (patterns 2-2)"]
+    assert all(len(group.options[1].file_swaps) == 1 for group, _ in parts)
+
+def test_size_split_respects_budget(redirection):
+    parts = split(redirection, split_mode="size", split_threshold=1, split_size=4)
+    assert len(parts) > 1
+    assert all(group_mapping_count(group) <= 4 for group, _ in parts)
+
+def test_split_setting():
+    assert split_setting({}, 'split_size', 50) == 50
+    assert split_setting({'split_size': ""}, 'split_size', 50) == 50
+    assert split_setting({'split_size': "0"}, 'split_size', 50) == 50
+    assert split_setting({'split_size': 0}, 'split_size', 50) == 50
+    assert split_setting({'split_size': "7"}, 'split_size', 50) == 7
+
+@pytest.mark.parametrize("value, valid", [(0, True), ("0", True), ("", True), ("12", True), (-1, False), ("x", False)])
+def test_split_setting_validation(redirection, value, valid):
+    errors = validate_operation(dict(redirection, split_mode="size", split_size=value), 1)
+    assert (errors == []) is valid
+    if not valid:
+        assert errors == ["Split size must be a positive integer, or 0 for the default, in operation 1."]
+
+def test_unknown_split_mode_is_rejected(redirection):
+    assert validate_operation(dict(redirection, split_mode="random"), 1) == ["Unknown split mode 'random' in operation 1."]
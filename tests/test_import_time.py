@@ -0,0 +1,21 @@
+import pytest
+
+from check_import_time import BUDGETS_US, FORBIDDEN, measure_import
+
+@pytest.mark.parametrize("module", sorted(BUDGETS_US))
+def test_headless_module_does_not_import_tk(module):
+    timings = measure_import(module)
+    assert module in timings
+    assert not [name for name in timings if name.split(".")[0] in FORBIDDEN]
+
+@pytest.mark.parametrize("module", ["pattern_list", "pmp_diff", "mod_builder"])
+def test_regexes_are_not_imported_up_front(module):
+    assert "re" not in measure_import(module)
+
+def test_lazy_regexes_still_work():
+    from pattern_list import pattern_problem
+    from pmp_diff import group_key
+
+    assert pattern_problem("a/{bad}/{race_id}") == "unknown placeholder {bad}"
+    assert pattern_problem("a/{race_id}/{variant}") is None
+    assert group_key("group_012_poses.json") == "group_poses.json"
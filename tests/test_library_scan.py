@@ -0,0 +1,56 @@
+import shutil
+
+import pytest
+
+from library_scan import central_directory_digest, index_package, scan_library
+
+@pytest.fixture
+def library(project, build, tmp_path):
+    """A folder holding the test package twice, under two names"""
+    folder = tmp_path / "library"
+    folder.mkdir()
+    pmp_path = build(project)
+    shutil.copy(pmp_path, folder / "a.pmp")
+    shutil.copy(pmp_path, folder / "b.pmp")
+    return folder
+
+def test_same_mod_twice_conflicts_on_every_path(library):
+    index, stats = scan_library(str(library), jobs=1)
+    assert stats == {'packages': 2, 'indexed': 2, 'cached': 0, 'failed': 0}
+    paths = index_package(str(library / "a.pmp"))
+    assert set(index.conflicts) == set(paths)
+    for claimants in index.conflicts.values():
+        assert [owner for owner, _ in claimants] == ["a.pmp", "b.pmp"]
+
+def test_rescan_uses_the_cache(library, tmp_path):
+    cache_path = str(tmp_path / "cache.json")
+    first, _ = scan_library(str(library), cache_path=cache_path, jobs=1)
+    second, stats = scan_library(str(library), cache_path=cache_path, jobs=1)
+    assert (stats['indexed'], stats['cached']) == (0, 2)
+    assert second.conflicts == first.conflicts
+
+def test_changed_package_is_reindexed(library, project, build, tmp_path, monkeypatch):
+    cache_path = str(tmp_path / "cache.json")
+    scan_library(str(library), cache_path=cache_path, jobs=1)
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", "1700000000")  # Same contents, new central directory
+    shutil.copy(build(project), library / "b.pmp")
+    _, stats = scan_library(str(library), cache_path=cache_path, jobs=1)
+    assert (stats['indexed'], stats['cached']) == (1, 1)
+
+@pytest.mark.parametrize("jobs", [None, 0, 2])
+def test_jobs_zero_means_default(library, jobs):
+    _, stats = scan_library(str(library), jobs=jobs)
+    assert stats['indexed'] == 2
+
+def test_broken_packages_are_skipped(library):
+    (library / "broken.pmp").write_bytes(b"not a zip")
+    messages = []
+    _, stats = scan_library(str(library), jobs=1, log=messages.append)
+    assert stats['failed'] == 1
+    assert messages and "broken.pmp" in messages[0]
+
+def test_digest_depends_on_contents(library, project, build, monkeypatch):
+    digest = central_directory_digest(str(library / "a.pmp"))
+    assert digest == central_directory_digest(str(library / "b.pmp"))
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", "1700000000")
+    assert central_directory_digest(build(project)) != digest
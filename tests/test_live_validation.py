@@ -0,0 +1,49 @@
+import os
+
+from conftest import POSE_PATTERN
+from live_validation import ValidationCache
+from mod_builder import validate_project
+
+def test_results_match_validate_project(project):
+    mod_info, operations = project
+    broken = dict(operations[0], group_name="")
+    assert ValidationCache().validate(mod_info, [broken, operations[1]], ["a", "b"]) == \
+        validate_project(mod_info, [broken, operations[1]])
+
+def test_only_changed_tabs_are_revalidated(project):
+    mod_info, operations = project
+    cache = ValidationCache()
+    assert cache.validate(mod_info, operations, ["a", "b"]) == []
+    assert cache.last_revalidated == 2
+    cache.validate(mod_info, operations, ["a", "b"])
+    assert cache.last_revalidated == 0
+    errors = cache.validate(mod_info, [dict(operations[0], group_name=""), operations[1]], ["a", "b"])
+    assert cache.last_revalidated == 1
+    assert errors == ["Please fill out all fields in operation 1."]
+
+def test_pattern_edits_do_not_revalidate(project):
+    mod_info, operations = project
+    cache = ValidationCache()
+    cache.validate(mod_info, operations, ["a", "b"])
+    edited = dict(operations[0], patterns=[POSE_PATTERN, "chara/other.pap"])
+    cache.validate(mod_info, [edited, operations[1]], ["a", "b"])
+    assert cache.last_revalidated == 0
+    errors = cache.validate(mod_info, [dict(operations[0], patterns=[]), operations[1]], ["a", "b"])
+    assert cache.last_revalidated == 1
+    assert errors == ["Please fill out all fields in operation 1."]
+
+def test_moved_tab_is_revalidated(project):
+    mod_info, operations = project
+    cache = ValidationCache()
+    cache.validate(mod_info, operations, ["a", "b"])
+    cache.validate(mod_info, operations[::-1], ["b", "a"])
+    assert cache.last_revalidated == 2
+
+def test_deleted_asset_is_noticed(project):
+    mod_info, operations = project
+    cache = ValidationCache()
+    assert cache.validate(mod_info, operations, ["a", "b"]) == []
+    asset = operations[1]['options'][0]['files'][0]['local_file']
+    os.remove(asset)
+    assert cache.validate(mod_info, operations, ["a", "b"]) == [f"Local file does not exist: {asset}"]
+    assert cache.last_revalidated == 1
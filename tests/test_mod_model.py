@@ -0,0 +1,38 @@
+import pytest
+
+from conftest import POSE_PATTERN
+from mod_builder import expand_races
+from mod_model import EMPTY_MAP, Group, Option, PathMap, default_option
+from penumbra_json import generate_penumbra_json
+
+def test_path_map_is_an_ordered_mapping():
+    path_map = PathMap.from_dict({'b': "1", 'a': "2"})
+    assert list(path_map) == ["b", "a"]
+    assert list(path_map.items()) == [("b", "1"), ("a", "2")]
+    assert len(path_map) == 2
+    assert path_map.to_dict() == {'b': "1", 'a': "2"}
+
+@pytest.mark.parametrize("obj", [EMPTY_MAP, default_option(), Group("g", [])])
+def test_model_objects_are_slotted(obj):
+    assert not hasattr(obj, "__dict__")
+    with pytest.raises(AttributeError):
+        obj.extra = 1
+
+def test_to_dict_matches_penumbra_layout():
+    group = Group("g", [default_option(), Option("A", files=PathMap(("p",), ("f",)))], priority=3)
+    data = group.to_dict()
+    assert list(data) == ["Version", "Name", "Description", "Image", "Page", "Priority", "Type", "DefaultSettings", "Options"]
+    assert data['Priority'] == 3
+    assert data['Options'][1] == {'Name': "A", 'Description': "", 'Priority': 0, 'Files': {'p': "f"},
+                                  'FileSwaps': {}, 'Manipulations': []}
+
+def test_race_options_share_key_tuples_and_strings():
+    source_races = expand_races(["Miqo'te", "Elezen"], True, True)
+    target_races = expand_races(["Viera", "Au Ra"], True, True)
+    group, _ = generate_penumbra_json([POSE_PATTERN], "01", "poses", source_races, target_races)
+    race_options = group.options[1:]
+    assert len(race_options) == len(target_races)
+    assert all(option.file_swaps.keys is race_options[0].file_swaps.keys for option in race_options)
+    # One interned target string per option, shared by all its sources
+    for option in race_options:
+        assert len({id(value) for value in option.file_swaps.values}) == 1
@@ -0,0 +1,71 @@
+import random
+
+import pytest
+
+from conftest import POSE_PATTERN
+from pattern_list import PatternList, pattern_problem
+
+def totals(patterns):
+    return patterns.pattern_lines, patterns.duplicate_lines, patterns.malformed_lines
+
+@pytest.mark.parametrize("pattern, problem", [
+    (POSE_PATTERN, None),
+    ("chara\\{race_id}.pap", "uses backslashes; game paths use /"),
+    ("/chara/{race_id}.pap", "starts with /"),
+    ("chara/{race_id} x.pap", "contains whitespace"),
+    ("chara/{race}/{race_id}.pap", "unknown placeholder {race}"),
+    ("chara/human/idle.pap", "has no {race_id}"),
+])
+def test_pattern_problem(pattern, problem):
+    assert pattern_problem(pattern) == problem
+
+def test_counts_and_problems():
+    patterns = PatternList(["  a/{race_id}.pap ", "", "a/{race_id}.pap", "bad.pap"])
+    assert totals(patterns) == (3, 1, 1)
+    assert patterns.patterns() == ["a/{race_id}.pap", "a/{race_id}.pap", "bad.pap"]
+    assert patterns.problems() == [(1, "duplicate"), (3, "duplicate"), (4, "has no {race_id}")]
+    assert patterns.problems(limit=1) == [(1, "duplicate")]
+    assert patterns.lines(0, 2) == ["a/{race_id}.pap", ""]
+
+def test_replace_lines_updates_counts():
+    patterns = PatternList(["a/{race_id}", "a/{race_id}", "b/{race_id}"])
+    first = patterns.patterns()
+    patterns.replace_lines(1, 2, ["c/{race_id}", "", "bad"])
+    assert totals(patterns) == (4, 0, 1)
+    assert patterns.patterns() == ["a/{race_id}", "c/{race_id}", "bad", "b/{race_id}"]
+    # The list handed out before the edit is left alone
+    assert first == ["a/{race_id}", "a/{race_id}", "b/{race_id}"]
+
+def test_patterns_are_cached_until_an_edit():
+    patterns = PatternList(["a/{race_id}"])
+    assert patterns.patterns() is patterns.patterns()
+    version = patterns.version
+    before = patterns.patterns()
+    patterns.replace_lines(1, 1, ["b/{race_id}"])
+    assert patterns.version == version + 1
+    assert patterns.patterns() is not before
+
+def test_random_edits_match_a_fresh_parse():
+    rng = random.Random(1)
+    words = ["a/{race_id}", "b/{race_id}", "c/{race_id}", "", "bad", " a/{race_id} "]
+    patterns = PatternList()
+    lines = []
+    for _ in range(500):
+        start = rng.randint(0, len(lines))
+        end = rng.randint(start, min(len(lines), start + 3))
+        new = [rng.choice(words) for _ in range(rng.randint(0, 3))]
+        lines[start:end] = new
+        patterns.replace_lines(start, end, new)
+        fresh = PatternList(lines)
+        assert totals(patterns) == totals(fresh)
+        assert patterns.counts == fresh.counts
+    assert patterns.problems() == fresh.problems()
+
+def test_save_and_load(tmp_path):
+    path = tmp_path / "patterns.txt"
+    PatternList(["a/{race_id}", "", "  b/{race_id}"]).save(str(path))
+    assert path.read_text(encoding="utf-8") == "a/{race_id}\nb/{race_id}\n"
+    path.write_bytes("\ufeffc/{race_id}\r\nd/{race_id}\r\n".encode("utf-8"))
+    loaded = PatternList()
+    loaded.load(str(path))
+    assert loaded.patterns() == ["c/{race_id}", "d/{race_id}"]
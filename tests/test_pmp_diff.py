@@ -0,0 +1,77 @@
+import json
+import zipfile
+
+from conftest import spec_data
+from pmp_diff import diff_packages, format_diff, has_differences
+from project_spec import load_project_spec
+
+GROUP = {'Name': "G", 'Priority': 0, 'Options': [
+    {'Name': "Off", 'Files': {}, 'FileSwaps': {}},
+    {'Name': "A", 'Files': {'p': "a.tex"}, 'FileSwaps': {}},
+]}
+
+def write_zip(path, entries):
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, data in entries.items():
+            zf.writestr(name, data if isinstance(data, (str, bytes)) else json.dumps(data))
+    return str(path)
+
+def packages(tmp_path, old, new):
+    return write_zip(tmp_path / "old.pmp", old), write_zip(tmp_path / "new.pmp", new)
+
+def test_identical_builds_have_no_differences(project, build):
+    diff = diff_packages(build(project), build(project))
+    assert not has_differences(diff)
+    assert diff['unchanged'] == 6
+
+def test_added_variant_shows_as_added_group(project, make_spec, build):
+    data = spec_data()
+    data['operations'][0]['variant_count'] = 3
+    diff = diff_packages(build(project), build(load_project_spec(make_spec(data, "three.json"))))
+    assert list(diff['added']) == ["group_001_poses03.json"]
+    assert not diff['removed'] and not diff['groups']
+
+def test_group_id_shift_is_paired(tmp_path):
+    edited = json.loads(json.dumps(GROUP))
+    edited['Options'][1]['Files']['q'] = "b.tex"
+    diff = diff_packages(*packages(tmp_path, {'group_001_g.json': GROUP}, {'group_002_g.json': edited}))
+    assert not diff['added'] and not diff['removed']
+    (label, group_diff), = diff['groups'].items()
+    assert label == "group_001_g.json -> group_002_g.json"
+    assert group_diff['options_changed']['A']['Files'] == {'added': {'q': "b.tex"}}
+
+def test_same_bytes_under_new_name_is_a_rename(tmp_path):
+    diff = diff_packages(*packages(tmp_path, {'a/x.tex': b"data", 'keep': b"k"}, {'b/x.tex': b"data", 'keep': b"k"}))
+    assert diff['renamed'] == [["a/x.tex", "b/x.tex"]]
+    assert not diff['added'] and not diff['removed']
+
+def test_many_renames(tmp_path):
+    count = 5000
+    diff = diff_packages(*packages(tmp_path, {f"old/{i}.tex": f"x{i}" for i in range(count)},
+                                   {f"new/{i}.tex": f"x{i}" for i in range(count)}))
+    assert len(diff['renamed']) == count
+    assert not diff['added'] and not diff['removed']
+
+def test_formatting_only_change_is_a_byte_change(tmp_path):
+    diff = diff_packages(*packages(tmp_path, {'meta.json': json.dumps({'Name': "M"})},
+                                   {'meta.json': json.dumps({'Name': "M"}, indent=4)}))
+    assert list(diff['changed']) == ["meta.json"]
+    assert not diff['documents']
+    assert has_differences(diff)
+
+def test_json_assets_are_opaque(tmp_path):
+    diff = diff_packages(*packages(tmp_path, {'files/list.json': "[1, 2]", 'files/bad.json': "nope"},
+                                   {'files/list.json': '"text"', 'files/bad.json': "nope!"}))
+    assert sorted(diff['changed']) == ["files/bad.json", "files/list.json"]
+    assert not diff['documents'] and not diff['groups']
+
+def test_invalid_group_file_is_a_byte_change(tmp_path):
+    diff = diff_packages(*packages(tmp_path, {'group_001_g.json': GROUP}, {'group_001_g.json': "[]"}))
+    assert list(diff['changed']) == ["group_001_g.json"]
+
+def test_document_fields_and_report(tmp_path):
+    diff = diff_packages(*packages(tmp_path, {'default_mod.json': {'Files': {}, 'FileSwaps': {}}},
+                                   {'default_mod.json': {'Files': {'p': "f"}, 'FileSwaps': {}}}))
+    assert diff['documents'] == {'default_mod.json': {'Files': {'added': {'p': "f"}}}}
+    assert format_diff(diff) == ["Entries: 0 added, 0 removed, 0 changed, 0 renamed, 0 unchanged",
+                                 "default_mod.json:", "  Files: +1 -0 ~0", "    + p -> f"]
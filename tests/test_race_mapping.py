@@ -0,0 +1,70 @@
+import pytest
+
+from conftest import POSE_PATTERN, spec_data
+from mod_builder import expand_races, validate_operation
+from penumbra_json import generate_penumbra_json
+from project_spec import load_project_spec
+
+class Var:
+    """Stands in for a Tk variable"""
+
+    def __init__(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+def swaps(group):
+    return {option.name: set(option.file_swaps.keys) for option in group.options[1:]}
+
+def test_mapping_limits_the_swapped_races():
+    source_races = expand_races(["Miqo'te", "Elezen"], True, False)
+    target_races = expand_races(["Viera"], True, True)
+    group, _ = generate_penumbra_json([POSE_PATTERN], "01", "poses", source_races, target_races,
+                                      {'Viera F': ["Elezen M"]})
+    path = POSE_PATTERN.replace("{variant}", "01")
+    assert swaps(group) == {
+        'Viera M': {path.replace("{race_id}", source_races["Miqo'te M"]), path.replace("{race_id}", source_races["Elezen M"])},
+        'Viera F': {path.replace("{race_id}", source_races["Elezen M"])},
+    }
+
+@pytest.fixture
+def redirection(project):
+    _, operations = project
+    return dict(operations[0], source_include_male=True)
+
+@pytest.mark.parametrize("mapping, error", [
+    ({'Viera F': ["Miqo'te F"]}, None),
+    ({'Nobody': ["Miqo'te F"]}, "Race mapping option 'Nobody' is not a selected 'Options' race in operation 1."),
+    ({'Viera F': ["Elezen F"]}, "Race mapping for 'Viera F' uses unselected 'Applied to' races in operation 1: Elezen F."),
+    ({'Viera F': []}, "Race mapping gives 'Viera F' no 'Applied to' races in operation 1."),
+])
+def test_mapping_validation(redirection, mapping, error):
+    assert validate_operation(dict(redirection, race_mapping=mapping), 1) == ([error] if error else [])
+
+def test_spec_mapping_is_loaded(make_spec):
+    data = spec_data()
+    data['operations'][0]['race_mapping'] = {'Viera F': ("Miqo'te F",)}
+    _, operations = load_project_spec(make_spec(data))
+    assert operations[0]['race_mapping'] == {'Viera F': ["Miqo'te F"]}
+    assert load_project_spec(make_spec(spec_data(), "plain.json"))[1][0]['race_mapping'] == {}
+
+def tab(enabled, mapping_vars):
+    return {
+        'race_mapping_enabled': Var(enabled),
+        'source_race_vars': {"Miqo'te": Var(True), 'Elezen': Var(False)},
+        'source_include_male': Var(True), 'source_include_female': Var(True),
+        'target_race_vars': {'Viera': Var(True)},
+        'target_include_male': Var(False), 'target_include_female': Var(True),
+        'race_mapping_vars': mapping_vars,
+    }
+
+def test_snapshot_of_an_unbuilt_grid_maps_everything():
+    gui = pytest.importorskip("gui")
+    assert gui.snapshot_race_mapping(tab(True, {})) == {}
+    assert gui.snapshot_race_mapping(tab(False, {('Viera F', "Miqo'te M"): Var(False)})) == {}
+
+def test_snapshot_lists_unticked_cells():
+    gui = pytest.importorskip("gui")
+    mapping_vars = {('Viera F', "Miqo'te M"): Var(False), ('Viera F', "Miqo'te F"): Var(True)}
+    assert gui.snapshot_race_mapping(tab(True, mapping_vars)) == {'Viera F': ["Miqo'te F"]}
@@ -0,0 +1,34 @@
+import os
+import zipfile
+
+from pmp_archive import ZIP_EPOCH, FILE_MODE, reproducible_date_time
+
+def read_bytes(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+def test_reproducible_builds_are_byte_identical(project, build):
+    first = build(project)
+    second = build(project)
+    assert os.path.basename(first) == "Test_Mod.pmp"
+    assert read_bytes(first) == read_bytes(second)
+
+def test_reproducible_archive_metadata(project, build):
+    with zipfile.ZipFile(build(project)) as zf:
+        infos = zf.infolist()
+    names = [info.filename for info in infos]
+    assert names == sorted(names)
+    assert not [info for info in infos if info.is_dir()]
+    assert {info.date_time for info in infos} == {ZIP_EPOCH}
+    assert {(info.external_attr >> 16) & 0o777 for info in infos} == {FILE_MODE}
+
+def test_source_date_epoch(monkeypatch):
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", "1700000001")
+    assert reproducible_date_time() == (2023, 11, 14, 22, 13, 20)
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", "0")
+    assert reproducible_date_time() == ZIP_EPOCH
+
+def test_source_date_epoch_changes_the_package(project, build, monkeypatch):
+    plain = read_bytes(build(project))
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", "1700000000")
+    assert read_bytes(build(project)) != plain
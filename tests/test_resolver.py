@@ -0,0 +1,71 @@
+import pytest
+
+from conftest import IDLE_PATTERN, POSE_PATTERN
+from mod_builder import expand_races
+from resolver import ModResolver, parse_selection
+
+def pose_path(race_id, variant):
+    return POSE_PATTERN.replace("{race_id}", race_id).replace("{variant}", variant)
+
+def mod_data(groups, default_files=None):
+    return {'meta': {}, 'default_mod': {'Files': default_files or {}, 'FileSwaps': {}},
+            'groups': [(f"group_{i + 1:03}_{group['Name']}.json", group) for i, group in enumerate(groups)],
+            'files': set()}
+
+def single(name, options, priority=0, default=0):
+    return {'Name': name, 'Type': "Single", 'Priority': priority, 'DefaultSettings': default, 'Options': options}
+
+def test_selected_option_swaps_the_source_race(project, build):
+    resolver = ModResolver.from_path(build(project))
+    source_id = expand_races(["Miqo'te"], False, True)["Miqo'te F"]
+    target_id = expand_races(["Elezen"], False, True)["Elezen F"]
+
+    redirections = resolver.resolve({"poses02": "Elezen F"})
+    assert redirections[pose_path(source_id, "02")] == ('swap', pose_path(target_id, "02"))
+    assert resolver.lookup(pose_path(source_id, "01"), {"poses01": "Off"}) is None
+    assert resolver.missing_files() == []
+
+def test_override_files_point_into_the_mod(project, build):
+    resolver = ModResolver.from_path(build(project))
+    midlander = expand_races(["Midlander"], True, False)["Midlander M"]
+    kind, mod_file = resolver.lookup(IDLE_PATTERN.replace("{race_id}", midlander), {"idle": "Option 1"})
+    assert kind == 'file'
+    assert mod_file in resolver.mod_data['files']
+
+def test_higher_priority_group_wins():
+    low = single("low", [{'Name': "A", 'Files': {'p': "low.tex"}}], priority=0)
+    high = single("high", [{'Name': "A", 'Files': {'p': "high.tex"}}], priority=5)
+    resolver = ModResolver(mod_data([low, high], default_files={'p': "default.tex", 'q': "q.tex"}))
+    assert resolver.resolve() == {'p': ('file', "high.tex"), 'q': ('file', "q.tex")}
+
+def test_files_before_swaps_and_multi_priorities():
+    option = {'Name': "A", 'FileSwaps': {'p': "swap"}, 'Files': {'p': "file.tex"}}
+    multi = {'Name': "multi", 'Type': "Multi", 'Priority': 0, 'DefaultSettings': 0b11, 'Options': [
+        {'Name': "first", 'Priority': 0, 'Files': {'m': "first.tex"}},
+        {'Name': "second", 'Priority': 9, 'Files': {'m': "second.tex"}},
+    ]}
+    resolver = ModResolver(mod_data([single("g", [option]), multi]))
+    assert resolver.resolve() == {'p': ('file', "file.tex"), 'm': ('file', "second.tex")}
+    assert resolver.resolve({"multi": ["first"]})['m'] == ('file', "first.tex")
+
+def test_iter_combinations_matches_resolve():
+    groups = [
+        single("a", [{'Name': "Off"}, {'Name': "x", 'Files': {'p': "ax"}}, {'Name': "y", 'Files': {'p': "ay"}}], priority=1),
+        single("b", [{'Name': "Off"}, {'Name': "x", 'Files': {'p': "bx", 'q': "bq"}}]),
+    ]
+    resolver = ModResolver(mod_data(groups))
+    seen = 0
+    for choices, redirections in resolver.iter_combinations():
+        assert redirections == resolver.resolve({i: choice for i, choice in enumerate(choices)})
+        seen += 1
+    assert seen == resolver.combination_count() == 6
+
+def test_unknown_names_and_bad_selections():
+    resolver = ModResolver(mod_data([single("g", [{'Name': "A"}])]))
+    with pytest.raises(KeyError):
+        resolver.resolve({"missing": "A"})
+    with pytest.raises(KeyError):
+        resolver.resolve({"g": "B"})
+    assert parse_selection(["g=A", "h=B=C"]) == {'g': "A", 'h': "B=C"}
+    with pytest.raises(ValueError):
+        parse_selection(["g"])
@@ -0,0 +1,36 @@
+import scheduler
+from conflicts import TargetIndex
+from scheduler import estimated_mappings, process_operations_parallel, split_tasks
+
+def read_bytes(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+def test_tasks_split_redirections_by_variant(project):
+    _, operations = project
+    tasks = split_tasks(operations)
+    assert [(op['group_name'], variants) for op, variants in tasks] == [("poses", [1]), ("poses", [2]), ("idle", None)]
+
+def test_estimate_is_an_upper_bound(project):
+    _, operations = project
+    # 1 pattern x 1 source race x 18 target races x 2 variants, plus 1 file x 18 races
+    assert estimated_mappings(operations) == 36 + 18
+
+def test_parallel_build_matches_serial(project, build, monkeypatch):
+    serial = read_bytes(build(project, jobs=1))
+    monkeypatch.setattr(scheduler, "PARALLEL_MIN_MAPPINGS", 0)
+    assert read_bytes(build(project, jobs=2)) == serial
+
+def test_parallel_conflicts_match_serial(project, tmp_path, monkeypatch):
+    _, operations = project
+    operations = operations + [dict(operations[0], group_name="copy")]
+    results = []
+    for threshold, jobs in ((10**12, 1), (0, 2)):
+        monkeypatch.setattr(scheduler, "PARALLEL_MIN_MAPPINGS", threshold)
+        stage = tmp_path / f"stage{jobs}"
+        stage.mkdir()
+        index = TargetIndex()
+        files = process_operations_parallel(operations, str(stage), True, index, jobs)
+        results.append(([file_info['group_name'] for file_info in files], index.conflicts))
+    assert results[0] == results[1]
+    assert results[0][1]
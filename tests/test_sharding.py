@@ -0,0 +1,100 @@
+import os
+import random
+import zipfile
+
+import pytest
+
+import scheduler
+from build_manifest import manifest_path
+from conftest import IDLE_PATTERN, spec_data
+from project_spec import load_project_spec
+from sharding import build_sharded, deflate_bound, deflated_size, pack_volumes, stale_parts
+
+ASSET_BYTES = 20000
+MAX_BYTES = 50000
+
+@pytest.fixture
+def big_project(make_spec):
+    """Four override operations with an incompressible 20 KB asset each"""
+    data = spec_data("Big Mod")
+    data['operations'] = []
+    rng = random.Random(0)
+    spec_path = make_spec(data)
+    for n in range(4):
+        with open(os.path.join(os.path.dirname(spec_path), f"asset{n}.pap"), "wb") as f:
+            f.write(rng.randbytes(ASSET_BYTES))
+        data['operations'].append({'type': "file_override", 'group_name': f"big{n}", 'options': [
+            {'option_name': "On", 'files': [{'local_file': f"asset{n}.pap",
+                                             'target_pattern': IDLE_PATTERN.replace("idle", f"idle{n}")}]}]})
+    return load_project_spec(make_spec(data))
+
+def sharded(project, tmp_path, max_bytes=MAX_BYTES, **kwargs):
+    out_dir = tmp_path / "volumes"
+    out_dir.mkdir(parents=True, exist_ok=True)
+    kwargs.setdefault('reproducible', True)
+    return build_sharded(*project, str(out_dir), max_bytes, **kwargs)
+
+def test_pack_volumes():
+    assert pack_volumes([60, 50, 40, 30, 20], 100) == [[0, 2], [1, 3, 4]]
+    assert pack_volumes([150, 10], 100) == [[0], [1]]
+    assert pack_volumes([], 100) == []
+
+def test_deflated_size_matches_zipfile(tmp_path):
+    path = tmp_path / "data.json"
+    path.write_bytes(b'{"key": "value"}\n' * 100000)
+    archive = tmp_path / "a.zip"
+    with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.write(path, "data.json")
+    with zipfile.ZipFile(archive) as zf:
+        assert deflated_size(str(path)) == zf.getinfo("data.json").compress_size
+    assert deflate_bound(len(path.read_bytes())) > deflated_size(str(path))
+
+def test_volumes_stay_under_the_cap(big_project, tmp_path):
+    paths = sharded(big_project, tmp_path)
+    assert [os.path.basename(path) for path in paths] == ["Big_Mod_part01.pmp", "Big_Mod_part02.pmp"]
+    assert all(os.path.getsize(path) <= MAX_BYTES for path in paths)
+    groups = []
+    for part, path in enumerate(paths, 1):
+        with zipfile.ZipFile(path) as zf:
+            assert f"(part {part} of 2)" in zf.read("meta.json").decode("utf-8")
+            names = sorted(name for name in zf.namelist() if name.startswith("group_"))
+        # Group IDs start from 001 in every volume
+        assert names[0].startswith("group_001_")
+        groups.extend(names)
+        assert os.path.exists(manifest_path(path))
+    assert len(groups) == 4
+
+def test_oversized_operation_is_an_error(big_project, tmp_path):
+    messages = []
+    assert sharded(big_project, tmp_path, max_bytes=15000, log=messages.append) is None
+    assert os.listdir(tmp_path / "volumes") == []
+    assert len(messages) == 4 and all(message.startswith("Error: operation") for message in messages)
+
+def test_oversized_operation_can_be_allowed(big_project, tmp_path):
+    messages = []
+    paths = sharded(big_project, tmp_path, max_bytes=15000, log=messages.append, allow_oversized=True)
+    assert len(paths) == 4
+    assert all(message.startswith("Warning: operation") for message in messages)
+
+def test_stale_parts_are_removed(big_project, tmp_path):
+    old = sharded(big_project, tmp_path, max_bytes=15000, allow_oversized=True)
+    (tmp_path / "volumes" / "Big_Mod_part1x.pmp").write_bytes(b"not a part")
+    messages = []
+    new = sharded(big_project, tmp_path, log=messages.append)
+    assert len(new) == 2
+    for path in old[2:]:
+        assert not os.path.exists(path) and not os.path.exists(manifest_path(path))
+    assert len(messages) == 2
+    assert sorted(os.listdir(tmp_path / "volumes")) == sorted(
+        ["Big_Mod_part1x.pmp"] + [os.path.basename(p) for p in new] + [os.path.basename(manifest_path(p)) for p in new])
+
+def test_stale_parts(tmp_path):
+    for name in ("M_part01.pmp", "M_part02.pmp", "M_part03.pmp", "M_partXX.pmp", "Other_part04.pmp"):
+        (tmp_path / name).write_bytes(b"")
+    assert stale_parts(str(tmp_path), "M", 1) == [str(tmp_path / "M_part02.pmp"), str(tmp_path / "M_part03.pmp")]
+
+def test_parallel_staging_matches_serial(big_project, tmp_path, monkeypatch):
+    serial = [open(path, "rb").read() for path in sharded(big_project, tmp_path / "serial", jobs=1)]
+    monkeypatch.setattr(scheduler, "PARALLEL_MIN_MAPPINGS", 0)
+    parallel = [open(path, "rb").read() for path in sharded(big_project, tmp_path / "parallel", jobs=2)]
+    assert parallel == serial
@@ -0,0 +1,46 @@
+import io
+import os
+import subprocess
+import sys
+import zipfile
+
+from conftest import ROOT
+
+class PipeLike(io.RawIOBase):
+    """A write-only, non-seekable binary stream, like stdout connected to a pipe"""
+
+    def __init__(self):
+        self.data = bytearray()
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self.data += b
+        return len(b)
+
+def entries(data):
+    with zipfile.ZipFile(io.BytesIO(data)) as zf:
+        assert zf.testzip() is None
+        return {name: zf.read(name) for name in zf.namelist()}
+
+def test_stream_matches_file_build(project, build):
+    from mod_builder import build_mod
+
+    stream = PipeLike()
+    assert build_mod(*project, None, reproducible=True, stream=stream) is stream
+    with open(build(project), "rb") as f:
+        assert entries(bytes(stream.data)) == entries(f.read())
+
+def test_output_to_stdout(spec_path, project, build):
+    result = subprocess.run([sys.executable, os.path.join(ROOT, "main.py"), "build", spec_path, "--output", "-",
+                             "--reproducible"], stdout=subprocess.PIPE, check=True)
+    with open(build(project), "rb") as f:
+        assert entries(result.stdout) == entries(f.read())
+
+def test_output_file_writes_no_manifest(spec_path, tmp_path):
+    target = tmp_path / "direct.pmp"
+    subprocess.run([sys.executable, os.path.join(ROOT, "main.py"), "build", spec_path, "--output", str(target),
+                    "--reproducible", "--verify"], stdout=subprocess.DEVNULL, check=True)
+    assert sorted(os.listdir(tmp_path)) == ["direct.pmp", "project"]
+    assert "meta.json" in entries(target.read_bytes())
@@ -0,0 +1,47 @@
+import os
+
+from conftest import spec_data
+from project_spec import load_project_spec
+from unpacked_export import EXPORT_MANIFEST, export_unpacked
+
+ASSET = "option_1/chara/human/race/animation/a0001/bt_common/resident/idle.pap"
+
+def listing(target):
+    return sorted(os.path.relpath(os.path.join(root, name), target).replace(os.sep, "/")
+                  for root, _, names in os.walk(target) for name in names)
+
+def test_export_layout_and_rerun(project, tmp_path):
+    target = tmp_path / "mod"
+    stats = export_unpacked(*project, str(target), reproducible=True)
+    assert listing(target) == sorted([EXPORT_MANIFEST, "meta.json", "default_mod.json", "group_001_poses01.json",
+                                      "group_001_poses02.json", "group_002_idle.json", ASSET])
+    assert stats['written'] == 6 and stats['deleted'] == 0
+    again = export_unpacked(*project, str(target), reproducible=True)
+    assert again == {'unchanged': 6, 'written': 0, 'deleted': 0, 'linked': 0}
+
+def test_assets_are_not_hard_linked_by_default(project, tmp_path):
+    target = tmp_path / "mod"
+    export_unpacked(*project, str(target), link_assets=False)
+    asset = project[1][1]['options'][0]['files'][0]['local_file']
+    assert not os.path.samefile(asset, target / ASSET)
+    (target / ASSET).write_bytes(b"edited in place")
+    assert open(asset, "rb").read().startswith(b"idle animation")
+
+def test_hardlink_assets_share_the_source(project, tmp_path):
+    target = tmp_path / "mod"
+    stats = export_unpacked(*project, str(target), link_assets=False, hardlink_assets=True)
+    asset = project[1][1]['options'][0]['files'][0]['local_file']
+    assert os.path.samefile(asset, target / ASSET)
+    assert stats['linked'] == 1
+
+def test_stale_files_are_removed_and_user_files_kept(project, make_spec, tmp_path):
+    target = tmp_path / "mod"
+    export_unpacked(*project, str(target))
+    (target / "notes.txt").write_text("mine")
+    (target / "group_009_stray.json").write_text("{}")
+    data = spec_data()
+    del data['operations'][1]
+    stats = export_unpacked(*load_project_spec(make_spec(data, "poses.json")), str(target))
+    assert stats['deleted'] == 3  # group_002_idle.json, the idle asset and the stray group
+    assert listing(target) == sorted([EXPORT_MANIFEST, "meta.json", "default_mod.json", "group_001_poses01.json",
+                                      "group_001_poses02.json", "notes.txt"])
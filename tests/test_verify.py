@@ -0,0 +1,60 @@
+import json
+import zipfile
+
+from verify import check_group, verify_package
+
+def rewrite(src, dst, change):
+    """Copy a package entry by entry, letting change(name, data) edit or drop (None) each one"""
+    with zipfile.ZipFile(src) as zin, zipfile.ZipFile(dst, "w", zipfile.ZIP_STORED) as zout:
+        for info in zin.infolist():
+            data = change(info.filename, zin.read(info.filename))
+            if data is not None:
+                zout.writestr(info.filename, data)
+    return str(dst)
+
+def test_built_package_is_sound(project, build):
+    assert verify_package(build(project)) == []
+
+def test_crc_mismatch_is_reported(project, build, tmp_path):
+    stored = rewrite(build(project), tmp_path / "stored.pmp", lambda name, data: data)
+    with open(stored, "rb") as f:
+        raw = f.read()
+    marker = b"idle animation"
+    assert raw.count(marker) >= 1
+    with open(stored, "wb") as f:
+        f.write(raw.replace(marker, b"IDLE animation", 1))
+    problems = verify_package(stored)
+    assert len(problems) == 1
+    assert problems[0].startswith("option_1/")
+
+def test_missing_asset_is_reported(project, build, tmp_path):
+    broken = rewrite(build(project), tmp_path / "broken.pmp",
+                     lambda name, data: None if name.startswith("option_1/") else data)
+    (problem,) = verify_package(broken)
+    assert "Files points at missing entry" in problem and "(18 game paths)" in problem
+
+def test_malformed_group_is_reported(project, build, tmp_path):
+    def drop_type(name, data):
+        if name == "group_002_idle.json":
+            group = json.loads(data)
+            del group['Type']
+            return json.dumps(group)
+        return data
+
+    problems = verify_package(rewrite(build(project), tmp_path / "typeless.pmp", drop_type))
+    assert problems == ['group_002_idle.json: missing "Type"']
+
+def test_group_checks():
+    group = {'Version': 0, 'Name': "g", 'Description': "", 'Image': "", 'Page': 0, 'Priority': 0,
+             'Type': "Single", 'DefaultSettings': 3, 'Options': []}
+    assert check_group(group, "g", set()) == []
+    group['Options'] = [{'Name': "Off", 'Description': "", 'Priority': True, 'Files': {}, 'FileSwaps': {},
+                         'Manipulations': []}]
+    assert check_group(group, "g", set()) == ["g: DefaultSettings 3 is not an option index",
+                                              'g option 1: "Priority" should be int']
+
+def test_not_a_zip(tmp_path):
+    path = tmp_path / "junk.pmp"
+    path.write_bytes(b"junk")
+    (problem,) = verify_package(str(path))
+    assert "cannot open package" in problem
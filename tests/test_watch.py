@@ -0,0 +1,82 @@
+import json
+import os
+
+from project_spec import load_project_spec
+from watch import ModWatcher, stat_signatures
+
+def bump(path, data=None):
+    """Rewrite a file (optionally with new contents) and move its mtime forward"""
+    if data is not None:
+        with open(path, "wb") as f:
+            f.write(data)
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+def make_watcher(spec_path, out_dir, **kwargs):
+    out_dir.mkdir(exist_ok=True)
+    messages = []
+    watcher = ModWatcher(lambda: load_project_spec(spec_path), str(out_dir), spec_path=spec_path,
+                         reproducible=True, debounce=0, log=messages.append, **kwargs)
+    return watcher, messages
+
+def test_first_poll_builds_everything_then_nothing(spec_path, tmp_path):
+    watcher, _ = make_watcher(spec_path, tmp_path / "out")
+    try:
+        assert watcher.poll()
+        assert watcher.last_result['rebuilt'] == watcher.last_result['total'] == 2
+        assert not watcher.poll()
+    finally:
+        watcher.close()
+
+def test_asset_change_rebuilds_only_its_operation(spec_path, tmp_path):
+    watcher, _ = make_watcher(spec_path, tmp_path / "out")
+    try:
+        watcher.poll()
+        bump(os.path.join(os.path.dirname(spec_path), "idle.pap"), b"a different idle animation")
+        assert watcher.poll()
+        assert (watcher.last_result['rebuilt'], watcher.last_result['total']) == (1, 2)
+    finally:
+        watcher.close()
+
+def test_spec_edit_rebuilds_changed_operation(spec_path, tmp_path):
+    watcher, _ = make_watcher(spec_path, tmp_path / "out")
+    try:
+        watcher.poll()
+        with open(spec_path, encoding="utf-8") as f:
+            spec = json.load(f)
+        spec['operations'][0]['variant_count'] = 3
+        bump(spec_path, json.dumps(spec).encode("utf-8"))
+        assert watcher.poll()
+        assert (watcher.last_result['rebuilt'], watcher.last_result['total']) == (1, 2)
+    finally:
+        watcher.close()
+
+def test_incremental_package_matches_a_full_build(spec_path, project, build, tmp_path):
+    watcher, _ = make_watcher(spec_path, tmp_path / "out")
+    try:
+        watcher.poll()
+        bump(os.path.join(os.path.dirname(spec_path), "idle.pap"), b"edited")
+        watcher.poll()
+        with open(watcher.last_result['target'], "rb") as f:
+            incremental = f.read()
+    finally:
+        watcher.close()
+    with open(build(project), "rb") as f:
+        assert incremental == f.read()
+
+def test_invalid_project_is_reported_not_built(make_spec, tmp_path):
+    spec_path = make_spec({'name': "", 'operations': []})
+    watcher, messages = make_watcher(spec_path, tmp_path / "out")
+    try:
+        assert not watcher.poll()
+        assert watcher.last_result is None
+        assert any(message.startswith("Error:") for message in messages)
+    finally:
+        watcher.close()
+
+def test_stat_signatures_marks_missing_files(tmp_path):
+    present = tmp_path / "a"
+    present.write_bytes(b"abc")
+    signatures = stat_signatures([str(present), str(tmp_path / "missing")])
+    assert signatures[str(present)][1] == 3
+    assert signatures[str(tmp_path / "missing")] is None
@@ -0,0 +1,170 @@
+import os
+from mod_builder import stage_mod, add_group_ids_to_files, operation_assets
+
+# Export a mod straight into an unpacked Penumbra mod folder.
+#
+# meta.json, default_mod.json and the group files are generated into a
+# temporary directory; assets are taken directly from their local files. The
+# result is then synced into the target folder with as few writes as possible:
+# a file is left alone when it is the same inode as its source, or has the
+# same size and mtime, or the same bytes. Assets that do need writing are
+# reflinked (copy-on-write clone) where the file system allows and copied
+# otherwise. Hard links are opt-in: they share the file with the source asset,
+# so anything editing the exported file in place (Penumbra's file editing, for
+# one) would change the user's original too. Every write goes to a temporary name first and is
+# renamed into place, so Penumbra never sees a half-written file.
+#
+# Files this tool exported before but no longer produces are deleted. The
+# list of exported files is kept in EXPORT_MANIFEST inside the folder, so
+# files the user put there themselves are never touched, except for stray
+# group_*.json files, which Penumbra would otherwise load as groups.
+
+EXPORT_MANIFEST = ".penumbra_path_mapper_export.json"
+COMPARE_CHUNK_SIZE = 1024 * 1024
+FICLONE = 0x40049409  # Linux ioctl, see ioctl_ficlone(2)
+
+def same_contents(path_a, path_b):
+    """Compare two files of equal size byte by byte, stopping at the first difference"""
+    with open(path_a, "rb") as a, open(path_b, "rb") as b:
+        while True:
+            chunk = a.read(COMPARE_CHUNK_SIZE)
+            if chunk != b.read(COMPARE_CHUNK_SIZE):
+                return False
+            if not chunk:
+                return True
+
+def is_unchanged(src, dst):
+    """True when dst already holds src's contents; checks the cheap signals first"""
+    try:
+        dst_stat = os.stat(dst)
+    except OSError:
+        return False
+    src_stat = os.stat(src)
+    if (src_stat.st_dev, src_stat.st_ino) == (dst_stat.st_dev, dst_stat.st_ino):
+        return True
+    if src_stat.st_size != dst_stat.st_size:
+        return False
+    if src_stat.st_mtime_ns == dst_stat.st_mtime_ns:
+        return True
+    return same_contents(src, dst)
+
+def clone_file(src, dst):
+    """Reflink src to dst on file systems that support it (Btrfs, XFS, ...); returns True on success"""
+    try:
+        import fcntl
+    except ImportError:
+        return False
+    try:
+        with open(src, "rb") as s, open(dst, "wb") as d:
+            fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+    except OSError:
+        try:
+            os.remove(dst)
+        except OSError:
+            pass
+        return False
+    return True
+
+def place_file(src, dst, link, hardlink=False):
+    """Put a copy of src at dst via a temporary name; returns "reflink", "hardlink" or "copy"
+
+    link allows a reflink, hardlink (as a fallback after it) a hard link.
+    """
+    import shutil
+
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    tmp = dst + ".tmp"
+    if os.path.lexists(tmp):
+        os.remove(tmp)
+    method = "copy"
+    if link and clone_file(src, tmp):
+        shutil.copystat(src, tmp)
+        method = "reflink"
+    elif hardlink:
+        try:
+            os.link(src, tmp)
+            method = "hardlink"
+        except OSError:
+            pass
+    if method == "copy":
+        shutil.copy2(src, tmp)
+    os.replace(tmp, dst)
+    return method
+
+def load_manifest(target_dir):
+    import json
+
+    try:
+        with open(os.path.join(target_dir, EXPORT_MANIFEST), "r", encoding="utf-8") as f:
+            return set(json.load(f).get('files', []))
+    except (OSError, ValueError):
+        return set()
+
+def save_manifest(target_dir, files):
+    import json
+
+    path = os.path.join(target_dir, EXPORT_MANIFEST)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump({'files': sorted(files)}, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+def sync_tree(plan, target_dir, link_assets=True, generated=(), hardlink_assets=False):
+    """Make target_dir hold exactly the files in plan ({relative path: source path})
+
+    Paths listed in generated are always copied; other sources may be
+    reflinked (link_assets) or hard linked (hardlink_assets).
+    Returns stats counting unchanged, written, deleted and linked files.
+    """
+    from watch import remove_staged_file
+
+    os.makedirs(target_dir, exist_ok=True)
+    generated = set(generated)
+    stats = {'unchanged': 0, 'written': 0, 'deleted': 0, 'linked': 0}
+
+    for rel_path, src in sorted(plan.items()):
+        dst = os.path.join(target_dir, rel_path)
+        if is_unchanged(src, dst):
+            stats['unchanged'] += 1
+            continue
+        asset = rel_path not in generated
+        method = place_file(src, dst, link_assets and asset, hardlink_assets and asset)
+        stats['written'] += 1
+        if method != "copy":
+            stats['linked'] += 1
+
+    stale = load_manifest(target_dir)
+    stale.update(name for name in os.listdir(target_dir) if name.startswith("group_") and name.endswith(".json"))
+    for rel_path in sorted(stale - set(plan)):
+        if os.path.isfile(os.path.join(target_dir, rel_path)):
+            remove_staged_file(target_dir, rel_path)
+            stats['deleted'] += 1
+
+    save_manifest(target_dir, plan)
+    return stats
+
+def export_unpacked(mod_info, operations, target_dir, reproducible=False, on_conflict=None, link_assets=True,
+                    hardlink_assets=False):
+    """Generate the mod and sync it into target_dir, returning sync_tree's stats
+
+    link_assets and hardlink_assets are passed on to sync_tree.
+    on_conflict works like in build_mod; when it returns False nothing is
+    written and None is returned.
+    """
+    import tempfile
+    from conflicts import TargetIndex
+
+    index = TargetIndex() if on_conflict is not None else None
+    with tempfile.TemporaryDirectory() as temp_dir:
+        generated_files = stage_mod(mod_info, operations, temp_dir, reproducible, index, copy_assets=False)
+        if index is not None and index.conflicts and not on_conflict(index.conflicts):
+            return None
+        add_group_ids_to_files(temp_dir, generated_files)
+
+        # Later operations win for the same mod path, like copies into one directory do
+        plan = {name: os.path.join(temp_dir, name) for name in os.listdir(temp_dir)}
+        generated = set(plan)
+        for op in operations:
+            for local_file, mod_path in operation_assets(op):
+                if os.path.isfile(local_file):
+                    plan[os.path.normpath(mod_path)] = local_file
+        return sync_tree(plan, target_dir, link_assets, generated, hardlink_assets)
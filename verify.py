@@ -0,0 +1,145 @@
+from pmp_archive import is_group_file
+
+# Post-build verification of a .pmp package.
+#
+# Every entry is decompressed and CRC-checked (zipfile checks the CRC-32 when a
+# member is read to the end) on a thread pool; zlib and crc32 release the GIL,
+# and each thread keeps its own ZipFile handle so reads don't serialise on one
+# file object. Entries are streamed in fixed-size chunks, so memory is bounded
+# by the worker count, not the package size. JSON entries are then checked
+# against the structure the generators produce, and every "Files" value must
+# name an entry that exists in the archive.
+
+CHUNK_SIZE = 1024 * 1024
+
+GROUP_FIELDS = {
+    "Version": int, "Name": str, "Description": str, "Image": str, "Page": int,
+    "Priority": int, "Type": str, "DefaultSettings": int, "Options": list,
+}
+OPTION_FIELDS = {
+    "Name": str, "Description": str, "Priority": int, "Files": dict, "FileSwaps": dict, "Manipulations": list,
+}
+META_FIELDS = {
+    "FileVersion": int, "Name": str, "Author": str, "Description": str, "Version": str, "Website": str, "ModTags": list,
+}
+DEFAULT_MOD_FIELDS = {
+    "Files": dict, "FileSwaps": dict, "Manipulations": list,
+}
+
+def check_fields(obj, fields, where):
+    """Return problems for missing or mistyped fields of a JSON object"""
+    if not isinstance(obj, dict):
+        return [f"{where}: expected an object"]
+    problems = []
+    for key, expected in fields.items():
+        if key not in obj:
+            problems.append(f"{where}: missing \"{key}\"")
+        elif not isinstance(obj[key], expected) or (expected is int and isinstance(obj[key], bool)):
+            problems.append(f"{where}: \"{key}\" should be {expected.__name__}")
+    return problems
+
+def check_path_map(mapping, where):
+    if not all(isinstance(key, str) and isinstance(value, str) for key, value in mapping.items()):
+        return [f"{where}: keys and values must be strings"]
+    return []
+
+def check_maps(obj, where, entries):
+    """Check Files/FileSwaps of an option or default_mod.json, including that Files targets exist"""
+    problems = check_path_map(obj['Files'], f"{where} Files") + check_path_map(obj['FileSwaps'], f"{where} FileSwaps")
+    missing = {}
+    for game_path, mod_file in obj['Files'].items():
+        if isinstance(mod_file, str) and mod_file.replace("\\", "/").lower() not in entries:
+            missing[mod_file] = missing.get(mod_file, 0) + 1
+    for mod_file, count in missing.items():
+        problems.append(f"{where}: Files points at missing entry {mod_file!r} ({count} game paths)")
+    return problems
+
+def check_option(option, where, entries):
+    problems = check_fields(option, OPTION_FIELDS, where)
+    if problems:
+        return problems
+    return check_maps(option, where, entries)
+
+def check_group(group, name, entries):
+    """Validate a group JSON the way generate_penumbra_json/generate_file_override_json build it"""
+    problems = check_fields(group, GROUP_FIELDS, name)
+    if problems:
+        return problems
+    if group['Type'] not in ("Single", "Multi"):
+        problems.append(f"{name}: unknown Type {group['Type']!r}")
+    if group['Type'] == "Single" and group['Options'] and not 0 <= group['DefaultSettings'] < len(group['Options']):
+        problems.append(f"{name}: DefaultSettings {group['DefaultSettings']} is not an option index")
+    for i, option in enumerate(group['Options']):
+        problems.extend(check_option(option, f"{name} option {i + 1}", entries))
+    return problems
+
+def check_entry(handles, opened, path, name):
+    """Stream one entry to the end so zipfile verifies its CRC; returns a problem or None"""
+    import zipfile
+    import zlib
+
+    zf = getattr(handles, 'zf', None)
+    if zf is None:
+        zf = handles.zf = zipfile.ZipFile(path)
+        opened.append(zf)
+    try:
+        with zf.open(name) as f:
+            while f.read(CHUNK_SIZE):
+                pass
+    except (zipfile.BadZipFile, zlib.error, EOFError, OSError) as e:
+        return f"{name}: {e}"
+    return None
+
+def verify_package(pmp_path, jobs=None):
+    """Return a list of problems found in a .pmp package (empty when it is sound)"""
+    import json
+    import threading
+    import zipfile
+    from concurrent.futures import ThreadPoolExecutor
+
+    try:
+        zf = zipfile.ZipFile(pmp_path)
+    except (zipfile.BadZipFile, OSError) as e:
+        return [f"{pmp_path}: cannot open package: {e}"]
+
+    problems = []
+    with zf:
+        names = [info.filename for info in zf.infolist() if not info.is_dir()]
+        entries = {name.lower() for name in names}
+
+        # Integrity: CRC of every entry, in parallel with one ZipFile handle per thread
+        handles = threading.local()
+        opened = []
+        try:
+            with ThreadPoolExecutor(max_workers=jobs) as pool:
+                for problem in pool.map(lambda name: check_entry(handles, opened, pmp_path, name), names):
+                    if problem:
+                        problems.append(problem)
+        finally:
+            for handle in opened:
+                handle.close()
+        if problems:
+            return problems
+
+        # Structure: meta.json, default_mod.json and every group
+        for required in ("meta.json", "default_mod.json"):
+            if required not in names:
+                problems.append(f"missing {required}")
+        for name in names:
+            if name not in ("meta.json", "default_mod.json") and not is_group_file(name):
+                continue
+            try:
+                with zf.open(name) as f:
+                    document = json.load(f)
+            except ValueError as e:
+                problems.append(f"{name}: invalid JSON: {e}")
+                continue
+            if name == "meta.json":
+                problems.extend(check_fields(document, META_FIELDS, name))
+            elif name == "default_mod.json":
+                field_problems = check_fields(document, DEFAULT_MOD_FIELDS, name)
+                problems.extend(field_problems or check_maps(document, name, entries))
+            else:
+                problems.extend(check_group(document, name, entries))
+
+    return problems
@@ -0,0 +1,245 @@
+import os
+import time
+from mod_builder import (validate_project, process_operation, operation_assets, assign_group_ids,
+                         group_file_name, clean_mod_name_for_filename, write_json)
+from penumbra_json import generate_meta_json, generate_default_mod_json
+
+# Watch mode: poll the project and every referenced asset, and when something
+# changes rebuild only the operations whose inputs changed.
+#
+# Each operation is keyed by its snapshot, its assigned group ID and the stat
+# signature of its assets. Operations whose key is unchanged keep their files
+# in the staging directory; everything else is removed and regenerated, then
+# the staging directory is repackaged (or, in unpacked mode, *is* the output).
+
+# Directories holding at least this many watched files are listed with one
+# os.scandir call instead of one os.stat per file. On Windows the directory
+# listing already carries the stat data, so this is much cheaper there.
+SCANDIR_MIN_FILES = 8
+
+def stat_signatures(paths):
+    """Return {path: (mtime_ns, size)} for the given files, None for missing ones"""
+    by_dir = {}
+    for path in paths:
+        by_dir.setdefault(os.path.dirname(path) or ".", {})[os.path.basename(path)] = path
+
+    signatures = dict.fromkeys(paths)
+    for directory, names in by_dir.items():
+        if len(names) >= SCANDIR_MIN_FILES:
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        path = names.get(entry.name)
+                        if path is not None:
+                            st = entry.stat()
+                            signatures[path] = (st.st_mtime_ns, st.st_size)
+            except OSError:
+                pass
+            continue
+        for path in names.values():
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            signatures[path] = (st.st_mtime_ns, st.st_size)
+    return signatures
+
+def remove_staged_file(stage_dir, rel_path):
+    """Delete a staged file and any directories it leaves empty"""
+    path = os.path.join(stage_dir, rel_path)
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        return
+    parent = os.path.dirname(path)
+    while os.path.normcase(parent) != os.path.normcase(stage_dir):
+        try:
+            os.rmdir(parent)
+        except OSError:
+            break
+        parent = os.path.dirname(parent)
+
+class ModWatcher:
+    """Incrementally rebuild a mod whenever its inputs change
+
+    load_project returns (mod_info, operations). When spec_path is given the
+    project is only reloaded after that file's stat changes; otherwise (the
+    GUI) load_project is called on every poll and compared with the last one.
+    With unpacked_dir the mod is kept unpacked in that folder and no .pmp is
+    written. Like build_mod, each package gets a manifest unless manifest is
+    False.
+    """
+
+    def __init__(self, load_project, out_dir, spec_path=None, unpacked_dir=None,
+                 reproducible=False, debounce=0.5, log=print, manifest=True):
+        import tempfile
+
+        self.load_project = load_project
+        self.out_dir = out_dir
+        self.spec_path = spec_path
+        self.unpacked_dir = unpacked_dir
+        self.reproducible = reproducible
+        self.debounce = debounce
+        self.log = log
+        self.manifest = manifest
+
+        if unpacked_dir:
+            self.stage_dir = os.path.abspath(unpacked_dir)
+            os.makedirs(self.stage_dir, exist_ok=True)
+            # Group files left by an earlier session would be packaged twice
+            for name in os.listdir(self.stage_dir):
+                if name.startswith("group_") and name.endswith(".json"):
+                    os.remove(os.path.join(self.stage_dir, name))
+        else:
+            self.stage_dir = tempfile.mkdtemp(prefix="penumbra_watch_")
+
+        self.project = None
+        self.spec_signature = None
+        self.asset_signatures = {}
+        self.built = {}  # operation key -> {'files': [...], 'infos': [...], 'assets': [...]}
+        self.dirty = False
+        self.last_change = 0.0
+        self.last_result = None  # {'rebuilt', 'total', 'target', 'elapsed'} of the last successful rebuild
+
+    def close(self):
+        """Remove the private staging directory"""
+        import shutil
+
+        if not self.unpacked_dir:
+            shutil.rmtree(self.stage_dir, ignore_errors=True)
+
+    def watched_assets(self):
+        if self.project is None:
+            return []
+        return sorted({local_file for op in self.project[1] for local_file, _ in operation_assets(op)})
+
+    def operation_key(self, op, group_id_str):
+        import json
+
+        signatures = [self.asset_signatures.get(local_file) for local_file, _ in operation_assets(op)]
+        return json.dumps([op, group_id_str, signatures], sort_keys=True)
+
+    def poll(self):
+        """Check inputs once and rebuild if they settled after a change. Returns True after a rebuild."""
+        changed = False
+        if self.spec_path:
+            signature = stat_signatures([self.spec_path])[self.spec_path]
+            if signature != self.spec_signature:
+                self.spec_signature = signature
+                try:
+                    self.project = self.load_project()
+                except (OSError, ValueError) as e:
+                    self.log(f"Error: could not load {self.spec_path}: {e}")
+                    self.project = None
+                changed = True
+        else:
+            project = self.load_project()
+            if project != self.project:
+                self.project = project
+                changed = True
+
+        signatures = stat_signatures(self.watched_assets())
+        if signatures != self.asset_signatures:
+            self.asset_signatures = signatures
+            changed = True
+
+        now = time.monotonic()
+        if changed:
+            self.dirty = True
+            self.last_change = now
+
+        # Debounce: wait for a burst of saves to settle before rebuilding
+        if self.dirty and self.project is not None and now - self.last_change >= self.debounce:
+            self.dirty = False
+            return self.rebuild()
+        return False
+
+    def build_operation(self, op, group_id_str):
+        """Generate one operation in a scratch directory and move its outputs into the stage"""
+        import shutil
+        import tempfile
+
+        with tempfile.TemporaryDirectory() as scratch:
+            files = []
+            infos = []  # Generated file infos as build_mod returns them, for the manifest
+            for file_info in process_operation(op, scratch, self.reproducible):
+                name = group_file_name(os.path.basename(file_info['file_path']), group_id_str)
+                shutil.move(file_info['file_path'], os.path.join(self.stage_dir, name))
+                files.append(name)
+                infos.append({**file_info, 'file_path': os.path.join(self.stage_dir, name), 'group_id': group_id_str})
+
+            assets = []
+            for _, mod_path in operation_assets(op):
+                src = os.path.join(scratch, mod_path)
+                if not os.path.exists(src):
+                    continue  # Copy failed, same as a full build
+                dst = os.path.join(self.stage_dir, mod_path)
+                os.makedirs(os.path.dirname(dst), exist_ok=True)
+                shutil.move(src, dst)
+                assets.append(mod_path)
+
+        return {'files': files, 'infos': infos, 'assets': assets}
+
+    def rebuild(self):
+        """Bring the staging directory up to date and repackage it"""
+        from pmp_archive import write_pmp
+
+        mod_info, operations = self.project
+        errors = validate_project(mod_info, operations)
+        if errors:
+            for error in errors:
+                self.log(f"Error: {error}")
+            self.last_result = None
+            return False
+
+        started = time.perf_counter()
+        group_ids = assign_group_ids(op['group_name'] for op in operations)
+        wanted = {}
+        for op in operations:
+            wanted[self.operation_key(op, group_ids[op['group_name']])] = op
+
+        # Drop outputs of operations that changed, keeping assets a kept operation still uses
+        kept_assets = {mod_path for key, out in self.built.items() if key in wanted for mod_path in out['assets']}
+        for key in [key for key in self.built if key not in wanted]:
+            out = self.built.pop(key)
+            for name in out['files']:
+                remove_staged_file(self.stage_dir, name)
+            for mod_path in out['assets']:
+                if mod_path not in kept_assets:
+                    remove_staged_file(self.stage_dir, mod_path)
+
+        fresh = [key for key in wanted if key not in self.built]
+        for key in fresh:
+            op = wanted[key]
+            self.built[key] = self.build_operation(op, group_ids[op['group_name']])
+
+        meta = generate_meta_json(mod_info['name'], mod_info['author'], mod_info['description'],
+                                  mod_info['version'], mod_info.get('website', ""))
+        write_json(os.path.join(self.stage_dir, "meta.json"), meta, 4, self.reproducible)
+        write_json(os.path.join(self.stage_dir, "default_mod.json"), generate_default_mod_json(), 4, self.reproducible)
+
+        if self.unpacked_dir:
+            target = self.stage_dir
+        else:
+            target = write_pmp(self.stage_dir, self.out_dir, clean_mod_name_for_filename(mod_info['name']), self.reproducible)
+            if self.manifest:
+                from build_manifest import build_manifest, manifest_path, write_manifest
+                generated_files = [file_info for key in wanted for file_info in self.built[key]['infos']]
+                write_manifest(build_manifest(target, self.stage_dir, generated_files, mod_info), manifest_path(target))
+
+        elapsed = time.perf_counter() - started
+        self.last_result = {'rebuilt': len(fresh), 'total': len(wanted), 'target': target, 'elapsed': elapsed}
+        self.log(f"Rebuilt {len(fresh)} of {len(wanted)} operations in {elapsed:.2f}s: {target}")
+        return True
+
+    def run(self, interval=1.0):
+        """Poll until interrupted"""
+        self.log(f"Watching for changes every {interval:g}s (Ctrl+C to stop)")
+        try:
+            while True:
+                self.poll()
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.close()